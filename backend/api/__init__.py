@@ -5,6 +5,7 @@ from .public import router as public_router
 from .app import router as app_router
 from .admin import router as admin_router
 from .health import router as health_router
+from .metrics import router as metrics_router
 
 __all__ = [
     "auth_router",
@@ -12,4 +13,5 @@ __all__ = [
     "app_router",
     "admin_router",
     "health_router",
+    "metrics_router",
 ]
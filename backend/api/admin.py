@@ -1,46 +1,81 @@
-from fastapi import APIRouter, Depends, Query
+from typing import Any, Sequence
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .. import crud, schemas
+from .. import crud, models, schemas
+from ..cache import RefreshingSnapshot
+from ..crud.counting import CountResult, CountStrategy
 from ..database import get_session
-from ..security import require_role
+from ..security import require_principal
 from ..models import UserRole
+from ..replica import get_read_session, read_session
+from ..settings import settings
 
 router = APIRouter(
     prefix="/admin",
     tags=["admin"],
-    dependencies=[Depends(require_role(UserRole.DEV))],
+    dependencies=[Depends(require_principal(UserRole.DEV))],
 )
 
 
-@router.get("/summary", response_model=schemas.AdminSummary)
-async def get_admin_summary(session: AsyncSession = Depends(get_session)) -> schemas.AdminSummary:
-    total_users = await crud.analytics.get_total_users(session)
-    total_contacts = await crud.analytics.get_total_contacts(session)
-    total_waitlist = await crud.analytics.get_total_waitlist(session)
-    total_pilot_requests = await crud.analytics.get_total_pilot_requests(session)
-    total_investor_interest = await crud.analytics.get_total_investor_interest(session)
-    return schemas.AdminSummary(
-        total_users=total_users,
-        total_contacts=total_contacts,
-        total_waitlist=total_waitlist,
-        total_pilot_requests=total_pilot_requests,
-        total_investor_interest=total_investor_interest,
+async def _load_admin_summary() -> schemas.AdminSummary:
+    async with read_session() as session:
+        totals = await crud.analytics.get_admin_totals(session)
+    return schemas.AdminSummary(**totals)
+
+
+summary_snapshot = RefreshingSnapshot(_load_admin_summary, ttl=settings.admin_summary_ttl_seconds)
+
+
+async def _pagination_cursor(
+    cursor: str | None = Query(
+        None,
+        description="Opaque cursor from a previous page's next_cursor; switches to keyset pagination",
+    ),
+) -> str | None:
+    if cursor:
+        try:
+            crud.pagination.decode_cursor(cursor)
+        except crud.pagination.InvalidCursor as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor") from exc
+    return cursor
+
+
+def _pagination_meta(
+    page: int,
+    limit: int,
+    counted: CountResult,
+    items: Sequence[Any],
+) -> schemas.PaginationMeta:
+    return schemas.PaginationMeta.create(
+        page=page,
+        limit=limit,
+        total=counted.total,
+        total_exact=counted.exact,
+        next_cursor=crud.pagination.next_cursor(items, limit),
     )
 
 
+@router.get("/summary", response_model=schemas.AdminSummary)
+async def get_admin_summary() -> schemas.AdminSummary:
+    return await summary_snapshot.get()
+
+
 @router.get("/logs", response_model=schemas.AdminLogResponse)
 async def get_admin_logs(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(50, ge=1, le=500, description="Items per page"),
+    cursor: str | None = Depends(_pagination_cursor),
+    count: CountStrategy = Query(CountStrategy.ESTIMATED, description="How the pagination total is computed"),
 ) -> schemas.AdminLogResponse:
     offset = (page - 1) * limit
-    logs = await crud.audit.get_all(session, limit=limit, offset=offset)
-    total = await crud.audit.count_all(session)
+    logs = await crud.audit.get_all(session, limit=limit, offset=offset, cursor=cursor)
+    counted = await crud.counting.count_rows(session, models.AuditLog, count)
     return schemas.AdminLogResponse(
         items=logs,
-        pagination=schemas.PaginationMeta.create(page=page, limit=limit, total=total),
+        pagination=_pagination_meta(page, limit, counted, logs),
     )
 
 
@@ -54,74 +89,84 @@ async def send_admin_email(payload: schemas.EmailSchema, session: AsyncSession =
 
 @router.get("/users", response_model=schemas.AdminUserListResponse)
 async def get_admin_users(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(50, ge=1, le=500, description="Items per page"),
+    cursor: str | None = Depends(_pagination_cursor),
+    count: CountStrategy = Query(CountStrategy.CACHED, description="How the pagination total is computed"),
 ) -> schemas.AdminUserListResponse:
     offset = (page - 1) * limit
-    users = await crud.users.list_users(session, limit=limit, offset=offset)
-    total = await crud.analytics.get_total_users(session)
+    users = await crud.users.list_users(session, limit=limit, offset=offset, cursor=cursor)
+    counted = await crud.counting.count_rows(session, models.User, count)
     return schemas.AdminUserListResponse(
         items=users,
-        pagination=schemas.PaginationMeta.create(page=page, limit=limit, total=total),
+        pagination=_pagination_meta(page, limit, counted, users),
     )
 
 
 @router.get("/waitlist", response_model=schemas.AdminWaitlistResponse)
 async def get_admin_waitlist(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(50, ge=1, le=500, description="Items per page"),
+    cursor: str | None = Depends(_pagination_cursor),
+    count: CountStrategy = Query(CountStrategy.CACHED, description="How the pagination total is computed"),
 ) -> schemas.AdminWaitlistResponse:
     offset = (page - 1) * limit
-    waitlist = await crud.waitlist.list_all(session, limit=limit, offset=offset)
-    total = await crud.waitlist.count_waitlist(session)
+    waitlist = await crud.waitlist.list_all(session, limit=limit, offset=offset, cursor=cursor)
+    counted = await crud.counting.count_rows(session, models.Waitlist, count)
     return schemas.AdminWaitlistResponse(
         items=waitlist,
-        pagination=schemas.PaginationMeta.create(page=page, limit=limit, total=total),
+        pagination=_pagination_meta(page, limit, counted, waitlist),
     )
 
 
 @router.get("/contacts", response_model=schemas.AdminContactResponse)
 async def get_admin_contacts(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(50, ge=1, le=500, description="Items per page"),
+    cursor: str | None = Depends(_pagination_cursor),
+    count: CountStrategy = Query(CountStrategy.CACHED, description="How the pagination total is computed"),
 ) -> schemas.AdminContactResponse:
     offset = (page - 1) * limit
-    contacts = await crud.contact.list_all(session, limit=limit, offset=offset)
-    total = await crud.contact.count_contacts(session)
+    contacts = await crud.contact.list_all(session, limit=limit, offset=offset, cursor=cursor)
+    counted = await crud.counting.count_rows(session, models.Contact, count)
     return schemas.AdminContactResponse(
         items=contacts,
-        pagination=schemas.PaginationMeta.create(page=page, limit=limit, total=total),
+        pagination=_pagination_meta(page, limit, counted, contacts),
     )
 
 
 @router.get("/pilot-requests", response_model=schemas.AdminPilotResponse)
 async def get_admin_pilot_requests(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(50, ge=1, le=500, description="Items per page"),
+    cursor: str | None = Depends(_pagination_cursor),
+    count: CountStrategy = Query(CountStrategy.CACHED, description="How the pagination total is computed"),
 ) -> schemas.AdminPilotResponse:
     offset = (page - 1) * limit
-    pilots = await crud.pilot.list_all(session, limit=limit, offset=offset)
-    total = await crud.pilot.count_pilot_requests(session)
+    pilots = await crud.pilot.list_all(session, limit=limit, offset=offset, cursor=cursor)
+    counted = await crud.counting.count_rows(session, models.PilotRequest, count)
     return schemas.AdminPilotResponse(
         items=pilots,
-        pagination=schemas.PaginationMeta.create(page=page, limit=limit, total=total),
+        pagination=_pagination_meta(page, limit, counted, pilots),
     )
 
 
 @router.get("/investor-interest", response_model=schemas.AdminInvestorResponse)
 async def get_admin_investor_interest(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(50, ge=1, le=500, description="Items per page"),
+    cursor: str | None = Depends(_pagination_cursor),
+    count: CountStrategy = Query(CountStrategy.CACHED, description="How the pagination total is computed"),
 ) -> schemas.AdminInvestorResponse:
     offset = (page - 1) * limit
-    investors = await crud.investor.list_all(session, limit=limit, offset=offset)
-    total = await crud.investor.count_interest(session)
+    investors = await crud.investor.list_all(session, limit=limit, offset=offset, cursor=cursor)
+    counted = await crud.counting.count_rows(session, models.InvestorInterest, count)
     return schemas.AdminInvestorResponse(
         items=investors,
-        pagination=schemas.PaginationMeta.create(page=page, limit=limit, total=total),
+        pagination=_pagination_meta(page, limit, counted, investors),
     )
\ No newline at end of file
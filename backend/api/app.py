@@ -3,7 +3,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import crud, models, schemas
 from ..database import get_session
-from ..security import get_current_user, record_audit_log, require_role, verify_password
+from ..replica import get_read_session
+from ..security import get_current_user, record_audit_log, require_role
+from ..services.passwords import password_hasher
+from ..services.user_cache import user_cache
 
 router = APIRouter(tags=["app"])
 
@@ -12,7 +15,7 @@ COMMAND_CENTER_URL = "https://console.orbsurv.local/command-center"
 
 @router.get("/dashboard/summary", response_model=schemas.DashboardSummary)
 async def dashboard_summary(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     user: models.User = Depends(require_role(models.UserRole.USER, models.UserRole.DEV)),
 ) -> schemas.DashboardSummary:
     metric_values = await crud.analytics.dashboard_metrics(session)
@@ -58,10 +61,10 @@ async def update_password(
     session: AsyncSession = Depends(get_session),
     user: models.User = Depends(get_current_user),
 ) -> schemas.MessageResponse:
-    if not verify_password(payload.current_password, user.password_hash):
+    if not await password_hasher.verify(payload.current_password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Current password is incorrect")
     await crud.users.update_password(session, user=user, new_password=payload.new_password)
-    await record_audit_log(session, actor=user, action="account.password.update", request=request)
+    await record_audit_log(session, actor=user, action="account.password.update", request=request, required=True)
     await session.commit()
     return schemas.MessageResponse(message="Password updated.")
 
@@ -76,6 +79,7 @@ async def update_organization(
     user.organization = payload.organization
     if payload.timezone:
         user.notification_settings = {**(user.notification_settings or {}), "timezone": payload.timezone}
+    user_cache.invalidate_on_commit(session, user.email)
     await session.flush()
     await record_audit_log(session, actor=user, action="account.organization.update", request=request)
     await session.commit()
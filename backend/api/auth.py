@@ -5,7 +5,6 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import crud, models, schemas
 from ..database import get_session
-from ..middleware.rate_limit import rate_limit_middleware
 from ..security import (
     create_access_token,
     create_password_reset_token,
@@ -13,9 +12,8 @@ from ..security import (
     decode_token,
     get_current_user,
     record_audit_log,
-    verify_password,
 )
-from ..services.email import send_password_reset_email
+from ..services.passwords import password_hasher
 from ..settings import settings
 
 logger = logging.getLogger(__name__)
@@ -29,8 +27,6 @@ async def register_user(
     request: Request,
     session: AsyncSession = Depends(get_session),
 ) -> schemas.TokenPair:
-    # Rate limit: 5 registrations per 15 minutes per IP
-    await rate_limit_middleware(request, max_requests=5, window_seconds=900)
     existing = await crud.users.get_by_email(session, email=payload.email)
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
@@ -38,7 +34,7 @@ async def register_user(
     user = await crud.users.create_user(session, payload=payload)
     access_token = create_access_token(user)
     refresh_token = create_refresh_token(user)
-    await record_audit_log(session, actor=user, action="auth.register", request=request)
+    await record_audit_log(session, actor=user, action="auth.register", request=request, required=True)
     await session.commit()
     return schemas.TokenPair(
         access_token=access_token,
@@ -55,9 +51,6 @@ async def register_from_order(
     session: AsyncSession = Depends(get_session),
 ) -> schemas.TokenPair:
     """Register a user account from an order registration token."""
-    # Rate limit: 5 registrations per 15 minutes per IP
-    await rate_limit_middleware(request, max_requests=5, window_seconds=900)
-    
     # Find order by token
     order = await crud.order.get_order_by_token(session, payload.token)
     if not order:
@@ -88,7 +81,7 @@ async def register_from_order(
     access_token = create_access_token(user)
     refresh_token = create_refresh_token(user)
     
-    await record_audit_log(session, actor=user, action="auth.register.from_order", request=request)
+    await record_audit_log(session, actor=user, action="auth.register.from_order", request=request, required=True)
     await session.commit()
     
     return schemas.TokenPair(
@@ -105,13 +98,8 @@ async def login_user(
     request: Request,
     session: AsyncSession = Depends(get_session),
 ) -> schemas.TokenPair:
-    # Rate limit: 5 login attempts per 15 minutes per IP/email
-    await rate_limit_middleware(
-        request, max_requests=5, window_seconds=900, email=payload.email
-    )
-    
     user = await crud.users.get_by_email(session, email=payload.email)
-    if not user or not verify_password(payload.password, user.password_hash):
+    if not user or not await password_hasher.verify(payload.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid email or password")
 
     scope = payload.scope or "user"
@@ -141,19 +129,19 @@ async def password_reset_request(
     request: Request,
     session: AsyncSession = Depends(get_session),
 ) -> schemas.MessageResponse:
-    # Rate limit: 3 password reset requests per hour per IP/email
-    await rate_limit_middleware(
-        request, max_requests=3, window_seconds=3600, email=payload.email
-    )
     user = await crud.users.get_by_email(session, email=payload.email)
     if user:
         token = create_password_reset_token(user)
         base_url = (settings.frontend_base_url or "https://app.orbsurv.com").rstrip("/")
         reset_url = f"{base_url}/reset-password.html?token={token}"
-        success = await send_password_reset_email(to=user.email, reset_url=reset_url)
-        if not success:
-            logger.warning("Unable to deliver password reset email for %s", user.email)
-        await record_audit_log(session, actor=user, action="auth.password.reset.requested", request=request)
+        await crud.outbox.enqueue_email(
+            session,
+            "password_reset",
+            to=user.email,
+            subject="Reset your Orbsurv password",
+            context={"reset_url": reset_url},
+        )
+        await record_audit_log(session, actor=user, action="auth.password.reset.requested", request=request, required=True)
         await session.commit()
     return schemas.MessageResponse(message="If an account exists, reset instructions are on the way.")
 
@@ -184,7 +172,7 @@ async def password_reset_confirm(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Token expired")
 
     await crud.users.update_password(session, user=user, new_password=payload.new_password)
-    await record_audit_log(session, actor=user, action="auth.password.reset.confirm", request=request)
+    await record_audit_log(session, actor=user, action="auth.password.reset.confirm", request=request, required=True)
     await session.commit()
     return schemas.MessageResponse(message="Password updated. You can now log in.")
 
@@ -224,7 +212,7 @@ async def logout_user(
     session: AsyncSession = Depends(get_session),
 ) -> schemas.LogoutResponse:
     await crud.users.bump_token_version(session, user=user)
-    await record_audit_log(session, actor=user, action="auth.logout", request=request)
+    await record_audit_log(session, actor=user, action="auth.logout", request=request, required=True)
     await session.commit()
     return schemas.LogoutResponse()
 
@@ -1,20 +1,46 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+import time
 
-from ..database import get_session
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from ..services.health import health_prober
 from ..settings import settings
 
 router = APIRouter(tags=["health"])
 
 
 @router.get("/healthz")
-async def health_check(session: AsyncSession = Depends(get_session)) -> dict[str, str]:
-    await session.execute(text("SELECT 1"))
-    return {"status": "ok", "service": settings.project_name}
+async def health_check() -> JSONResponse:
+    """Liveness from the background prober's heartbeat; never touches the database pool."""
+    health_prober.ensure_started()
+    now = time.monotonic()
+    if health_prober.is_stale(now):
+        age = round(now - health_prober.last_round, 3)
+        return JSONResponse(
+            {"status": "stale", "service": settings.project_name, "probe_age_seconds": age},
+            status_code=503,
+        )
+    return JSONResponse({"status": "ok", "service": settings.project_name})
 
 
 @router.get("/readyz")
-async def readiness_check(session: AsyncSession = Depends(get_session)) -> dict[str, str]:
-    await session.execute(text("SELECT 1"))
-    return {"status": "ready"}
+async def readiness_check() -> JSONResponse:
+    """Cached per-dependency status; degraded while an optional one is down, 503 while a required one is."""
+    health_prober.ensure_started()
+    # First probe of this process, shared by concurrent callers; later calls only read
+    # the cached results.
+    await health_prober.first_round()
+    now = time.monotonic()
+    ready = health_prober.ready()
+    if not ready:
+        status = "not_ready"
+    elif health_prober.degraded():
+        status = "degraded"
+    else:
+        status = "ready"
+    body = {
+        "status": status,
+        "probe_age_seconds": round(now - health_prober.last_round, 3),
+        "dependencies": health_prober.snapshot(now),
+    }
+    return JSONResponse(body, status_code=200 if ready else 503)
@@ -0,0 +1,55 @@
+import hmac
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+
+from .. import crud
+from ..cache import RefreshingSnapshot
+from ..metrics import CONTENT_TYPE_LATEST, render
+from ..middleware.rate_limit import in_memory_store
+from ..replica import read_session
+from ..settings import settings
+
+_LOOPBACK = {"127.0.0.1", "::1", "localhost"}
+
+
+def require_scraper(request: Request) -> None:
+    """Admit callers with ``METRICS_BEARER_TOKEN``, or local ones when no token is set."""
+    token = settings.metrics_bearer_token
+    if not token:
+        if request.client is None or request.client.host not in _LOOPBACK:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden"
+            )
+        return
+    scheme, _, supplied = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+        supplied.encode(), token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+async def _load_outbox_pending() -> int:
+    async with read_session() as session:
+        return await crud.outbox.count_pending(session)
+
+
+# Scrapes read the cached count instead of taking a database connection each time.
+outbox_pending_snapshot = RefreshingSnapshot(
+    _load_outbox_pending, ttl=settings.metrics_snapshot_ttl_seconds
+)
+
+router = APIRouter(tags=["metrics"], dependencies=[Depends(require_scraper)])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics() -> Response:
+    pending = await outbox_pending_snapshot.get()
+    in_memory_store.report_size()
+    body = render(
+        {"email_outbox_pending": ("Outbox emails waiting to be delivered.", pending)}
+    )
+    return Response(content=body, media_type=CONTENT_TYPE_LATEST)
@@ -6,10 +6,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import crud, schemas
 from ..database import get_session
-from ..middleware import rate_limit_middleware
 from ..security import record_audit_log
 from ..services.captcha import verify_captcha_token
-from ..services.email import send_templated_email
 from ..settings import settings
 
 try:
@@ -27,11 +25,6 @@ async def _guard_public_form(
     *,
     require_captcha: bool = True,
 ) -> None:
-    await rate_limit_middleware(
-        request,
-        max_requests=settings.public_form_rate_limit,
-        window_seconds=settings.public_form_rate_window_seconds,
-    )
     await verify_captcha_token(
         captcha_token,
         request,
@@ -61,13 +54,14 @@ async def submit_contact(
     await _guard_public_form(request, payload.captcha_token)
     await crud.contact.create_contact(session, payload)
     await record_audit_log(session, actor=None, action="contact.submit", request=request)
-    await session.commit()
-    await send_templated_email(
+    await crud.outbox.enqueue_email(
+        session,
         "contact_ack",
         to=payload.email,
         subject="Thanks for contacting Orbsurv",
         context={"name": payload.name, "message": payload.message},
     )
+    await session.commit()
     return schemas.MessageResponse(message="Thanks for reaching out. We will respond shortly.")
 
 
@@ -80,13 +74,14 @@ async def submit_investor_interest(
     await _guard_public_form(request, payload.captcha_token)
     await crud.investor.create_interest(session, payload)
     await record_audit_log(session, actor=None, action="investor.interest", request=request)
-    await session.commit()
-    await send_templated_email(
+    await crud.outbox.enqueue_email(
+        session,
         "investor_ack",
         to=payload.email,
         subject="Thanks for investing in Orbsurv",
         context={"name": payload.name, "amount": payload.amount},
     )
+    await session.commit()
     return schemas.MessageResponse(message="Investor interest recorded.")
 
 
@@ -99,13 +94,14 @@ async def submit_pilot_request(
     await _guard_public_form(request, payload.captcha_token)
     await crud.pilot.create_pilot_request(session, payload)
     await record_audit_log(session, actor=None, action="pilot.request", request=request)
-    await session.commit()
-    await send_templated_email(
+    await crud.outbox.enqueue_email(
+        session,
         "pilot_ack",
         to=payload.email,
         subject="Thanks for requesting an Orbsurv pilot",
         context={"name": payload.name, "org": payload.org},
     )
+    await session.commit()
     return schemas.MessageResponse(message="Pilot request submitted.")
 
 
@@ -128,14 +124,14 @@ async def create_order(
     # Create order
     order = await crud.order.create_order(session, payload)
     await record_audit_log(session, actor=None, action="order.create", request=request)
-    await session.commit()
 
     # Generate registration URL
     frontend_url = settings.frontend_base_url or "http://localhost"
     registration_url = f"{frontend_url}/signup.html?token={order.registration_token}"
 
-    # Send registration email
-    await send_templated_email(
+    # Queue registration email; the outbox worker delivers it after commit
+    await crud.outbox.enqueue_email(
+        session,
         "registration_link",
         to=payload.email,
         subject="Complete your Orbsurv purchase - Create your account",
@@ -146,6 +142,7 @@ async def create_order(
             "registration_url": registration_url,
         },
     )
+    await session.commit()
 
     return schemas.OrderResponse.model_validate(order)
 
@@ -156,11 +153,6 @@ async def report_client_error(
     request: Request,
     session: AsyncSession = Depends(get_session),
 ) -> schemas.MessageResponse:
-    await rate_limit_middleware(
-        request,
-        max_requests=settings.client_error_rate_limit,
-        window_seconds=settings.client_error_rate_window_seconds,
-    )
     def _clip(value: str | None, limit: int) -> str | None:
         if value is None:
             return None
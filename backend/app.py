@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import logging
-import uuid
-from typing import Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
-from fastapi import FastAPI, Request, Response, status
+from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -14,7 +14,21 @@ from sentry_sdk.integrations.fastapi import FastApiIntegration
 from sentry_sdk.integrations.logging import LoggingIntegration
 from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
 
-from .api import admin_router, app_router, auth_router, health_router, public_router
+from .api import admin_router, app_router, auth_router, health_router, metrics_router, public_router
+from .database import engine
+from .logging_config import configure_logging, stop_logging
+from .metrics import instrument_engine
+from .query_stats import instrument_queries
+from .replica import replica_router
+from .middleware.policies import RateLimitMiddleware
+from .middleware.rate_limit import close_redis_client, in_memory_store, pre_counter
+from .middleware.request_context import RequestContextMiddleware
+from .services.audit_writer import audit_writer
+from .services.health import health_prober
+from .services.http_clients import http_clients
+from .services.passwords import password_hasher
+from .services.smtp_pool import close_smtp_pool
+from .services.user_cache import user_cache
 from .settings import settings
 
 logger = logging.getLogger("orbsurv.api")
@@ -34,15 +48,47 @@ if settings.sentry_dsn:
     )
 
 
+# Validation failures are logged as a count plus the offending field paths; the full
+# error list goes back to the client but would dominate log volume under abuse.
+MAX_LOGGED_ERROR_FIELDS = 10
+
+
+def _error_fields(errors: list[dict]) -> list[str]:
+    return [".".join(str(part) for part in error.get("loc", ())) for error in errors[:MAX_LOGGED_ERROR_FIELDS]]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    configure_logging()
+    user_cache.start_listener()
+    http_clients.open()
+    health_prober.ensure_started()
+    yield
+    await health_prober.stop()
+    await http_clients.aclose()
+    await in_memory_store.stop_sweeper()
+    await pre_counter.stop()
+    await close_redis_client()
+    await user_cache.stop_listener()
+    await audit_writer.stop()
+    password_hasher.shutdown()
+    close_smtp_pool()
+    await replica_router.close()
+    stop_logging()
+
+
 def create_application() -> FastAPI:
     app = FastAPI(
         title=settings.project_name,
+        lifespan=lifespan,
         version="1.0.0",
         docs_url=settings.docs_url,
         redoc_url=settings.redoc_url,
         openapi_url=f"{settings.api_prefix}/openapi.json",
     )
 
+    # Added before CORS so 429 responses still carry CORS headers.
+    app.add_middleware(RateLimitMiddleware)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_allow_origins,
@@ -50,41 +96,7 @@ def create_application() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
-
-    @app.middleware("http")
-    async def add_request_context(
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:  # type: ignore[override]
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        return response
-
-    @app.middleware("http")
-    async def log_requests(
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:  # type: ignore[override]
-        logger.info(
-            "request.start",
-            extra={
-                "path": request.url.path,
-                "method": request.method,
-                "request_id": getattr(request.state, "request_id", "n/a"),
-            },
-        )
-        response = await call_next(request)
-        logger.info(
-            "request.end",
-            extra={
-                "status_code": response.status_code,
-                "path": request.url.path,
-                "request_id": getattr(request.state, "request_id", "n/a"),
-            },
-        )
-        return response
+    app.add_middleware(RequestContextMiddleware)
 
     # Global exception handlers
     @app.exception_handler(RequestValidationError)
@@ -93,12 +105,14 @@ def create_application() -> FastAPI:
     ) -> JSONResponse:
         """Handle request validation errors."""
         request_id = getattr(request.state, "request_id", "n/a")
+        errors = exc.errors()
         logger.warning(
             "validation.error",
             extra={
                 "request_id": request_id,
                 "path": request.url.path,
-                "errors": exc.errors(),
+                "error_count": len(errors),
+                "fields": _error_fields(errors),
             },
         )
         return JSONResponse(
@@ -107,7 +121,7 @@ def create_application() -> FastAPI:
                 "error": {
                     "code": "VALIDATION_ERROR",
                     "message": "Request validation failed",
-                    "details": exc.errors(),
+                    "details": errors,
                     "request_id": request_id,
                 }
             },
@@ -119,12 +133,14 @@ def create_application() -> FastAPI:
     ) -> JSONResponse:
         """Handle Pydantic validation errors."""
         request_id = getattr(request.state, "request_id", "n/a")
+        errors = exc.errors()
         logger.warning(
             "pydantic.validation.error",
             extra={
                 "request_id": request_id,
                 "path": request.url.path,
-                "errors": exc.errors(),
+                "error_count": len(errors),
+                "fields": _error_fields(errors),
             },
         )
         return JSONResponse(
@@ -133,7 +149,7 @@ def create_application() -> FastAPI:
                 "error": {
                     "code": "VALIDATION_ERROR",
                     "message": "Data validation failed",
-                    "details": exc.errors(),
+                    "details": errors,
                     "request_id": request_id,
                 }
             },
@@ -177,6 +193,14 @@ def create_application() -> FastAPI:
             },
         )
 
+    instrument_engine(engine)
+    instrument_queries(engine)
+    if replica_router.engine is not None:
+        instrument_engine(replica_router.engine, "replica")
+        instrument_queries(replica_router.engine)
+    # Served outside the API prefix; the port is published directly, so the route itself
+    # checks METRICS_BEARER_TOKEN (or a loopback caller).
+    app.include_router(metrics_router)
     prefix = settings.api_prefix
     app.include_router(health_router, prefix=prefix)
     app.include_router(public_router, prefix=prefix)
@@ -0,0 +1,98 @@
+"""
+Deep-page latency of OFFSET versus keyset pagination on the audit log.
+
+Usage:
+    python -m backend.benchmarks.bench_admin_pagination [--rows 1000000] [--limit 50]
+
+Seeds a temporary SQLite database with ``--rows`` audit entries, adds the composite
+``(created_at, id)`` index from migration 0004, then times ``crud.audit.get_all`` for
+pages at increasing depth in both modes.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///bench.db")
+os.environ.setdefault(
+    "JWT_SECRET_KEY", "benchmark-secret-key-with-at-least-32-characters"
+)
+os.environ.setdefault("ORBSURV_ALLOW_INSECURE_SETTINGS", "1")
+
+from sqlalchemy import insert, text  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from backend import crud, models  # noqa: E402
+from backend.database import Base  # noqa: E402
+
+REPEATS = 5
+
+
+async def _seed(session_factory, rows: int) -> None:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    batch = 50_000
+    async with session_factory() as session:
+        for first in range(0, rows, batch):
+            values = [
+                {
+                    "action": "bench.event",
+                    "path": "/bench",
+                    "created_at": start + timedelta(seconds=index),
+                }
+                for index in range(first, min(rows, first + batch))
+            ]
+            await session.execute(insert(models.AuditLog), values)
+        await session.execute(
+            text("CREATE INDEX ix_auditlog_created_at_id ON auditlog (created_at, id)")
+        )
+        await session.commit()
+
+
+async def _time(session_factory, **kwargs) -> float:
+    samples = []
+    for _ in range(REPEATS):
+        async with session_factory() as session:
+            started = time.perf_counter()
+            await crud.audit.get_all(session, **kwargs)
+            samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+async def main(rows: int, limit: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        print(f"seeding {rows} audit rows...")
+        await _seed(session_factory, rows)
+
+        print(f"{'depth':>10} {'offset_ms':>10} {'keyset_ms':>10}")
+        depth = limit
+        while depth < rows:
+            async with session_factory() as session:
+                anchor = await crud.audit.get_all(session, limit=1, offset=depth - 1)
+            cursor = crud.pagination.encode_cursor(anchor[0].created_at, anchor[0].id)
+            offset_time = await _time(session_factory, limit=limit, offset=depth)
+            keyset_time = await _time(session_factory, limit=limit, cursor=cursor)
+            print(
+                f"{depth:>10} {offset_time * 1000:>10.2f} {keyset_time * 1000:>10.2f}"
+            )
+            depth *= 10
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.limit))
@@ -0,0 +1,113 @@
+"""
+Request throughput for /waitlist and /auth/login with and without the buffered audit writer.
+
+Usage:
+    python -m backend.benchmarks.bench_audit_writer [--requests 200] [--concurrency 8]
+
+Requests are served in-process against a temporary SQLite database. Rate limiting is
+disabled and the benchmark user's hash uses low bcrypt cost so the audit insert is a
+visible share of each request. SQLite serialises writers, so very high concurrency
+mostly measures lock waits rather than the audit path.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///bench.db")
+os.environ.setdefault(
+    "JWT_SECRET_KEY", "benchmark-secret-key-with-at-least-32-characters"
+)
+os.environ.setdefault("ORBSURV_ALLOW_INSECURE_SETTINGS", "1")
+
+from httpx import AsyncClient  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from backend import database  # noqa: E402
+from backend.app import app  # noqa: E402
+from backend.database import Base  # noqa: E402
+from backend.middleware.policies import ROUTE_POLICIES  # noqa: E402
+from backend.models import User  # noqa: E402
+from backend.security import pwd_context  # noqa: E402
+from backend.services.audit_writer import audit_writer  # noqa: E402
+
+PASSWORD = "BenchPass!1"
+
+
+async def _drive(
+    client: AsyncClient, label: str, make_request, total: int, concurrency: int
+) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses: list[int] = []
+
+    async def _one(index: int) -> None:
+        async with semaphore:
+            response = await make_request(index)
+            statuses.append(response.status_code)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_one(index) for index in range(total)))
+    elapsed = time.perf_counter() - started
+    ok = sum(1 for code in statuses if code < 400)
+    print(
+        f"{label:<28} {total / elapsed:8.1f} req/s  ({ok}/{total} ok, {elapsed:.2f}s)"
+    )
+
+
+async def main(total: int, concurrency: int) -> None:
+    ROUTE_POLICIES.clear()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        database.async_session_factory = async_sessionmaker(
+            engine, expire_on_commit=False
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with database.async_session_factory() as session:
+            session.add(
+                User(
+                    email="bench@example.com",
+                    password_hash=pwd_context.hash(PASSWORD, rounds=4),
+                )
+            )
+            await session.commit()
+
+        async with AsyncClient(app=app, base_url="http://bench") as client:
+
+            async def waitlist(index: int):
+                return await client.post(
+                    "/api/v1/waitlist", json={"email": f"bench{index}@example.com"}
+                )
+
+            async def login(index: int):
+                return await client.post(
+                    "/api/v1/auth/login",
+                    json={"email": "bench@example.com", "password": PASSWORD},
+                )
+
+            for enabled in (False, True):
+                audit_writer.enabled = enabled
+                mode = "buffered" if enabled else "inline"
+                await _drive(
+                    client, f"/waitlist ({mode})", waitlist, total, concurrency
+                )
+                await _drive(client, f"/auth/login ({mode})", login, total, concurrency)
+                await audit_writer.stop()
+
+        print(f"audit writer: {audit_writer.metrics()}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
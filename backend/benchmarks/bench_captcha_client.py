@@ -0,0 +1,147 @@
+"""
+Captcha verification latency: a new httpx client per call versus the shared client.
+
+Usage:
+    python -m backend.benchmarks.bench_captcha_client [--requests 500] [--concurrency 8] [--connect-ms 20]
+
+Requests go to a stub siteverify endpoint on localhost that always answers
+``{"success": true}`` over keep-alive HTTP/1.1. ``--connect-ms`` delays each new
+connection before the first response to stand in for the DNS/TCP/TLS setup a real
+provider costs; reused connections skip it.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///bench.db")
+os.environ.setdefault(
+    "JWT_SECRET_KEY", "benchmark-secret-key-with-at-least-32-characters"
+)
+os.environ.setdefault("ORBSURV_ALLOW_INSECURE_SETTINGS", "1")
+
+import httpx  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+
+from backend.services.captcha import verify_captcha_token  # noqa: E402
+from backend.services.http_clients import http_clients  # noqa: E402
+from backend.settings import settings  # noqa: E402
+
+BODY = b'{"success": true}'
+
+
+class StubVerifier:
+    def __init__(self, connect_delay: float) -> None:
+        self.connect_delay = connect_delay
+        self.connections = 0
+        self.port = 0
+        self._server: asyncio.AbstractServer | None = None
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        await asyncio.sleep(self.connect_delay)
+        try:
+            while True:
+                length = 0
+                line = await reader.readline()
+                if not line:
+                    break
+                while (header := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = header.partition(b":")
+                    if name.strip().lower() == b"content-length":
+                        length = int(value)
+                await reader.readexactly(length)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n%s" % (len(BODY), BODY)
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+def _request() -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "path": "/",
+            "headers": [],
+            "client": ("203.0.113.7", 1234),
+        }
+    )
+
+
+async def _drive(label: str, verify, total: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def _one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await verify()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(
+        f"{label:<20} {total / elapsed:8.1f} req/s  p50 {p50:6.2f} ms  p99 {p99:6.2f} ms"
+    )
+
+
+async def main(total: int, concurrency: int, connect_ms: float) -> None:
+    stub = StubVerifier(connect_delay=connect_ms / 1000)
+    await stub.start()
+    settings.captcha_secret_key = "benchmark-secret"
+    settings.captcha_verify_url = f"http://127.0.0.1:{stub.port}/siteverify"
+    payload = {"secret": settings.captcha_secret_key, "response": "benchmark-token"}
+
+    async def per_call() -> None:
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            response = await client.post(settings.captcha_verify_url, data=payload)
+            response.raise_for_status()
+            response.json()
+
+    async def shared() -> None:
+        await verify_captcha_token("benchmark-token", _request(), require=True)
+
+    try:
+        before = stub.connections
+        await _drive("client per call", per_call, total, concurrency)
+        print(f"  connections opened: {stub.connections - before}")
+        before = stub.connections
+        await _drive("shared client", shared, total, concurrency)
+        print(f"  connections opened: {stub.connections - before}")
+    finally:
+        await http_clients.aclose()
+        await stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--connect-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.connect_ms))
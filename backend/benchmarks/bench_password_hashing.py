@@ -0,0 +1,82 @@
+"""
+Concurrent-login throughput with inline bcrypt versus the password hashing pool.
+
+Usage:
+    python -m backend.benchmarks.bench_password_hashing [--logins 32] [--workers 4]
+
+Each simulated login verifies one bcrypt hash. A heartbeat coroutine ticks every 10 ms
+while the logins run; its worst observed delay shows how long the event loop was blocked.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///bench.db")
+os.environ.setdefault(
+    "JWT_SECRET_KEY", "benchmark-secret-key-with-at-least-32-characters"
+)
+os.environ.setdefault("ORBSURV_ALLOW_INSECURE_SETTINGS", "1")
+
+from backend.security import hash_password, verify_password  # noqa: E402
+from backend.services.passwords import PasswordHasher  # noqa: E402
+
+PASSWORD = "BenchPass!1"
+
+
+async def _heartbeat(stop: asyncio.Event, interval: float = 0.01) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def _run(label: str, login, logins: int) -> None:
+    stop = asyncio.Event()
+    heartbeat = asyncio.create_task(_heartbeat(stop))
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    worst_stall = await heartbeat
+    assert all(results)
+    print(
+        f"{label:<12} logins={logins:<4} elapsed={elapsed:7.3f}s "
+        f"throughput={logins / elapsed:7.2f}/s max_loop_stall={worst_stall * 1000:8.1f}ms"
+    )
+
+
+async def main(logins: int, workers: int, executor: str) -> None:
+    hashed = hash_password(PASSWORD)
+
+    async def inline_login() -> bool:
+        return verify_password(PASSWORD, hashed)
+
+    hasher = PasswordHasher(executor=executor, max_workers=workers, max_queue=logins)
+
+    async def pooled_login() -> bool:
+        return await hasher.verify(PASSWORD, hashed)
+
+    await _run("inline", inline_login, logins)
+    await _run(f"{executor}-pool", pooled_login, logins)
+    metrics = hasher.metrics()
+    print(
+        f"pool metrics: p50={metrics['p50_ms']}ms p99={metrics['p99_ms']}ms rejected={metrics['rejected']}"
+    )
+    hasher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.workers, args.executor))
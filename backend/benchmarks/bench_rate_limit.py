@@ -0,0 +1,131 @@
+"""
+Memory and latency of each rate-limit algorithm.
+
+Usage:
+    python -m backend.benchmarks.bench_rate_limit [--keys 10000] [--limit 100] [--redis-url redis://localhost:6379/0]
+
+The in-process store is measured with tracemalloc after filling ``--keys`` keys to their
+limit; ``sliding_log`` is the per-request timestamp deque the in-process limiter used
+before, kept here for comparison. The Redis scripts run against ``--redis-url`` when
+given, otherwise against fakeredis if it is installed (which measures script cost,
+not network round trips).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+import tracemalloc
+from collections import deque
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///bench.db")
+os.environ.setdefault(
+    "JWT_SECRET_KEY", "benchmark-secret-key-with-at-least-32-characters"
+)
+os.environ.setdefault("ORBSURV_ALLOW_INSECURE_SETTINGS", "1")
+
+from backend.middleware import rate_limit  # noqa: E402
+from backend.middleware.algorithms import ALGORITHMS  # noqa: E402
+
+WINDOW_SECONDS = 60
+
+
+def _sliding_log_check(buckets: dict[str, deque[float]], key: str, limit: int) -> bool:
+    bucket = buckets.setdefault(key, deque())
+    now = time.monotonic()
+    while bucket and now - bucket[0] >= WINDOW_SECONDS:
+        bucket.popleft()
+    if len(bucket) >= limit:
+        return False
+    bucket.append(now)
+    return True
+
+
+def _measure(check, keys: int, limit: int) -> tuple[int, float]:
+    """Return (bytes retained, seconds) for ``limit`` checks on each of ``keys`` keys."""
+    tracemalloc.start()
+    for index in range(keys):
+        for _ in range(limit):
+            check(f"rate_limit:ip:{index}")
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Time a second, untraced pass on fresh keys.
+    started = time.perf_counter()
+    for index in range(keys):
+        for _ in range(limit):
+            check(f"rate_limit:ip:timed:{index}")
+    return size, time.perf_counter() - started
+
+
+def _in_memory(name: str, keys: int, limit: int) -> tuple[int, float]:
+    policy = ALGORITHMS[name]
+    rate_limit.reset_in_memory_counters()
+    result = _measure(
+        lambda key: rate_limit.in_memory_store.apply(
+            key, policy, limit, WINDOW_SECONDS
+        ),
+        keys,
+        limit,
+    )
+    rate_limit.reset_in_memory_counters()
+    return result
+
+
+async def _redis(client, name: str, checks: int, limit: int) -> float:
+    started = time.perf_counter()
+    for index in range(checks):
+        await rate_limit.check_rate_limit(
+            f"rate_limit:bench:{index % 100}", limit, WINDOW_SECONDS, name
+        )
+    return time.perf_counter() - started
+
+
+async def main(keys: int, limit: int, redis_url: str | None, redis_checks: int) -> None:
+    rate_limit.redis_manager.url = None
+    checks = keys * limit
+    print(f"in-process: {keys} keys x {limit} checks")
+    buckets: dict[str, deque[float]] = {}
+    size, elapsed = _measure(
+        lambda key: _sliding_log_check(buckets, key, limit), keys, limit
+    )
+    print(
+        f"  {'sliding_log':<16} {size / keys:8.0f} B/key  {elapsed / checks * 1e6:6.2f} us/check"
+    )
+    for name in ALGORITHMS:
+        size, elapsed = _in_memory(name, keys, limit)
+        print(
+            f"  {name:<16} {size / keys:8.0f} B/key  {elapsed / checks * 1e6:6.2f} us/check"
+        )
+
+    if redis_url:
+        import redis.asyncio as aioredis
+
+        client = aioredis.from_url(redis_url, decode_responses=True)
+        label = redis_url
+    else:
+        try:
+            import fakeredis
+        except ImportError:
+            print("redis: skipped (pass --redis-url or install fakeredis)")
+            return
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        label = "fakeredis"
+    rate_limit.redis_manager._client = client
+    print(f"redis ({label}): {redis_checks} checks")
+    for name in ALGORITHMS:
+        elapsed = await _redis(client, name, redis_checks, limit)
+        print(f"  {name:<16} {elapsed / redis_checks * 1e6:8.1f} us/check")
+    await rate_limit.close_redis_client()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--keys", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--redis-url", default=None)
+    parser.add_argument("--redis-checks", type=int, default=5_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.keys, args.limit, args.redis_url, args.redis_checks))
@@ -0,0 +1,127 @@
+"""
+Throughput and tail latency of /healthz with the request-context layers as
+``@app.middleware("http")`` functions versus the single ASGI middleware.
+
+Usage:
+    python -m backend.benchmarks.bench_request_middleware [--requests 5000] [--concurrency 32]
+
+Both apps mount only the health router against a temporary SQLite database and are
+driven in-process through httpx, so the numbers isolate middleware overhead from
+the network. Log records are built but not emitted at the default WARNING level.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///bench.db")
+os.environ.setdefault(
+    "JWT_SECRET_KEY", "benchmark-secret-key-with-at-least-32-characters"
+)
+os.environ.setdefault("ORBSURV_ALLOW_INSECURE_SETTINGS", "1")
+
+from fastapi import FastAPI, Request  # noqa: E402
+from httpx import AsyncClient  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from backend import database  # noqa: E402
+from backend.api import health_router  # noqa: E402
+from backend.middleware.request_context import RequestContextMiddleware, logger  # noqa: E402
+from backend.settings import settings  # noqa: E402
+
+
+def _base_http_app() -> FastAPI:
+    """The previous setup: two BaseHTTPMiddleware layers."""
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def add_request_context(request: Request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+    @app.middleware("http")
+    async def log_requests(request: Request, call_next):
+        logger.info(
+            "request.start", extra={"path": request.url.path, "method": request.method}
+        )
+        response = await call_next(request)
+        logger.info(
+            "request.end",
+            extra={"status_code": response.status_code, "path": request.url.path},
+        )
+        return response
+
+    app.include_router(health_router, prefix=settings.api_prefix)
+    return app
+
+
+def _asgi_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+    app.include_router(health_router, prefix=settings.api_prefix)
+    return app
+
+
+async def _drive(
+    app: FastAPI, total: int, concurrency: int
+) -> tuple[float, list[float]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    url = f"{settings.api_prefix}/healthz"
+
+    async with AsyncClient(app=app, base_url="http://bench") as client:
+
+        async def _one() -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(url)
+                latencies.append(time.perf_counter() - started)
+                assert (
+                    response.status_code == 200 and "x-request-id" in response.headers
+                )
+
+        for _ in range(min(total, 200)):  # warm up
+            await client.get(url)
+        started = time.perf_counter()
+        await asyncio.gather(*(_one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+    return elapsed, latencies
+
+
+async def main(total: int, concurrency: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        database.async_session_factory = async_sessionmaker(
+            engine, expire_on_commit=False
+        )
+        print(f"GET /healthz: {total} requests, concurrency {concurrency}")
+        for label, app in (
+            ("BaseHTTPMiddleware x2", _base_http_app()),
+            ("RequestContextMiddleware", _asgi_app()),
+        ):
+            elapsed, latencies = await _drive(app, total, concurrency)
+            p50 = statistics.median(latencies) * 1000
+            p99 = statistics.quantiles(latencies, n=100)[98] * 1000
+            print(
+                f"  {label:<26} {total / elapsed:8.1f} req/s  p50 {p50:6.2f} ms  p99 {p99:6.2f} ms"
+            )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,146 @@
+"""
+SMTP send throughput: one connection per message versus the pooled sessions.
+
+Usage:
+    python -m backend.benchmarks.bench_smtp_pool [--messages 500] [--concurrency 8] [--handshake-ms 20]
+
+Messages go to a minimal SMTP sink on localhost that accepts and discards everything.
+The sink does not speak TLS or AUTH, so ``--handshake-ms`` delays its greeting to stand
+in for the TCP/TLS/login round-trips a real provider costs on every new connection.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import smtplib
+import threading
+import time
+from email.message import EmailMessage
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///bench.db")
+os.environ.setdefault(
+    "JWT_SECRET_KEY", "benchmark-secret-key-with-at-least-32-characters"
+)
+os.environ.setdefault("ORBSURV_ALLOW_INSECURE_SETTINGS", "1")
+
+from backend.services.smtp_pool import SMTPConnectionPool  # noqa: E402
+
+
+class SMTPSink:
+    """Accept SMTP sessions on a background event loop and count delivered messages."""
+
+    def __init__(self, handshake_delay: float) -> None:
+        self.handshake_delay = handshake_delay
+        self.delivered = 0
+        self.connections = 0
+        self.port = 0
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        await asyncio.sleep(self.handshake_delay)
+        writer.write(b"220 sink ESMTP\r\n")
+        while line := await reader.readline():
+            verb = line[:4].upper()
+            if verb == b"EHLO":
+                writer.write(b"250-sink\r\n250 8BITMIME\r\n")
+            elif verb == b"DATA":
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                await writer.drain()
+                while (await reader.readline()) not in (b".\r\n", b""):
+                    pass
+                self.delivered += 1
+                writer.write(b"250 OK\r\n")
+            elif verb == b"QUIT":
+                writer.write(b"221 Bye\r\n")
+                break
+            elif verb == b"STAR":
+                writer.write(b"502 STARTTLS not supported\r\n")
+            else:
+                writer.write(b"250 OK\r\n")
+            await writer.drain()
+        writer.close()
+
+    def _serve(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, "127.0.0.1", 0)
+        )
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    def start(self) -> None:
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+def _message(index: int) -> EmailMessage:
+    message = EmailMessage()
+    message["To"] = f"user{index}@example.com"
+    message["From"] = "bench@example.com"
+    message["Subject"] = f"Benchmark message {index}"
+    message.set_content("Hello from the SMTP pool benchmark.\n" * 20)
+    return message
+
+
+def _send_unpooled(port: int, message: EmailMessage) -> None:
+    with smtplib.SMTP("127.0.0.1", port, timeout=15) as client:
+        client.ehlo()
+        client.send_message(message)
+
+
+async def _drive(label: str, send, total: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _one(index: int) -> None:
+        async with semaphore:
+            await send(_message(index))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_one(index) for index in range(total)))
+    elapsed = time.perf_counter() - started
+    print(f"{label:<24} {total / elapsed:8.1f} msg/s  ({elapsed:.2f}s)")
+
+
+async def main(total: int, concurrency: int, handshake_ms: float) -> None:
+    sink = SMTPSink(handshake_delay=handshake_ms / 1000)
+    sink.start()
+    try:
+        before = sink.connections
+
+        async def unpooled(message: EmailMessage) -> None:
+            await asyncio.to_thread(_send_unpooled, sink.port, message)
+
+        await _drive("connection per message", unpooled, total, concurrency)
+        print(f"  connections opened: {sink.connections - before}")
+
+        pool = SMTPConnectionPool(host="127.0.0.1", port=sink.port, size=concurrency)
+        before = sink.connections
+        await _drive("pooled sessions", pool.send, total, concurrency)
+        print(
+            f"  connections opened: {sink.connections - before}  pool: {pool.metrics()}"
+        )
+        pool.close()
+        print(f"sink delivered {sink.delivered} messages")
+    finally:
+        sink.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--handshake-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.concurrency, args.handshake_ms))
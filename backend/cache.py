@@ -0,0 +1,133 @@
+"""Small in-process caches shared across the API layers."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded LRU mapping whose entries expire after a time-to-live.
+
+    Not thread-safe; intended for use from a single event loop.
+    """
+
+    def __init__(self, *, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, *, ttl: Optional[float] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        lifetime = self.ttl if ttl is None else ttl
+        if lifetime <= 0:
+            return
+        self._entries[key] = (time.monotonic() + lifetime, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> Optional[V]:
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        entry = self._entries.get(key)  # type: ignore[arg-type]
+        return entry is not None and entry[0] > time.monotonic()
+
+
+class RefreshingSnapshot(Generic[V]):
+    """
+    A single cached value that is refreshed in the background once it goes stale.
+
+    Readers get the current snapshot immediately while it is younger than ``max_stale``;
+    past ``ttl`` a single background refresh is scheduled. Only a cold or badly outdated
+    snapshot makes the caller wait for ``loader``.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Awaitable[V]],
+        *,
+        ttl: float,
+        max_stale: Optional[float] = None,
+    ) -> None:
+        self._loader = loader
+        self.ttl = ttl
+        self.max_stale = max_stale if max_stale is not None else ttl * 10
+        self._value: Optional[V] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def age(self) -> Optional[float]:
+        if self._value is None:
+            return None
+        return time.monotonic() - self._loaded_at
+
+    async def get(self) -> V:
+        age = self.age
+        if age is None or age > self.max_stale or self.ttl <= 0:
+            return await self.refresh()
+        if age > self.ttl and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self._background_refresh())
+        assert self._value is not None
+        return self._value
+
+    async def refresh(self) -> V:
+        started = time.monotonic()
+        async with self._lock:
+            # Another caller may have refreshed while we waited for the lock.
+            if self._value is not None and self._loaded_at >= started:
+                return self._value
+            value = await self._loader()
+            self._value = value
+            self._loaded_at = time.monotonic()
+            return value
+
+    async def _background_refresh(self) -> None:
+        try:
+            await self.refresh()
+        except Exception:  # pragma: no cover - keep serving the stale snapshot
+            logger.exception("Background snapshot refresh failed")
+
+    def clear(self) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        self._refresh_task = None
+        self._value = None
+        self._loaded_at = 0.0
@@ -1,4 +1,4 @@
-from . import users, waitlist, contact, investor, pilot, audit, settings, analytics, order
+from . import users, waitlist, contact, investor, pilot, audit, settings, analytics, order, pagination, counting, outbox
 
 __all__ = [
     "users",
@@ -10,4 +10,7 @@ __all__ = [
     "settings",
     "analytics",
     "order",
+    "pagination",
+    "counting",
+    "outbox",
 ]
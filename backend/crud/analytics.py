@@ -26,4 +26,17 @@ async def get_total_pilot_requests(session: AsyncSession) -> int:
 
 async def get_total_investor_interest(session: AsyncSession) -> int:
     result = await session.execute(select(func.count(models.InvestorInterest.id)))
-    return result.scalar_one()
\ No newline at end of file
+    return result.scalar_one()
+
+
+async def get_admin_totals(session: AsyncSession) -> dict[str, int]:
+    """Fetch every admin summary counter in a single round trip."""
+    stmt = select(
+        select(func.count(models.User.id)).scalar_subquery().label("total_users"),
+        select(func.count(models.Contact.id)).scalar_subquery().label("total_contacts"),
+        select(func.count(models.Waitlist.id)).scalar_subquery().label("total_waitlist"),
+        select(func.count(models.PilotRequest.id)).scalar_subquery().label("total_pilot_requests"),
+        select(func.count(models.InvestorInterest.id)).scalar_subquery().label("total_investor_interest"),
+    )
+    result = await session.execute(stmt)
+    return dict(result.one()._mapping)
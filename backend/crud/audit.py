@@ -4,10 +4,17 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import models
+from .pagination import paginate
 
 
-async def get_all(session: AsyncSession, *, limit: int = 100, offset: int = 0) -> Sequence[models.AuditLog]:
-    stmt = select(models.AuditLog).order_by(models.AuditLog.created_at.desc()).limit(limit).offset(offset)
+async def get_all(
+    session: AsyncSession,
+    *,
+    limit: int = 100,
+    offset: int = 0,
+    cursor: str | None = None,
+) -> Sequence[models.AuditLog]:
+    stmt = paginate(select(models.AuditLog), models.AuditLog, limit=limit, offset=offset, cursor=cursor)
     result = await session.execute(stmt)
     return result.scalars().all()
 
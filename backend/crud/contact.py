@@ -4,6 +4,7 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import models, schemas
+from .pagination import paginate
 
 
 async def create_contact(session: AsyncSession, payload: schemas.ContactCreate) -> models.Contact:
@@ -18,7 +19,13 @@ async def count_contacts(session: AsyncSession) -> int:
     return result.scalar_one()
 
 
-async def list_all(session: AsyncSession, *, limit: int = 100, offset: int = 0) -> list[models.Contact]:
-    stmt = select(models.Contact).order_by(models.Contact.created_at.desc()).limit(limit).offset(offset)
+async def list_all(
+    session: AsyncSession,
+    *,
+    limit: int = 100,
+    offset: int = 0,
+    cursor: str | None = None,
+) -> list[models.Contact]:
+    stmt = paginate(select(models.Contact), models.Contact, limit=limit, offset=offset, cursor=cursor)
     result = await session.execute(stmt)
     return result.scalars().all()
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""Row-count strategies used to fill pagination totals."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..cache import TTLCache
+from ..settings import settings
+
+# Below this many rows an exact COUNT(*) is cheap enough to run even when an estimate was requested.
+ESTIMATE_EXACT_THRESHOLD = 10_000
+
+_PG_ESTIMATE = text(
+    "SELECT c.reltuples::bigint FROM pg_class c "
+    "JOIN pg_namespace n ON n.oid = c.relnamespace "
+    "WHERE c.relname = :table AND n.nspname = current_schema()"
+)
+
+
+class CountStrategy(str, Enum):
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
+
+
+@dataclass(slots=True)
+class CountResult:
+    total: int
+    exact: bool
+
+
+count_cache: TTLCache[str, int] = TTLCache(
+    maxsize=64, ttl=settings.admin_count_cache_ttl_seconds
+)
+
+
+async def _exact(session: AsyncSession, model: Any) -> int:
+    result = await session.execute(select(func.count(model.id)))
+    return result.scalar_one()
+
+
+async def _estimate(session: AsyncSession, model: Any) -> int | None:
+    if session.bind is None or session.bind.dialect.name != "postgresql":
+        return None
+    result = await session.execute(_PG_ESTIMATE, {"table": model.__tablename__})
+    estimate = result.scalar_one_or_none()
+    # reltuples is -1 (or 0 on older servers) until the table has been vacuumed/analyzed.
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+async def count_rows(
+    session: AsyncSession, model: Any, strategy: CountStrategy = CountStrategy.EXACT
+) -> CountResult:
+    """
+    Count ``model`` rows using ``strategy``.
+
+    ``cached`` serves an exact count taken within the last ``ADMIN_COUNT_CACHE_TTL_SECONDS``;
+    ``estimated`` reads the planner's ``pg_class.reltuples`` on PostgreSQL. Both fall back
+    to an exact count when they have nothing better, and ``CountResult.exact`` reports
+    which one the caller got.
+    """
+    if strategy is CountStrategy.CACHED:
+        key = model.__tablename__
+        cached = count_cache.get(key)
+        if cached is not None:
+            return CountResult(total=cached, exact=False)
+        total = await _exact(session, model)
+        count_cache.set(key, total)
+        return CountResult(total=total, exact=True)
+
+    if strategy is CountStrategy.ESTIMATED:
+        estimate = await _estimate(session, model)
+        if estimate is not None and estimate >= ESTIMATE_EXACT_THRESHOLD:
+            return CountResult(total=estimate, exact=False)
+
+    return CountResult(total=await _exact(session, model), exact=True)
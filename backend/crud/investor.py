@@ -4,6 +4,7 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import models, schemas
+from .pagination import paginate
 
 
 async def create_interest(session: AsyncSession, payload: schemas.InvestorInterestCreate) -> models.InvestorInterest:
@@ -23,7 +24,13 @@ async def count_interest(session: AsyncSession) -> int:
     return result.scalar_one()
 
 
-async def list_all(session: AsyncSession, *, limit: int = 100, offset: int = 0) -> list[models.InvestorInterest]:
-    stmt = select(models.InvestorInterest).order_by(models.InvestorInterest.created_at.desc()).limit(limit).offset(offset)
+async def list_all(
+    session: AsyncSession,
+    *,
+    limit: int = 100,
+    offset: int = 0,
+    cursor: str | None = None,
+) -> list[models.InvestorInterest]:
+    stmt = paginate(select(models.InvestorInterest), models.InvestorInterest, limit=limit, offset=offset, cursor=cursor)
     result = await session.execute(stmt)
     return result.scalars().all()
\ No newline at end of file
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Mapping, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..settings import settings
+
+
+async def enqueue_email(
+    session: AsyncSession,
+    template: str,
+    *,
+    to: str,
+    subject: str,
+    context: Mapping[str, Any] | None = None,
+) -> models.EmailOutbox:
+    """Persist an email for the outbox worker; it is sent once the caller commits."""
+    entry = models.EmailOutbox(
+        template=template,
+        to=to,
+        subject=subject,
+        context=dict(context or {}),
+        status=models.EmailStatus.PENDING,
+        attempts=0,
+        next_attempt_at=datetime.now(timezone.utc),
+    )
+    session.add(entry)
+    await session.flush()
+    return entry
+
+
+async def claim_due(
+    session: AsyncSession, *, limit: int, lease: float
+) -> Sequence[models.EmailOutbox]:
+    """
+    Lease a batch of due messages by pushing ``next_attempt_at`` ``lease`` seconds out.
+
+    Rows another worker holds are skipped. Commit straight away: the row locks only
+    last until then, and the lease keeps other workers off the batch while it is sent.
+    A worker that dies mid-batch leaves its messages to be retried once the lease ends.
+    """
+    stmt = (
+        select(models.EmailOutbox)
+        .where(
+            models.EmailOutbox.status == models.EmailStatus.PENDING,
+            models.EmailOutbox.next_attempt_at <= datetime.now(timezone.utc),
+        )
+        .order_by(models.EmailOutbox.next_attempt_at, models.EmailOutbox.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    entries = (await session.execute(stmt)).scalars().all()
+    leased_until = datetime.now(timezone.utc) + timedelta(seconds=lease)
+    for entry in entries:
+        entry.next_attempt_at = leased_until
+    await session.flush()
+    return entries
+
+
+def mark_sent(entry: models.EmailOutbox) -> None:
+    entry.status = models.EmailStatus.SENT
+    entry.attempts += 1
+    entry.sent_at = datetime.now(timezone.utc)
+    entry.last_error = None
+
+
+def mark_failed(
+    entry: models.EmailOutbox, error: str, *, permanent: bool = False
+) -> None:
+    """Schedule a retry with exponential backoff, or dead-letter the message."""
+    entry.attempts += 1
+    entry.last_error = error[:2000]
+    if permanent or entry.attempts >= settings.email_outbox_max_attempts:
+        entry.status = models.EmailStatus.DEAD
+        return
+    delay = min(
+        settings.email_outbox_backoff_max_seconds,
+        settings.email_outbox_backoff_base_seconds * 2 ** (entry.attempts - 1),
+    )
+    jitter = random.uniform(0, delay * 0.1)
+    entry.next_attempt_at = datetime.now(timezone.utc) + timedelta(
+        seconds=delay + jitter
+    )
+
+
+async def count_pending(session: AsyncSession) -> int:
+    stmt = select(func.count(models.EmailOutbox.id)).where(
+        models.EmailOutbox.status == models.EmailStatus.PENDING
+    )
+    result = await session.execute(stmt)
+    return result.scalar_one()
@@ -0,0 +1,60 @@
+"""Offset and keyset (cursor) pagination over ``(created_at, id)``."""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import Select, tuple_
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client supplies a cursor we did not issue."""
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise InvalidCursor("Malformed pagination cursor") from exc
+
+
+def paginate(
+    stmt: Select[Any],
+    model: Any,
+    *,
+    limit: int,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+) -> Select[Any]:
+    """
+    Order ``stmt`` newest-first and restrict it to one page.
+
+    With a ``cursor`` the page starts strictly after the row it encodes, using a
+    ``(created_at, id)`` row-value comparison that the composite index can seek to.
+    Without one, plain ``LIMIT/OFFSET`` is used.
+    """
+    stmt = stmt.order_by(model.created_at.desc(), model.id.desc()).limit(limit)
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        return stmt.where(
+            tuple_(model.created_at, model.id) < tuple_(created_at, row_id)
+        )
+    return stmt.offset(offset)
+
+
+def next_cursor(items: Sequence[Any], limit: int) -> Optional[str]:
+    """Cursor for the page after ``items``, or ``None`` when this was the last page."""
+    if limit <= 0 or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.id)
@@ -4,6 +4,7 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import models, schemas
+from .pagination import paginate
 
 
 async def create_pilot_request(session: AsyncSession, payload: schemas.PilotRequestCreate) -> models.PilotRequest:
@@ -23,7 +24,13 @@ async def count_pilot_requests(session: AsyncSession) -> int:
     return result.scalar_one()
 
 
-async def list_all(session: AsyncSession, *, limit: int = 100, offset: int = 0) -> list[models.PilotRequest]:
-    stmt = select(models.PilotRequest).order_by(models.PilotRequest.created_at.desc()).limit(limit).offset(offset)
+async def list_all(
+    session: AsyncSession,
+    *,
+    limit: int = 100,
+    offset: int = 0,
+    cursor: str | None = None,
+) -> list[models.PilotRequest]:
+    stmt = paginate(select(models.PilotRequest), models.PilotRequest, limit=limit, offset=offset, cursor=cursor)
     result = await session.execute(stmt)
     return result.scalars().all()
\ No newline at end of file
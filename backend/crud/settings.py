@@ -5,6 +5,7 @@ import json
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import models, schemas
+from ..services.user_cache import user_cache
 
 
 def _ensure_dict(value: object) -> dict:
@@ -30,6 +31,7 @@ async def update_notifications(
         "sms_stage": payload.sms_stage,
         "weekly_summary": payload.weekly_summary,
     }
+    user_cache.invalidate_on_commit(session, user.email)
     await session.flush()
     return user.notification_settings
 
@@ -44,5 +46,6 @@ async def update_automation(
         "default_patrol": payload.default_patrol,
         "auto_reengage": payload.auto_reengage,
     }
+    user_cache.invalidate_on_commit(session, user.email)
     await session.flush()
     return user.automation_settings
@@ -6,7 +6,11 @@ from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import models, schemas
-from ..security import hash_password, normalize_email
+from ..security import normalize_email
+from ..services.passwords import password_hasher
+from ..services.token_versions import token_versions
+from ..services.user_cache import user_cache
+from .pagination import paginate
 
 
 async def get_by_email(session: AsyncSession, *, email: str) -> models.User | None:
@@ -25,7 +29,7 @@ async def create_user(
         email=normalize_email(payload.email),
         name=payload.name,
         organization=payload.organization,
-        password_hash=hash_password(payload.password),
+        password_hash=await password_hasher.hash(payload.password),
         role=role,
     )
     session.add(user)
@@ -33,8 +37,14 @@ async def create_user(
     return user
 
 
-async def list_users(session: AsyncSession, *, limit: int = 100, offset: int = 0) -> Sequence[models.User]:
-    stmt = select(models.User).order_by(models.User.created_at.desc()).limit(limit).offset(offset)
+async def list_users(
+    session: AsyncSession,
+    *,
+    limit: int = 100,
+    offset: int = 0,
+    cursor: str | None = None,
+) -> Sequence[models.User]:
+    stmt = paginate(select(models.User), models.User, limit=limit, offset=offset, cursor=cursor)
     result = await session.execute(stmt)
     return result.scalars().all()
 
@@ -47,12 +57,23 @@ async def update_role(session: AsyncSession, *, user_id: int, role: models.UserR
         .returning(models.User)
     )
     result = await session.execute(stmt)
-    return result.scalars().first()
+    user = result.scalars().first()
+    if user is not None:
+        user_cache.invalidate_on_commit(session, user.email)
+        await token_versions.invalidate(user.email)
+    return user
 
 
 async def update_profile(session: AsyncSession, *, user: models.User, data: schemas.AccountProfileUpdate) -> models.User:
-    if data.email:
+    user_cache.invalidate_on_commit(session, user.email)
+    if data.email and normalize_email(data.email) != user.email:
+        # Tokens name the old address as their subject; retire them so claim-checked
+        # routes stop honouring it, as the user lookup in get_current_user does.
+        await token_versions.invalidate(user.email)
+        user.token_version += 1
         user.email = normalize_email(data.email)
+        # A row cached under the new address (e.g. a user who held it before) is stale too.
+        user_cache.invalidate_on_commit(session, user.email)
     if data.name is not None:
         user.name = data.name
     if data.organization is not None:
@@ -62,12 +83,16 @@ async def update_profile(session: AsyncSession, *, user: models.User, data: sche
 
 
 async def update_password(session: AsyncSession, *, user: models.User, new_password: str) -> None:
-    user.password_hash = hash_password(new_password)
+    user.password_hash = await password_hasher.hash(new_password)
+    await token_versions.invalidate(user.email)
     user.token_version += 1
+    user_cache.invalidate_on_commit(session, user.email)
     await session.flush()
 
 
 async def bump_token_version(session: AsyncSession, *, user: models.User) -> models.User:
+    await token_versions.invalidate(user.email)
     user.token_version += 1
+    user_cache.invalidate_on_commit(session, user.email)
     await session.flush()
     return user
@@ -1,12 +1,26 @@
+import logging
+import time
+import uuid
 from collections.abc import AsyncGenerator
 from typing import Any
 
-from sqlalchemy import MetaData
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
+from sqlalchemy import MetaData, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, declared_attr
+from sqlalchemy.pool import NullPool
 
 from .settings import settings
 
+logger = logging.getLogger(__name__)
+
 
 NAMING_CONVENTION = {
     "ix": "ix_%(column_0_label)s",
@@ -25,16 +39,92 @@ class Base(DeclarativeBase):
         return cls.__name__.lower()
 
 
+def pool_budget() -> tuple[int, int]:
+    """
+    Return ``(pool_size, max_overflow)`` for one worker process.
+
+    ``DB_MAX_CONNECTIONS`` is split evenly across ``WEB_CONCURRENCY`` workers, with a
+    quarter of each share held back as overflow for bursts, so the deployment as a
+    whole never opens more connections than the budget. Explicit ``DB_POOL_SIZE`` and
+    ``DB_MAX_OVERFLOW`` take precedence.
+    """
+    share = max(1, settings.db_max_connections // settings.web_concurrency)
+    max_overflow = (
+        settings.db_max_overflow if settings.db_max_overflow is not None else share // 4
+    )
+    pool_size = settings.db_pool_size or max(1, share - max_overflow)
+    return pool_size, max_overflow
+
+
+def engine_options(url: str) -> dict[str, Any]:
+    """Keyword arguments for :func:`create_async_engine` derived from settings and the driver."""
+    options: dict[str, Any] = {"echo": settings.env == "development", "future": True}
+    driver = make_url(url).get_driver_name()
+    if driver == "asyncpg":
+        connect_args: dict[str, Any] = {
+            "prepared_statement_cache_size": settings.db_statement_cache_size
+        }
+        if settings.db_pgbouncer:
+            # Transaction-pooled PgBouncer hands each transaction to any server connection,
+            # so prepared statements must not be cached or reuse names, and pooling is its job.
+            connect_args = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            }
+            options["poolclass"] = NullPool
+        options["connect_args"] = connect_args
+    if "poolclass" not in options and not url.startswith("sqlite"):
+        pool_size, max_overflow = pool_budget()
+        options.update(
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds,
+        )
+    return options
+
+
+def ping_after_idle(engine: AsyncEngine, idle_seconds: float) -> None:
+    """
+    Check a pooled connection with ``SELECT 1`` only if it sat idle for ``idle_seconds``.
+
+    ``pool_pre_ping`` pays that round trip on every checkout; recently used connections
+    are almost always still alive. A failed ping raises ``DisconnectionError``, which
+    makes the pool discard the connection and hand out a fresh one.
+    """
+    pool = engine.sync_engine.pool
+
+    @event.listens_for(pool, "checkin")
+    def _checkin(dbapi_connection: Any, record: Any) -> None:
+        record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(pool, "checkout")
+    def _checkout(dbapi_connection: Any, record: Any, proxy: Any) -> None:
+        checked_in_at = record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        except Exception as exc:
+            logger.info("Discarding stale database connection: %s", exc)
+            raise DisconnectionError() from exc
+
+
 engine = create_async_engine(
-    settings.database_url,
-    echo=settings.env == "development",
-    future=True,
-    pool_pre_ping=True,
+    settings.database_url, **engine_options(settings.database_url)
 )
+ping_after_idle(engine, settings.db_ping_idle_seconds)
 
 async_session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
+async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    # FastAPI always supplies the request to dependencies; scripts and workers open
+    # sessions from async_session_factory directly.
     async with async_session_factory() as session:
+        # Lets a commit pin this caller's reads to the primary (see replica.py).
+        session.info["request"] = request
         yield session
@@ -0,0 +1,30 @@
+"""
+Gunicorn settings picked up automatically from the working directory.
+
+The worker count comes from ``WEB_CONCURRENCY``, the same setting each worker uses to
+size its share of the database connection budget. Workers share a Prometheus
+multiprocess directory so ``/metrics`` reports the whole server rather than whichever
+worker answered the scrape.
+"""
+import os
+import shutil
+
+# prometheus_client picks its value storage at import time, and workers inherit the
+# master's modules, so the directory must be set before the import below.
+multiproc_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", "/tmp/orbsurv-prometheus"
+)
+
+from prometheus_client import multiprocess  # noqa: E402
+
+workers = int(os.environ.get("WEB_CONCURRENCY", "4"))
+
+
+def on_starting(server):
+    # Samples from a previous run would otherwise be summed into the new one.
+    shutil.rmtree(multiproc_dir, ignore_errors=True)
+    os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    multiprocess.mark_process_dead(worker.pid)
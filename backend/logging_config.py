@@ -0,0 +1,148 @@
+"""Structured, non-blocking logging for the API process."""
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import sys
+import zlib
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Mapping, Optional
+
+from .settings import settings
+
+REQUEST_EVENTS = frozenset({"request.start", "request.end"})
+
+# Attributes every LogRecord has; anything else was passed via ``extra``.
+_RESERVED = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message",
+    "asctime",
+}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message and any ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class RequestSampler(logging.Filter):
+    """
+    Keep a fraction of ``request.start``/``request.end`` records, per route.
+
+    ``rates`` maps path prefixes to a keep ratio; the longest matching prefix wins,
+    otherwise ``default_rate`` applies. The decision hashes the request id, so a
+    request's start and end are kept or dropped together. Records at WARNING and
+    above, and any ``request.end`` with a 5xx status, are always kept.
+    """
+
+    def __init__(
+        self, *, default_rate: float = 1.0, rates: Optional[Mapping[str, float]] = None
+    ) -> None:
+        super().__init__()
+        self.default_rate = default_rate
+        self.rates = sorted(
+            (rates or {}).items(), key=lambda item: len(item[0]), reverse=True
+        )
+        self.dropped = 0
+
+    def rate_for(self, path: str) -> float:
+        for prefix, rate in self.rates:
+            if path.startswith(prefix):
+                return rate
+        return self.default_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or record.msg not in REQUEST_EVENTS:
+            return True
+        if getattr(record, "status_code", 0) >= 500:
+            return True
+        rate = self.rate_for(getattr(record, "path", ""))
+        if rate >= 1.0:
+            return True
+        request_id = str(getattr(record, "request_id", ""))
+        if (
+            rate > 0.0
+            and zlib.crc32(request_id.encode("utf-8")) % 10_000 < rate * 10_000
+        ):
+            return True
+        self.dropped += 1
+        return False
+
+
+class _QueueHandler(QueueHandler):
+    """Enqueue a copy of the record with its message and traceback already rendered, keeping ``extra`` fields."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[_QueueHandler] = None
+
+
+def configure_logging() -> None:
+    """
+    Route root logging through a queue drained by a background thread.
+
+    Callers only pay for building and enqueueing the record; formatting and the write
+    to stderr happen on the listener thread. Calling this again is a no-op.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(
+        JSONFormatter()
+        if settings.log_json
+        else logging.Formatter(logging.BASIC_FORMAT)
+    )
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _queue_handler = _QueueHandler(log_queue)
+    _queue_handler.addFilter(
+        RequestSampler(
+            default_rate=settings.log_request_sample_rate,
+            rates=settings.log_request_sample_rates,
+        )
+    )
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    root.setLevel(settings.log_level.upper())
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Flush queued records and detach the queue handler."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener.stop()
+    _listener = None
+    _queue_handler = None
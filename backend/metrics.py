@@ -0,0 +1,162 @@
+"""
+Prometheus metrics shared by the API and the email worker.
+
+Under gunicorn, set ``PROMETHEUS_MULTIPROC_DIR`` (``gunicorn.conf.py`` does) so every
+worker writes its samples to that directory and ``/metrics`` aggregates all of them,
+whichever worker serves the scrape. Without it, metrics cover the current process only.
+"""
+from __future__ import annotations
+
+import os
+from typing import Any
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+__all__ = ["CONTENT_TYPE_LATEST", "instrument_engine", "render"]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to serve an HTTP request, by route template.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Database connections currently checked out of the pool.",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond the pool size (negative while the pool is not yet full).",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CAPACITY = Gauge(
+    "db_pool_capacity",
+    "Pool size plus allowed overflow; checked_out / capacity is the pool's saturation.",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+RATE_LIMIT_DECISIONS = Counter(
+    "rate_limit_decisions_total",
+    "Rate-limit checks by policy scope and outcome.",
+    ["scope", "decision"],
+)
+REDIS_CIRCUIT_STATE = Gauge(
+    "redis_circuit_state",
+    "Redis circuit breaker state: 0 closed, 1 half-open, 2 open (worst worker).",
+    multiprocess_mode="livemax",
+)
+REDIS_CIRCUIT_TRANSITIONS = Counter(
+    "redis_circuit_transitions_total",
+    "Redis circuit breaker state changes.",
+    ["from", "to"],
+)
+RATE_LIMIT_STORE_KEYS = Gauge(
+    "rate_limit_store_keys",
+    "Keys held by the in-process fallback rate-limit store.",
+    multiprocess_mode="livesum",
+)
+RATE_LIMIT_STORE_CAPACITY = Gauge(
+    "rate_limit_store_capacity",
+    "Maximum keys the in-process fallback rate-limit store holds before evicting.",
+    multiprocess_mode="livesum",
+)
+RATE_LIMIT_STORE_EVICTIONS = Counter(
+    "rate_limit_store_evictions_total",
+    "Live keys evicted from the in-process rate-limit store because it was full.",
+)
+RATE_LIMIT_STORE_EXPIRED = Counter(
+    "rate_limit_store_expired_total",
+    "Expired keys removed from the in-process rate-limit store by sweeps.",
+)
+RATE_LIMIT_STORE_SWEEPS = Counter(
+    "rate_limit_store_sweeps_total",
+    "Sweeps of the in-process rate-limit store.",
+)
+RATE_LIMIT_PRECOUNT_EVICTIONS = Counter(
+    "rate_limit_precount_evictions_total",
+    "Keys evicted from the local rate-limit pre-counter because it was full.",
+)
+CAPTCHA_VERIFY_DURATION = Histogram(
+    "captcha_verify_duration_seconds",
+    "Round trip to the captcha verification service.",
+    ["outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+EMAIL_DELIVERY_DURATION = Histogram(
+    "email_delivery_duration_seconds",
+    "Time to hand one outbox email to the provider.",
+    ["outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def instrument_engine(engine: AsyncEngine, name: str = "primary") -> None:
+    """Track checked-out and overflow connections of ``engine``'s pool on every checkout and checkin."""
+    pool = engine.sync_engine.pool
+    if not hasattr(pool, "checkedout"):
+        return  # NullPool/StaticPool have nothing to report
+
+    checked_out = DB_POOL_CHECKED_OUT.labels(engine=name)
+    overflow = DB_POOL_OVERFLOW.labels(engine=name)
+    DB_POOL_CAPACITY.labels(engine=name).set(
+        pool.size() + max(0, getattr(pool, "_max_overflow", 0))
+    )
+
+    def _update(*_: Any) -> None:
+        checked_out.set(pool.checkedout())
+        overflow.set(pool.overflow())
+
+    event.listen(pool, "checkout", _update)
+    event.listen(pool, "checkin", _update)
+
+
+class _Snapshot:
+    """A one-off collector for values read at scrape time rather than recorded as they happen."""
+
+    def __init__(self, gauges: dict[str, tuple[str, float]]) -> None:
+        self.gauges = gauges
+
+    def collect(self):
+        for name, (documentation, value) in self.gauges.items():
+            yield GaugeMetricFamily(name, documentation, value=value)
+
+
+def render(snapshot: dict[str, tuple[str, float]] | None = None) -> bytes:
+    """Exposition text for all recorded metrics plus ``snapshot`` gauges (name -> (help, value))."""
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    output = generate_latest(registry)
+    if snapshot:
+        extra = CollectorRegistry()
+        extra.register(_Snapshot(snapshot))
+        output += generate_latest(extra)
+    return output
@@ -1,5 +1,11 @@
 """Middleware modules."""
-from .rate_limit import rate_limit_middleware, get_client_identifier, reset_in_memory_counters
-
-__all__ = ["rate_limit_middleware", "get_client_identifier", "reset_in_memory_counters"]
+from .policies import ROUTE_POLICIES, RateLimitMiddleware, RateLimitPolicy
+from .rate_limit import get_client_identifier, reset_in_memory_counters
 
+__all__ = [
+    "ROUTE_POLICIES",
+    "RateLimitMiddleware",
+    "RateLimitPolicy",
+    "get_client_identifier",
+    "reset_in_memory_counters",
+]
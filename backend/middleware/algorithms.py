@@ -0,0 +1,219 @@
+"""Rate-limit algorithms with constant-size state per key."""
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Optional
+
+# Every Lua script receives KEYS[1] plus ARGV = {limit, window_ms}, reads the clock with
+# TIME so all workers share one time source, and returns {allowed, remaining, reset_ms}.
+_NOW_MS = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class Decision:
+    allowed: bool
+    remaining: int
+    reset_after: float
+
+
+class RateLimitAlgorithm(ABC):
+    """
+    One rate-limit policy, implemented twice: in Python for the in-process store and as
+    a Lua script for Redis. ``evaluate`` is pure: it takes the key's previous state
+    (``None`` for a new key) and returns the decision, the new state and how long that
+    state must be kept.
+    """
+
+    name: str
+    script: str
+
+    @abstractmethod
+    def evaluate(
+        self, state: Optional[Any], now: float, limit: int, window: float
+    ) -> tuple[Decision, Any, float]:
+        """Return ``(decision, new_state, state_ttl_seconds)``."""
+
+
+class FixedWindow(RateLimitAlgorithm):
+    """Count requests in a window that starts at the key's first hit. Allows 2x bursts at window edges."""
+
+    name = "fixed_window"
+    script = """
+local limit = tonumber(ARGV[1])
+local window_ms = tonumber(ARGV[2])
+local count = tonumber(redis.call('GET', KEYS[1]) or '0')
+if count >= limit then
+    local ttl = redis.call('PTTL', KEYS[1])
+    if ttl < 0 then
+        redis.call('PEXPIRE', KEYS[1], window_ms)
+        ttl = window_ms
+    end
+    return {0, 0, ttl}
+end
+count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('PEXPIRE', KEYS[1], window_ms)
+end
+return {1, limit - count, redis.call('PTTL', KEYS[1])}
+"""
+
+    def evaluate(self, state, now, limit, window):
+        count, reset_at = state if state and now < state[1] else (0, now + window)
+        if count >= limit:
+            return Decision(False, 0, reset_at - now), (count, reset_at), reset_at - now
+        count += 1
+        return (
+            Decision(True, limit - count, reset_at - now),
+            (count, reset_at),
+            reset_at - now,
+        )
+
+
+class SlidingWindowCounter(RateLimitAlgorithm):
+    """
+    Weight the previous aligned window's count by how much of it still overlaps the
+    trailing window. Close to a sliding log without storing per-request timestamps.
+    """
+
+    name = "sliding_window"
+    script = (
+        _NOW_MS
+        + """
+local limit = tonumber(ARGV[1])
+local window_ms = tonumber(ARGV[2])
+local start = now - (now % window_ms)
+local state = redis.call('HMGET', KEYS[1], 'start', 'curr', 'prev')
+local ws = tonumber(state[1]) or start
+local curr = tonumber(state[2]) or 0
+local prev = tonumber(state[3]) or 0
+if ws ~= start then
+    if start - ws == window_ms then prev = curr else prev = 0 end
+    curr = 0
+    ws = start
+end
+local elapsed = now - ws
+local estimated = prev * (1 - elapsed / window_ms) + curr
+if estimated + 1 > limit then
+    local retry = ws + window_ms - now
+    if prev > 0 and curr < limit then
+        retry = math.min(retry, window_ms * (1 - (limit - 1 - curr) / prev) - elapsed)
+    end
+    return {0, 0, math.max(1, math.ceil(retry))}
+end
+curr = curr + 1
+redis.call('HSET', KEYS[1], 'start', ws, 'curr', curr, 'prev', prev)
+redis.call('PEXPIRE', KEYS[1], 2 * window_ms - elapsed)
+return {1, math.floor(limit - estimated - 1), ws + window_ms - now}
+"""
+    )
+
+    def evaluate(self, state, now, limit, window):
+        start = now - (now % window)
+        ws, curr, prev = state or (start, 0, 0)
+        if ws != start:
+            prev = curr if math.isclose(start - ws, window) else 0
+            curr, ws = 0, start
+        elapsed = now - ws
+        estimated = prev * (1 - elapsed / window) + curr
+        if estimated + 1 > limit:
+            retry = ws + window - now
+            if prev > 0 and curr < limit:
+                retry = min(retry, window * (1 - (limit - 1 - curr) / prev) - elapsed)
+            return Decision(False, 0, retry), (ws, curr, prev), 2 * window - elapsed
+        curr += 1
+        remaining = math.floor(limit - estimated - 1)
+        return (
+            Decision(True, remaining, ws + window - now),
+            (ws, curr, prev),
+            2 * window - elapsed,
+        )
+
+
+class TokenBucket(RateLimitAlgorithm):
+    """Bucket of ``limit`` tokens refilled continuously at ``limit / window`` per second."""
+
+    name = "token_bucket"
+    script = (
+        _NOW_MS
+        + """
+local limit = tonumber(ARGV[1])
+local window_ms = tonumber(ARGV[2])
+local rate = limit / window_ms
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or limit
+local last = tonumber(state[2]) or now
+tokens = math.min(limit, tokens + math.max(0, now - last) * rate)
+if tokens < 1 then
+    return {0, 0, math.max(1, math.ceil((1 - tokens) / rate))}
+end
+tokens = tokens - 1
+local full_in = math.ceil((limit - tokens) / rate)
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.max(1, full_in))
+return {1, math.floor(tokens), full_in}
+"""
+    )
+
+    def evaluate(self, state, now, limit, window):
+        rate = limit / window
+        tokens, last = state or (float(limit), now)
+        tokens = min(float(limit), tokens + max(0.0, now - last) * rate)
+        if tokens < 1:
+            retry = (1 - tokens) / rate
+            return Decision(False, 0, retry), (tokens, now), (limit - tokens) / rate
+        tokens -= 1
+        full_in = (limit - tokens) / rate
+        return Decision(True, math.floor(tokens), full_in), (tokens, now), full_in
+
+
+class GCRA(RateLimitAlgorithm):
+    """
+    Generic cell rate algorithm: store only the theoretical arrival time (TAT). Requests
+    are spaced ``window / limit`` apart with bursts of up to ``limit``.
+    """
+
+    name = "gcra"
+    script = (
+        _NOW_MS
+        + """
+local limit = tonumber(ARGV[1])
+local window_ms = tonumber(ARGV[2])
+local interval = window_ms / limit
+local tat = math.max(tonumber(redis.call('GET', KEYS[1]) or now), now)
+local new_tat = tat + interval
+local allow_at = new_tat - window_ms
+if allow_at - now > 1e-6 then
+    return {0, 0, math.ceil(allow_at - now)}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+return {1, math.floor((window_ms - (new_tat - now)) / interval + 1e-6), math.ceil(new_tat - now)}
+"""
+    )
+
+    def evaluate(self, state, now, limit, window):
+        interval = window / limit
+        tat = max(state if state is not None else now, now)
+        new_tat = tat + interval
+        allow_at = new_tat - window
+        if allow_at - now > 1e-9:  # tolerate float drift from summing intervals
+            return Decision(False, 0, allow_at - now), tat, tat - now
+        remaining = math.floor((window - (new_tat - now)) / interval + 1e-9)
+        return Decision(True, remaining, new_tat - now), new_tat, new_tat - now
+
+
+ALGORITHMS: dict[str, RateLimitAlgorithm] = {
+    algorithm.name: algorithm
+    for algorithm in (FixedWindow(), SlidingWindowCounter(), TokenBucket(), GCRA())
+}
+
+
+def get_algorithm(name: str) -> RateLimitAlgorithm:
+    try:
+        return ALGORITHMS[name]
+    except KeyError:
+        raise ValueError(f"Unknown rate limit algorithm: {name}") from None
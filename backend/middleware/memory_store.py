@@ -0,0 +1,172 @@
+"""Bounded, sharded in-process state store for the fallback rate limiter."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import math
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Optional
+
+from ..metrics import (
+    RATE_LIMIT_STORE_CAPACITY,
+    RATE_LIMIT_STORE_EVICTIONS,
+    RATE_LIMIT_STORE_EXPIRED,
+    RATE_LIMIT_STORE_KEYS,
+    RATE_LIMIT_STORE_SWEEPS,
+)
+from .algorithms import Decision, RateLimitAlgorithm
+
+logger = logging.getLogger(__name__)
+
+
+class _Shard:
+    __slots__ = ("lock", "entries")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # key -> (algorithm state, monotonic expiry), least recently used first
+        self.entries: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+
+
+class ShardedRateLimitStore:
+    """
+    Rate-limit state split across ``shards`` independently locked LRU maps.
+
+    Keys hash to a shard, so checks for different clients rarely share a lock. Each
+    shard holds at most ``max_keys / shards`` keys and evicts its least recently used
+    key beyond that, which bounds memory under a scan from many addresses; an evicted
+    key simply starts over with a fresh allowance. Expired keys are dropped on access
+    and by a periodic sweeper task.
+
+    Evictions, expirations and sweeps are counted in the Prometheus metrics; the size
+    gauges are refreshed by :meth:`report_size` after each background sweep and at scrape time.
+    """
+
+    def __init__(
+        self, *, shards: int = 16, max_keys: int = 100_000, sweep_interval: float = 30.0
+    ) -> None:
+        self.shards = [_Shard() for _ in range(max(1, shards))]
+        self.max_keys = max(1, max_keys)
+        self.shard_capacity = max(1, math.ceil(self.max_keys / len(self.shards)))
+        self.sweep_interval = sweep_interval
+        self._sweeper: Optional[asyncio.Task[None]] = None
+        self.checks = 0
+        self.evicted = 0
+        self.expired = 0
+
+    def _shard(self, key: str) -> _Shard:
+        return self.shards[zlib.crc32(key.encode("utf-8")) % len(self.shards)]
+
+    def apply(
+        self, key: str, policy: RateLimitAlgorithm, limit: int, window: float
+    ) -> Decision:
+        shard = self._shard(key)
+        with shard.lock:
+            now = time.monotonic()
+            self.checks += 1
+            entry = shard.entries.get(key)
+            state = entry[0] if entry and entry[1] > now else None
+            decision, state, ttl = policy.evaluate(state, now, limit, window)
+            shard.entries[key] = (state, now + ttl)
+            shard.entries.move_to_end(key)
+            while len(shard.entries) > self.shard_capacity:
+                shard.entries.popitem(last=False)
+                self.evicted += 1
+                RATE_LIMIT_STORE_EVICTIONS.inc()
+        return decision
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the live state for ``key`` without touching its LRU position."""
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+        return entry[0] if entry and entry[1] > time.monotonic() else None
+
+    def sweep(self) -> int:
+        """Drop expired keys from every shard and return how many were removed."""
+        removed = 0
+        for shard in self.shards:
+            now = time.monotonic()
+            with shard.lock:
+                expired = [
+                    key
+                    for key, (_, expires_at) in shard.entries.items()
+                    if expires_at <= now
+                ]
+                for key in expired:
+                    del shard.entries[key]
+            removed += len(expired)
+        self.expired += removed
+        RATE_LIMIT_STORE_EXPIRED.inc(removed)
+        RATE_LIMIT_STORE_SWEEPS.inc()
+        return removed
+
+    def report_size(self) -> None:
+        """Publish the current key count and capacity to the Prometheus gauges."""
+        RATE_LIMIT_STORE_KEYS.set(len(self))
+        RATE_LIMIT_STORE_CAPACITY.set(self.shard_capacity * len(self.shards))
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                self.sweep()
+                self.report_size()
+            except Exception:  # pragma: no cover - keep sweeping
+                logger.exception("Rate limit store sweep failed")
+
+    def ensure_sweeper(self) -> None:
+        if self.sweep_interval <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        if (
+            self._sweeper is None
+            or self._sweeper.done()
+            or self._sweeper.get_loop() is not loop
+        ):
+            self._sweeper = loop.create_task(self._sweep_forever())
+
+    async def stop_sweeper(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            with contextlib.suppress(asyncio.CancelledError, RuntimeError):
+                await self._sweeper
+            self._sweeper = None
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self.shards)
+
+    def approximate_bytes(self) -> int:
+        """Rough retained size of all shards; walks every entry, so call it sparingly."""
+        total = 0
+        for shard in self.shards:
+            with shard.lock:
+                total += sys.getsizeof(shard.entries)
+                for key, entry in shard.entries.items():
+                    total += (
+                        sys.getsizeof(key)
+                        + sys.getsizeof(entry)
+                        + sys.getsizeof(entry[0])
+                    )
+        return total
+
+    def clear(self) -> None:
+        for shard in self.shards:
+            with shard.lock:
+                shard.entries.clear()
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "keys": len(self),
+            "max_keys": self.max_keys,
+            "shards": len(self.shards),
+            "approx_bytes": self.approximate_bytes(),
+            "checks": self.checks,
+            "evicted": self.evicted,
+            "expired": self.expired,
+        }
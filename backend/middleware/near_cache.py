@@ -0,0 +1,244 @@
+"""Per-process tier in front of the Redis rate limiter."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from ..cache import TTLCache
+from ..metrics import RATE_LIMIT_PRECOUNT_EVICTIONS
+from .redis_pool import redis_manager
+
+logger = logging.getLogger(__name__)
+
+
+class DenyCache:
+    """
+    Remember keys Redis has just rejected, until their reset time.
+
+    While a key is blocked, further checks are answered locally, so a client hammering
+    past its limit costs no Redis round trips. Entries are keyed by the limit and window
+    as well as the client, since the same client key is shared by routes with
+    different limits.
+    """
+
+    def __init__(self, *, maxsize: int) -> None:
+        self._blocked: TTLCache[str, float] = TTLCache(maxsize=maxsize, ttl=1.0)
+        self.hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._blocked.maxsize > 0
+
+    def check(self, key: str) -> Optional[int]:
+        """Return seconds until reset if ``key`` is blocked, else ``None``."""
+        until = self._blocked.get(key)
+        if until is None:
+            return None
+        self.hits += 1
+        return max(1, math.ceil(until - time.monotonic()))
+
+    def block(self, key: str, reset_after: float) -> None:
+        if self.enabled and reset_after > 0:
+            self._blocked.set(key, time.monotonic() + reset_after, ttl=reset_after)
+
+    def clear(self) -> None:
+        self._blocked.clear()
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._blocked)
+
+
+# Add a batch of already-admitted hits to a fixed-window counter; returns {count, ttl_ms}.
+SYNC_SCRIPT = """
+local count = redis.call('INCRBY', KEYS[1], tonumber(ARGV[1]))
+local ttl = redis.call('PTTL', KEYS[1])
+if ttl < 0 then
+    redis.call('PEXPIRE', KEYS[1], tonumber(ARGV[2]))
+    ttl = tonumber(ARGV[2])
+end
+return {count, ttl}
+"""
+
+
+@dataclass(slots=True)
+class _Counter:
+    window_ms: int
+    remote: int = 0
+    pending: int = 0
+    reset_at: float = 0.0
+
+
+class LocalPreCounter:
+    """
+    Count hits locally and push the deltas to Redis in batches.
+
+    The first hit on a key synchronises immediately to learn the shared count. After
+    that, hits are admitted against ``remote + pending`` without I/O, and a background
+    task sends every key's pending delta in one pipelined round trip each
+    ``sync_interval``. Counting is fixed-window (settings refuse any other
+    ``RATE_LIMIT_ALGORITHM`` with it), and workers can over-admit by at most what they
+    each admit between two syncs. At most ``max_keys`` keys are tracked; the least
+    recently used is evicted beyond that, and its unsynced hits go out with the next
+    flush.
+    """
+
+    def __init__(
+        self, *, sync_interval: float, max_keys: int, prefix: str = "precount"
+    ) -> None:
+        self.sync_interval = sync_interval
+        self.max_keys = max_keys
+        self.prefix = prefix
+        self._counters: OrderedDict[str, _Counter] = OrderedDict()
+        self._evicted_pending: list[tuple[str, _Counter]] = []
+        self._script: Any = None
+        self._client: Any = None
+        self._flusher: Optional[asyncio.Task[None]] = None
+        self.local_decisions = 0
+        self.syncs = 0
+        self.synced_hits = 0
+        self.evicted = 0
+
+    def _redis_key(self, key: str) -> str:
+        return f"{key}:{self.prefix}"
+
+    def _get_script(self, client: Any) -> Any:
+        if self._script is None or self._client is not client:
+            self._script = client.register_script(SYNC_SCRIPT)
+            self._client = client
+        return self._script
+
+    async def check(
+        self, client: Any, key: str, limit: int, window_seconds: int
+    ) -> tuple[bool, int, int]:
+        self._ensure_flusher()
+        now = time.monotonic()
+        key = f"{key}:{window_seconds}"
+        counter = self._counters.get(key)
+        if counter is None or counter.reset_at <= now:
+            counter = self._counters[key] = _Counter(window_ms=window_seconds * 1000)
+            self._counters.move_to_end(key)
+            self._evict()
+            return await self._first_hit(client, key, counter, limit)
+
+        self._counters.move_to_end(key)
+        reset_after = max(1, math.ceil(counter.reset_at - now))
+        self.local_decisions += 1
+        if counter.remote + counter.pending >= limit:
+            return False, 0, reset_after
+        counter.pending += 1
+        return True, limit - counter.remote - counter.pending, reset_after
+
+    def _evict(self) -> None:
+        while len(self._counters) > self.max_keys:
+            key, counter = self._counters.popitem(last=False)
+            self.evicted += 1
+            RATE_LIMIT_PRECOUNT_EVICTIONS.inc()
+            if counter.pending:
+                self._evicted_pending.append((key, counter))
+
+    async def _first_hit(
+        self, client: Any, key: str, counter: _Counter, limit: int
+    ) -> tuple[bool, int, int]:
+        script = self._get_script(client)
+        count, ttl_ms = await script(
+            keys=[self._redis_key(key)], args=[1, counter.window_ms]
+        )
+        counter.remote = int(count)
+        counter.reset_at = time.monotonic() + int(ttl_ms) / 1000
+        reset_after = max(1, math.ceil(int(ttl_ms) / 1000))
+        # INCRBY has already counted this hit, so it fits if the total is within the limit.
+        if counter.remote > limit:
+            return False, 0, reset_after
+        return True, limit - counter.remote, reset_after
+
+    async def flush(self, client: Optional[Any] = None) -> int:
+        """Send every pending delta to Redis in one pipeline; return how many hits were synced."""
+        client = client or self._client
+        now = time.monotonic()
+        for key in [
+            key for key, counter in self._counters.items() if counter.reset_at <= now
+        ]:
+            # Hits from a finished window no longer matter.
+            del self._counters[key]
+        evicted, self._evicted_pending = self._evicted_pending, []
+        batch = [
+            (key, counter, counter.pending)
+            for key, counter in [*self._counters.items(), *evicted]
+            if counter.pending
+        ]
+        if client is None or not batch:
+            self._evicted_pending[:0] = evicted
+            return 0
+
+        script = self._get_script(client)
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for key, counter, delta in batch:
+                    await script(
+                        keys=[self._redis_key(key)],
+                        args=[delta, counter.window_ms],
+                        client=pipe,
+                    )
+                results = await pipe.execute()
+        except BaseException:
+            self._evicted_pending[:0] = evicted
+            raise
+
+        synced = 0
+        now = time.monotonic()
+        for (key, counter, delta), (count, ttl_ms) in zip(batch, results):
+            counter.pending -= delta
+            counter.remote = int(count)
+            counter.reset_at = now + int(ttl_ms) / 1000
+            synced += delta
+        self.syncs += 1
+        self.synced_hits += synced
+        return synced
+
+    async def _flush_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.flush()
+            except Exception as exc:
+                redis_manager.record_failure(exc)
+                logger.warning("Rate limit pre-count sync failed: %s", exc)
+
+    def _ensure_flusher(self) -> None:
+        loop = asyncio.get_running_loop()
+        if (
+            self._flusher is None
+            or self._flusher.done()
+            or self._flusher.get_loop() is not loop
+        ):
+            self._flusher = loop.create_task(self._flush_forever())
+
+    async def stop(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError, RuntimeError):
+                await self._flusher
+            self._flusher = None
+        with contextlib.suppress(Exception):
+            await self.flush()
+
+    def clear(self) -> None:
+        self._counters.clear()
+        self._evicted_pending.clear()
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "keys": len(self._counters),
+            "pending": sum(counter.pending for counter in self._counters.values()),
+            "local_decisions": self.local_decisions,
+            "syncs": self.syncs,
+            "synced_hits": self.synced_hits,
+            "evicted": self.evicted,
+        }
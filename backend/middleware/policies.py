@@ -0,0 +1,218 @@
+"""Route-level rate-limit policies, enforced before the request reaches FastAPI."""
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..metrics import RATE_LIMIT_DECISIONS
+from ..settings import settings
+from .rate_limit import check_rate_limit, get_client_identifier
+
+logger = logging.getLogger(__name__)
+
+KEY_IP = "ip"
+KEY_EMAIL = "email"
+KEY_USER = "user"
+
+# Larger bodies are passed through untouched and keyed by IP instead of being parsed.
+MAX_PEEK_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitPolicy:
+    """
+    A limit applied to one or more routes.
+
+    Routes sharing a ``scope`` share one counter per client, so the public forms draw
+    from a single allowance. ``key`` picks the client identity: the caller's IP, the
+    ``email`` field of the JSON body, or the ``sub`` claim of the bearer token. The
+    latter two fall back to the IP when the field or token is missing or invalid.
+    """
+
+    scope: str
+    limit: int
+    window_seconds: int
+    key: str = KEY_IP
+
+
+def _route(method: str, path: str) -> tuple[str, str]:
+    return method, f"{settings.api_prefix}{path}"
+
+
+_register = RateLimitPolicy("register", limit=5, window_seconds=900)
+_public_form = RateLimitPolicy(
+    "public_form",
+    limit=settings.public_form_rate_limit,
+    window_seconds=settings.public_form_rate_window_seconds,
+)
+
+ROUTE_POLICIES: dict[tuple[str, str], RateLimitPolicy] = {
+    _route("POST", "/auth/register"): _register,
+    _route("POST", "/auth/register-from-order"): _register,
+    _route("POST", "/auth/login"): RateLimitPolicy(
+        "login", limit=5, window_seconds=900, key=KEY_EMAIL
+    ),
+    _route("POST", "/auth/password/forgot"): RateLimitPolicy(
+        "password_forgot", limit=3, window_seconds=3600, key=KEY_EMAIL
+    ),
+    _route("PATCH", "/account/password"): RateLimitPolicy(
+        "password_change", limit=5, window_seconds=900, key=KEY_USER
+    ),
+    _route("POST", "/waitlist"): _public_form,
+    _route("POST", "/contact"): _public_form,
+    _route("POST", "/investor_interest"): _public_form,
+    _route("POST", "/pilot_request"): _public_form,
+    _route("POST", "/orders"): _public_form,
+    _route("POST", "/client_errors"): RateLimitPolicy(
+        "client_errors",
+        limit=settings.client_error_rate_limit,
+        window_seconds=settings.client_error_rate_window_seconds,
+    ),
+}
+
+
+def _email_from_body(body: bytes) -> Optional[str]:
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return None
+    email = payload.get("email") if isinstance(payload, dict) else None
+    if not isinstance(email, str) or not email.strip():
+        return None
+    return email.strip().lower()
+
+
+def _user_from_token(request: Request) -> Optional[str]:
+    from ..security import (
+        decode_token,
+    )  # imported lazily: security pulls in the ORM layer
+
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        subject = decode_token(token).get("sub")
+    except Exception:
+        return None
+    return subject if isinstance(subject, str) and subject else None
+
+
+class RateLimitMiddleware:
+    """
+    Apply :data:`ROUTE_POLICIES` before routing, body validation and dependencies run.
+
+    Rejected requests get a 429 with ``Retry-After``; admitted ones carry the
+    ``X-RateLimit-*`` headers on their response. For email-keyed routes the body is
+    read here and replayed to the application unchanged.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        policy = ROUTE_POLICIES.get((scope["method"], scope["path"]))
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        identity: Optional[str] = None
+        if policy.key == KEY_EMAIL:
+            body, receive = await _buffer_body(receive)
+            if body is not None:
+                identity = _email_from_body(body)
+            identity = (
+                f"rate_limit:{policy.scope}:email:{identity}" if identity else None
+            )
+        elif policy.key == KEY_USER:
+            subject = _user_from_token(request)
+            identity = f"rate_limit:{policy.scope}:user:{subject}" if subject else None
+        if identity is None:
+            identity = get_client_identifier(request).replace(
+                "rate_limit:", f"rate_limit:{policy.scope}:", 1
+            )
+
+        allowed, remaining, reset_after = await check_rate_limit(
+            identity, policy.limit, policy.window_seconds
+        )
+        RATE_LIMIT_DECISIONS.labels(
+            scope=policy.scope, decision="allow" if allowed else "deny"
+        ).inc()
+        headers = {
+            "X-RateLimit-Limit": str(policy.limit),
+            "X-RateLimit-Remaining": str(remaining if allowed else 0),
+            "X-RateLimit-Reset": str(reset_after),
+        }
+        if not allowed:
+            response = JSONResponse(
+                {"detail": f"Rate limit exceeded. Try again in {reset_after} seconds."},
+                status_code=429,
+                headers={**headers, "Retry-After": str(reset_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        raw_headers = [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in headers.items()
+        ]
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *raw_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+async def _buffer_body(receive: Receive) -> tuple[Optional[bytes], Receive]:
+    """
+    Read the request body and return it with a ``receive`` that replays it.
+
+    Returns ``None`` for the body when it exceeds :data:`MAX_PEEK_BYTES`; whatever was
+    read is still replayed, followed by the rest of the stream.
+    """
+    chunks: list[bytes] = []
+    size = 0
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] != "http.request":
+            # Client went away before sending the body; let the app see the disconnect.
+            return None, _replay(chunks, False, receive, pending=message)
+        chunk = message.get("body", b"")
+        chunks.append(chunk)
+        size += len(chunk)
+        more_body = message.get("more_body", False)
+        if size > MAX_PEEK_BYTES:
+            return None, _replay(chunks, more_body, receive)
+    return b"".join(chunks), _replay(chunks, False, receive)
+
+
+def _replay(
+    chunks: list[bytes],
+    more_body: bool,
+    receive: Receive,
+    pending: Optional[Message] = None,
+) -> Receive:
+    queue: list[Message] = [
+        {"type": "http.request", "body": b"".join(chunks), "more_body": more_body}
+    ]
+    if pending is not None:
+        queue.append(pending)
+
+    async def replay() -> Message:
+        if queue:
+            return queue.pop(0)
+        return await receive()
+
+    return replay
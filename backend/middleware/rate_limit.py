@@ -1,61 +1,56 @@
 """Rate limiting middleware using Redis with in-memory fallback."""
 from __future__ import annotations
 
-import asyncio
 import logging
-import time
-from collections import defaultdict, deque
+import math
 from typing import Optional
 
-from fastapi import HTTPException, Request, status
+from fastapi import Request
 
 from ..settings import settings
+from .algorithms import RateLimitAlgorithm, get_algorithm
+from .memory_store import ShardedRateLimitStore
+from .near_cache import DenyCache, LocalPreCounter
+from .redis_pool import redis_manager
 
 logger = logging.getLogger(__name__)
 
 try:
     import redis.asyncio as aioredis
-
-    REDIS_AVAILABLE = True
+    from redis.commands.core import AsyncScript
 except ImportError:
-    REDIS_AVAILABLE = False
     logger.warning("Redis not available, rate limiting will fall back to in-process storage")
 
-_redis_client: Optional[aioredis.Redis] = None
-_in_memory_lock = asyncio.Lock()
-_in_memory_buckets: dict[str, deque[float]] = defaultdict(deque)
+_scripts: dict[str, AsyncScript] = {}
+in_memory_store = ShardedRateLimitStore(
+    shards=settings.rate_limit_memory_shards,
+    max_keys=settings.rate_limit_memory_max_keys,
+    sweep_interval=settings.rate_limit_memory_sweep_seconds,
+)
+deny_cache = DenyCache(maxsize=settings.rate_limit_deny_cache_size)
+pre_counter = LocalPreCounter(
+    sync_interval=settings.rate_limit_sync_interval_seconds,
+    max_keys=settings.rate_limit_precount_max_keys,
+)
 
 
 async def get_redis_client() -> Optional[aioredis.Redis]:
-    """Get or create Redis client."""
-    global _redis_client
-    
-    if not REDIS_AVAILABLE:
-        return None
-    
-    if _redis_client is None and settings.redis_url:
-        try:
-            _redis_client = aioredis.from_url(
-                settings.redis_url,
-                encoding="utf-8",
-                decode_responses=True,
-            )
-            # Test connection
-            await _redis_client.ping()
-            logger.info("Redis connection established for rate limiting")
-        except Exception as e:
-            logger.warning(f"Failed to connect to Redis: {e}. Rate limiting disabled.")
-            return None
-    
-    return _redis_client
+    """Return the pooled Redis client, or ``None`` if Redis is unconfigured or its circuit is open."""
+    return redis_manager.get_client()
 
 
 async def close_redis_client() -> None:
-    """Close Redis client connection."""
-    global _redis_client
-    if _redis_client:
-        await _redis_client.close()
-        _redis_client = None
+    """Close the Redis pool and stop any recovery probe."""
+    await redis_manager.close()
+    _scripts.clear()
+
+
+def _get_script(client: aioredis.Redis, algorithm: RateLimitAlgorithm) -> AsyncScript:
+    """Register each algorithm's script once; calls use EVALSHA and reload on NOSCRIPT."""
+    script = _scripts.get(algorithm.name)
+    if script is None or script.registered_client is not client:
+        script = _scripts[algorithm.name] = client.register_script(algorithm.script)
+    return script
 
 
 def get_client_identifier(request: Request, email: Optional[str] = None) -> str:
@@ -79,107 +74,66 @@ async def check_rate_limit(
     key: str,
     max_requests: int,
     window_seconds: int,
+    algorithm: Optional[str] = None,
 ) -> tuple[bool, int, int]:
     """
     Check if request is within rate limit.
-    
+
+    ``algorithm`` defaults to ``RATE_LIMIT_ALGORITHM``.
+
     Returns:
         (is_allowed, remaining_requests, reset_after_seconds)
     """
+    policy = get_algorithm(algorithm or settings.rate_limit_algorithm)
     redis_client = await get_redis_client()
-    
+
     if not redis_client:
-        return await _check_in_memory_rate_limit(key, max_requests, window_seconds)
-    
+        return _check_in_memory_rate_limit(policy, key, max_requests, window_seconds)
+
+    blocked_key = f"{key}:{policy.name}:{max_requests}:{window_seconds}"
+    blocked_for = deny_cache.check(blocked_key)
+    if blocked_for is not None:
+        return False, 0, blocked_for
+
     try:
-        # Use fixed window algorithm
-        current_time = await redis_client.time()
-        current_timestamp = current_time[0] + current_time[1] / 1_000_000
-        
-        # Create window key (resets every window_seconds)
-        window_number = int(current_timestamp / window_seconds)
-        window_key = f"{key}:{window_number}"
-        
-        # Get current count
-        count = await redis_client.get(window_key)
-        count = int(count) if count else 0
-        
-        if count >= max_requests:
-            # Calculate when window resets
-            next_window_start = (window_number + 1) * window_seconds
-            reset_after = int(next_window_start - current_timestamp)
-            return False, 0, reset_after
-        
-        # Increment counter
-        await redis_client.incr(window_key)
-        await redis_client.expire(window_key, window_seconds)
-        
-        remaining = max_requests - count - 1
-        return True, remaining, window_seconds
-    
+        if settings.rate_limit_local_precount:
+            allowed, remaining, reset_after = await pre_counter.check(
+                redis_client, key, max_requests, window_seconds
+            )
+        else:
+            script = _get_script(redis_client, policy)
+            is_allowed, remaining, reset_ms = await script(
+                keys=[f"{key}:{policy.name}"],
+                args=[max_requests, window_seconds * 1000],
+            )
+            allowed, remaining = bool(int(is_allowed)), max(0, int(remaining))
+            reset_after = max(1, math.ceil(int(reset_ms) / 1000))
+        redis_manager.record_success()
+        if not allowed:
+            deny_cache.block(blocked_key, reset_after)
+        return allowed, remaining, reset_after
+
     except Exception as e:
         logger.error(f"Rate limit check failed: {e}")
-        # On error, allow the request (fail open)
-        return True, max_requests, window_seconds
+        redis_manager.record_failure(e)
+        return _check_in_memory_rate_limit(policy, key, max_requests, window_seconds)
 
 
-async def _check_in_memory_rate_limit(
+def _check_in_memory_rate_limit(
+    policy: RateLimitAlgorithm,
     key: str,
     max_requests: int,
     window_seconds: int,
 ) -> tuple[bool, int, int]:
-    """Simple sliding-window counter for environments without Redis."""
-    now = time.monotonic()
-    async with _in_memory_lock:
-        bucket = _in_memory_buckets[key]
-
-        # Drop timestamps older than the window
-        while bucket and now - bucket[0] >= window_seconds:
-            bucket.popleft()
-
-        if len(bucket) >= max_requests:
-            oldest = bucket[0]
-            reset_after = max(1, int(window_seconds - (now - oldest)))
-            return False, 0, reset_after
-
-        bucket.append(now)
-        remaining = max_requests - len(bucket)
-        return True, remaining, window_seconds
+    """Apply ``policy`` to per-process state for environments without Redis."""
+    in_memory_store.ensure_sweeper()
+    decision = in_memory_store.apply(key, policy, max_requests, window_seconds)
+    return decision.allowed, max(0, decision.remaining), max(1, math.ceil(decision.reset_after))
 
 
 def reset_in_memory_counters() -> None:
     """Clear in-memory buckets (useful for tests)."""
-    _in_memory_buckets.clear()
-
-
-async def rate_limit_middleware(
-    request: Request,
-    max_requests: int,
-    window_seconds: int,
-    identifier: Optional[str] = None,
-    email: Optional[str] = None,
-) -> None:
-    """
-    Rate limiting middleware.
-    
-    Raises HTTPException if rate limit exceeded.
-    """
-    if identifier is None:
-        identifier = get_client_identifier(request, email=email)
-    
-    is_allowed, remaining, reset_after = await check_rate_limit(
-        identifier, max_requests, window_seconds
-    )
-    
-    if not is_allowed:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=f"Rate limit exceeded. Try again in {reset_after} seconds.",
-            headers={
-                "X-RateLimit-Limit": str(max_requests),
-                "X-RateLimit-Remaining": "0",
-                "X-RateLimit-Reset": str(reset_after),
-                "Retry-After": str(reset_after),
-            },
-        )
+    in_memory_store.clear()
+    deny_cache.clear()
+    pre_counter.clear()
 
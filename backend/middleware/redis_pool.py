@@ -0,0 +1,230 @@
+"""Pooled Redis client guarded by a circuit breaker."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import Counter
+from typing import Any, Optional
+
+from ..metrics import REDIS_CIRCUIT_STATE, REDIS_CIRCUIT_TRANSITIONS
+from ..settings import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as aioredis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+# Values of the ``redis_circuit_state`` gauge.
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """
+    Track consecutive failures of a dependency.
+
+    ``failure_threshold`` consecutive failures open the circuit; while open, callers
+    skip the dependency entirely. A single probe (half-open) either closes it again or
+    leaves it open. Every transition is counted, and the current state published, in
+    the Prometheus metrics.
+    """
+
+    def __init__(self, *, failure_threshold: int) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.transitions: Counter[str] = Counter()
+
+    @property
+    def is_open(self) -> bool:
+        return self.state != CLOSED
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        logger.warning("Redis circuit %s -> %s", self.state, state)
+        self.transitions[f"{self.state}->{state}"] += 1
+        REDIS_CIRCUIT_TRANSITIONS.labels(self.state, state).inc()
+        REDIS_CIRCUIT_STATE.set(_STATE_VALUES[state])
+        self.state = state
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+        elif state == CLOSED:
+            self.opened_at = None
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self._transition(OPEN)
+
+    def half_open(self) -> None:
+        self._transition(HALF_OPEN)
+
+    def reset(self) -> None:
+        REDIS_CIRCUIT_STATE.set(_STATE_VALUES[CLOSED])
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.transitions.clear()
+
+
+class RedisManager:
+    """
+    Own the process-wide Redis connection pool.
+
+    :meth:`get_client` hands out a client backed by a bounded pool with short socket
+    timeouts, or ``None`` while the circuit is open so callers fall back to local state
+    without waiting on a dead server. Callers report the outcome of their commands; once
+    the circuit opens, a background task pings every ``probe_interval`` seconds and
+    closes it when Redis answers again.
+
+    Pub/sub subscribers sit idle between messages, so they use :meth:`subscriber_client`,
+    a separate connection without the socket timeout.
+    """
+
+    def __init__(
+        self,
+        *,
+        url: Optional[str],
+        max_connections: int = 50,
+        socket_timeout: float = 0.5,
+        connect_timeout: float = 0.5,
+        failure_threshold: int = 3,
+        probe_interval: float = 5.0,
+    ) -> None:
+        self.url = url
+        self.max_connections = max_connections
+        self.socket_timeout = socket_timeout
+        self.connect_timeout = connect_timeout
+        self.probe_interval = probe_interval
+        self.breaker = CircuitBreaker(failure_threshold=failure_threshold)
+        self._client: Optional[Any] = None
+        self._subscriber: Optional[Any] = None
+        self._probe: Optional[asyncio.Task[None]] = None
+
+    @classmethod
+    def from_settings(cls) -> RedisManager:
+        return cls(
+            url=settings.redis_url,
+            max_connections=settings.redis_max_connections,
+            socket_timeout=settings.redis_socket_timeout_seconds,
+            connect_timeout=settings.redis_connect_timeout_seconds,
+            failure_threshold=settings.redis_breaker_failure_threshold,
+            probe_interval=settings.redis_breaker_probe_interval_seconds,
+        )
+
+    def _build(self) -> Any:
+        pool = aioredis.ConnectionPool.from_url(
+            self.url,
+            max_connections=self.max_connections,
+            socket_timeout=self.socket_timeout,
+            socket_connect_timeout=self.connect_timeout,
+            encoding="utf-8",
+            decode_responses=True,
+        )
+        return aioredis.Redis(connection_pool=pool)
+
+    def subscriber_client(self) -> Optional[Any]:
+        """A client for long-lived subscriptions: blocking reads never time out."""
+        if not (REDIS_AVAILABLE and self.url):
+            return None
+        if self._subscriber is None:
+            self._subscriber = aioredis.Redis.from_url(
+                self.url,
+                socket_timeout=None,
+                socket_connect_timeout=self.connect_timeout,
+                socket_keepalive=True,
+                encoding="utf-8",
+                decode_responses=True,
+            )
+        return self._subscriber
+
+    def get_client(self) -> Optional[Any]:
+        if self._client is None:
+            if not (REDIS_AVAILABLE and self.url):
+                return None
+            self._client = self._build()
+        if self.breaker.is_open:
+            self._ensure_probe()
+            return None
+        return self._client
+
+    def record_success(self) -> None:
+        if self.breaker.failures or self.breaker.is_open:
+            self.breaker.record_success()
+
+    def record_failure(self, exc: BaseException) -> None:
+        was_open = self.breaker.is_open
+        self.breaker.record_failure()
+        if self.breaker.is_open and not was_open:
+            logger.warning("Redis unavailable, using in-process fallbacks: %s", exc)
+            self._ensure_probe()
+
+    def _ensure_probe(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if (
+            self._probe is None
+            or self._probe.done()
+            or self._probe.get_loop() is not loop
+        ):
+            self._probe = loop.create_task(self._probe_until_closed())
+
+    async def _probe_until_closed(self) -> None:
+        while self.breaker.is_open:
+            await asyncio.sleep(self.probe_interval)
+            if self._client is None:
+                return
+            self.breaker.half_open()
+            try:
+                await self._client.ping()
+            except Exception as exc:
+                self.breaker.record_failure()
+                logger.debug("Redis probe failed: %s", exc)
+            else:
+                self.breaker.record_success()
+                logger.info("Redis reachable again; circuit closed")
+
+    def metrics(self) -> dict[str, Any]:
+        pool = getattr(self._client, "connection_pool", None)
+        return {
+            "state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "transitions": dict(self.breaker.transitions),
+            "pool_max": self.max_connections,
+            "pool_in_use": len(getattr(pool, "_in_use_connections", ())),
+            "pool_idle": len(getattr(pool, "_available_connections", ())),
+        }
+
+    async def close(self) -> None:
+        if self._probe is not None:
+            self._probe.cancel()
+            with contextlib.suppress(asyncio.CancelledError, RuntimeError):
+                await self._probe
+            self._probe = None
+        for client in (self._client, self._subscriber):
+            if client is not None:
+                with contextlib.suppress(Exception):
+                    await client.aclose()
+        self._client = None
+        self._subscriber = None
+        self.breaker.reset()
+
+
+# The process-wide manager shared by rate limiting, caches and replica pinning.
+redis_manager = RedisManager.from_settings()
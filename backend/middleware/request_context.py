@@ -0,0 +1,90 @@
+"""Request id, timing and access logging as a single ASGI layer."""
+from __future__ import annotations
+
+import logging
+import time
+import uuid
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT
+from ..query_stats import QueryStats, current_query_stats
+
+logger = logging.getLogger("orbsurv.api")
+
+
+class RequestContextMiddleware:
+    """
+    Tag each HTTP request with an id, time it, log its start and end and record it
+    in the request metrics.
+
+    Database statements run while serving the request are counted through
+    :data:`~backend.query_stats.current_query_stats` and reported in a
+    ``Server-Timing`` header (``db`` and total ``app`` time up to the response
+    headers) and in the ``request.end`` log fields.
+
+    The id is stored in ``scope["state"]`` so handlers read it as
+    ``request.state.request_id``, and is returned in ``X-Request-ID``. Unlike
+    ``@app.middleware("http")`` this wraps ``send`` directly, so responses stream
+    through without an extra task or memory stream per request.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+        path = scope["path"]
+        method = scope["method"]
+        started = time.perf_counter()
+        status_code = 500
+        stats = QueryStats(request_id=request_id)
+        stats_token = current_query_stats.set(stats)
+        logger.info(
+            "request.start",
+            extra={"path": path, "method": method, "request_id": request_id},
+        )
+
+        async def send_with_context(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                app_ms = (time.perf_counter() - started) * 1000
+                server_timing = f'db;dur={stats.duration_ms:.2f};desc="{stats.count} queries", app;dur={app_ms:.2f}'
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"x-request-id", request_id.encode("latin-1")),
+                    (b"server-timing", server_timing.encode("latin-1")),
+                ]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_context)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_query_stats.reset(stats_token)
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            # The route template keeps label cardinality bounded; unmatched paths share one series.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_DURATION.labels(
+                method=method, route=route, status=str(status_code)
+            ).observe(elapsed)
+            logger.info(
+                "request.end",
+                extra={
+                    "status_code": status_code,
+                    "path": path,
+                    "method": method,
+                    "request_id": request_id,
+                    "duration_ms": round(elapsed * 1000, 2),
+                    "db_queries": stats.count,
+                    "db_ms": stats.duration_ms,
+                    "db_slow_queries": stats.slow,
+                },
+            )
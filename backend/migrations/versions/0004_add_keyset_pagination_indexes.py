@@ -0,0 +1,41 @@
+"""Add (created_at, id) indexes for keyset pagination
+
+Revision ID: 0004_add_keyset_pagination_indexes
+Revises: 0003_add_orders_table
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0004_add_keyset_pagination_indexes"
+down_revision = "0003_add_orders_table"
+branch_labels = None
+depends_on = None
+
+# Admin list endpoints order by (created_at DESC, id DESC) and seek with a row-value
+# comparison; the composite index supersedes the single-column created_at index.
+PAGINATED_TABLES = (
+    "user",
+    "contact",
+    "waitlist",
+    "investorinterest",
+    "pilotrequest",
+    "auditlog",
+)
+
+
+def upgrade() -> None:
+    for table in PAGINATED_TABLES:
+        op.create_index(
+            f"ix_{table}_created_at_id", table, ["created_at", "id"], unique=False
+        )
+        op.drop_index(f"ix_{table}_created_at", table_name=table)
+
+
+def downgrade() -> None:
+    for table in PAGINATED_TABLES:
+        op.create_index(f"ix_{table}_created_at", table, ["created_at"], unique=False)
+        op.drop_index(f"ix_{table}_created_at_id", table_name=table)
@@ -0,0 +1,57 @@
+"""Add email outbox table for asynchronous delivery
+
+Revision ID: 0005_add_email_outbox
+Revises: 0004_add_keyset_pagination_indexes
+Create Date: 2026-10-17 12:30:00.000000
+
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0005_add_email_outbox"
+down_revision = "0004_add_keyset_pagination_indexes"
+branch_labels = None
+depends_on = None
+
+email_status_enum = sa.Enum("pending", "sent", "dead", name="email_status")
+
+
+def upgrade() -> None:
+    email_status_enum.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        "emailoutbox",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("template", sa.String(length=255), nullable=False),
+        sa.Column("to", sa.String(length=255), nullable=False),
+        sa.Column("subject", sa.String(length=255), nullable=False),
+        sa.Column("context", sa.JSON(), nullable=False, server_default=sa.text("'{}'")),
+        sa.Column(
+            "status", email_status_enum, nullable=False, server_default="pending"
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    # The worker polls for due pending rows.
+    op.create_index(
+        "ix_emailoutbox_status_next_attempt_at",
+        "emailoutbox",
+        ["status", "next_attempt_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_emailoutbox_status_next_attempt_at", table_name="emailoutbox")
+    op.drop_table("emailoutbox")
+    email_status_enum.drop(op.get_bind(), checkfirst=True)
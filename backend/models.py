@@ -4,7 +4,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from sqlalchemy import DateTime, Enum as PgEnum, ForeignKey, String, Text, JSON, Numeric, func
+from sqlalchemy import DateTime, Enum as PgEnum, ForeignKey, Index, String, Text, JSON, Numeric, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .database import Base
@@ -21,6 +21,12 @@ class OrderStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+class EmailStatus(str, Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    DEAD = "dead"
+
+
 class TimestampMixin:
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -113,3 +119,23 @@ class Order(Base, TimestampMixin):
     user_id: Mapped[Optional[int]] = mapped_column(ForeignKey("user.id", ondelete="SET NULL"), nullable=True, index=True)
 
     user: Mapped[Optional[User]] = relationship(back_populates="orders")
+
+
+class EmailOutbox(Base):
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    template: Mapped[str] = mapped_column(String(255))
+    to: Mapped[str] = mapped_column(String(255))
+    subject: Mapped[str] = mapped_column(String(255))
+    context: Mapped[dict] = mapped_column(JSON, default=dict)
+    status: Mapped[EmailStatus] = mapped_column(
+        PgEnum(EmailStatus, name="email_status"), default=EmailStatus.PENDING
+    )
+    attempts: Mapped[int] = mapped_column(default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text(), nullable=True)
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (Index("ix_emailoutbox_status_next_attempt_at", "status", "next_attempt_at"),)
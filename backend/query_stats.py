@@ -0,0 +1,109 @@
+"""Per-request accounting of SQL statements, plus a slow-query log."""
+from __future__ import annotations
+
+import logging
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .settings import settings
+
+logger = logging.getLogger("orbsurv.db")
+
+MAX_LOGGED_STATEMENT = 500
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """Statements run and time spent in the database on behalf of one request."""
+
+    request_id: str = "n/a"
+    count: int = 0
+    duration: float = 0.0
+    slow: int = 0
+
+    @property
+    def duration_ms(self) -> float:
+        return round(self.duration * 1000, 2)
+
+
+# Set by RequestContextMiddleware. SQLAlchemy runs cursor calls in a greenlet that shares
+# the calling task's context, so the hooks below see the request's stats object.
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def _statement_shape(statement: str) -> str:
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    return (
+        shape
+        if len(shape) <= MAX_LOGGED_STATEMENT
+        else shape[:MAX_LOGGED_STATEMENT] + "..."
+    )
+
+
+def _param_count(parameters: Any, executemany: bool) -> int:
+    if not parameters:
+        return 0
+    if executemany:
+        return sum(len(row) for row in parameters)
+    return len(parameters)
+
+
+def instrument_queries(engine: AsyncEngine) -> None:
+    """Time every cursor execution on ``engine`` and charge it to the current request."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.duration += elapsed
+        threshold = settings.db_slow_query_ms
+        if threshold and elapsed * 1000 >= threshold:
+            if stats is not None:
+                stats.slow += 1
+            # Parameter values can hold personal data; only their number is logged.
+            logger.warning(
+                "db.slow_query",
+                extra={
+                    "request_id": stats.request_id if stats else "n/a",
+                    "duration_ms": round(elapsed * 1000, 2),
+                    "statement": _statement_shape(statement),
+                    "param_count": _param_count(parameters, executemany),
+                    "executemany": executemany,
+                },
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(exception_context: Any) -> None:
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
@@ -0,0 +1,246 @@
+"""Route read-only queries to an optional streaming replica."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import Counter
+from collections.abc import AsyncGenerator
+from typing import Any, Optional
+
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+
+from . import database
+from .cache import TTLCache
+from .middleware.redis_pool import redis_manager
+from .security import decode_token
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Zero on a primary, or on a replica that has replayed everything it has received (an idle
+# primary would otherwise make the replay timestamp look old).
+LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+def _pin_key(request: Request) -> Optional[str]:
+    """The bearer token's subject, so pins follow the user across tokens and workers."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        subject = decode_token(token).get("sub")
+    except Exception:
+        return None
+    return f"rw_pin:{subject}" if subject else None
+
+
+class ReplicaRouter:
+    """
+    Choose between the replica and the primary for each read.
+
+    Reads go to the primary when no replica is configured, when the last lag check
+    (refreshed at most every ``lag_check_interval`` seconds and abandoned after
+    ``lag_timeout``) found the replica more than ``max_lag`` seconds behind or
+    unreachable, while a due check is still running, or when the caller committed a
+    write within the last ``pin_seconds``. Pins are kept locally and, when Redis is
+    available, shared with the other workers.
+    """
+
+    def __init__(
+        self,
+        *,
+        url: Optional[str],
+        max_lag: float = 5.0,
+        lag_check_interval: float = 2.0,
+        lag_timeout: float = 0.5,
+        pin_seconds: float = 10.0,
+        pin_cache_size: int = 10_000,
+    ) -> None:
+        self.max_lag = max_lag
+        self.lag_check_interval = lag_check_interval
+        self.lag_timeout = lag_timeout
+        self.pin_seconds = pin_seconds
+        self.engine: Optional[AsyncEngine] = None
+        self.session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+        if url:
+            self.engine = create_async_engine(url, **database.engine_options(url))
+            database.ping_after_idle(self.engine, settings.db_ping_idle_seconds)
+            self.session_factory = async_sessionmaker(
+                bind=self.engine, expire_on_commit=False
+            )
+        self.lag: Optional[float] = None
+        self._lag_checked_at = float("-inf")
+        self._lag_lock = asyncio.Lock()
+        self._pins: TTLCache[str, bool] = TTLCache(
+            maxsize=pin_cache_size, ttl=pin_seconds
+        )
+        self._pending: set[asyncio.Task[Any]] = set()
+        self.routed: Counter[str] = Counter()
+
+    @classmethod
+    def from_settings(cls) -> ReplicaRouter:
+        return cls(
+            url=settings.database_replica_url,
+            max_lag=settings.db_replica_max_lag_seconds,
+            lag_check_interval=settings.db_replica_lag_check_seconds,
+            lag_timeout=settings.db_replica_lag_timeout_seconds,
+            pin_seconds=settings.db_read_your_writes_seconds,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.session_factory is not None
+
+    async def measure_lag(self) -> Optional[float]:
+        """Seconds the replica is behind, or ``None`` if it cannot be asked."""
+        assert self.engine is not None
+
+        async def _query() -> float:
+            async with self.engine.connect() as conn:
+                return float((await conn.execute(LAG_QUERY)).scalar() or 0.0)
+
+        try:
+            # A blackholed replica would otherwise hold this for the driver's connect timeout.
+            return await asyncio.wait_for(_query(), self.lag_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Replica lag check timed out after %.1fs, reading from the primary",
+                self.lag_timeout,
+            )
+            return None
+        except Exception as exc:
+            logger.warning(
+                "Replica lag check failed, reading from the primary: %s", exc
+            )
+            return None
+
+    async def replica_healthy(self) -> bool:
+        if time.monotonic() - self._lag_checked_at >= self.lag_check_interval:
+            if self._lag_lock.locked():
+                # The due check is still running; read from the primary rather than wait on it.
+                return False
+            async with self._lag_lock:
+                # Another request may have refreshed it while this one waited.
+                if time.monotonic() - self._lag_checked_at >= self.lag_check_interval:
+                    self.lag = await self.measure_lag()
+                    self._lag_checked_at = time.monotonic()
+        return self.lag is not None and self.lag <= self.max_lag
+
+    def pin(self, key: str) -> None:
+        """Send ``key``'s reads to the primary for the next ``pin_seconds``."""
+        self._pins.set(key, True)
+        client = redis_manager.get_client()
+        if client is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(client.set(key, "1", px=int(self.pin_seconds * 1000)))
+        self._pending.add(task)
+        task.add_done_callback(self._pin_published)
+
+    def _pin_published(self, task: asyncio.Task[Any]) -> None:
+        self._pending.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            redis_manager.record_failure(task.exception())
+
+    async def is_pinned(self, key: str) -> bool:
+        if self._pins.get(key):
+            return True
+        client = redis_manager.get_client()
+        if client is None:
+            return False
+        try:
+            pinned = bool(await client.exists(key))
+        except Exception as exc:
+            redis_manager.record_failure(exc)
+            return False
+        if pinned:
+            self._pins.set(key, True)
+        return pinned
+
+    async def factory_for(
+        self, request: Optional[Request] = None
+    ) -> async_sessionmaker[AsyncSession]:
+        if not self.enabled:
+            return database.async_session_factory
+        if request is not None:
+            key = _pin_key(request)
+            if key and await self.is_pinned(key):
+                self.routed["primary_pinned"] += 1
+                return database.async_session_factory
+        if not await self.replica_healthy():
+            self.routed["primary_lagging"] += 1
+            return database.async_session_factory
+        self.routed["replica"] += 1
+        assert self.session_factory is not None
+        return self.session_factory
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "lag_seconds": self.lag,
+            "pins": len(self._pins),
+            "routed": dict(self.routed),
+        }
+
+    def clear(self) -> None:
+        self._pins.clear()
+        self.lag = None
+        self._lag_checked_at = float("-inf")
+
+    async def close(self) -> None:
+        for task in list(self._pending):
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+        if self.engine is not None:
+            await self.engine.dispose()
+
+
+replica_router = ReplicaRouter.from_settings()
+
+
+@event.listens_for(Session, "after_commit")
+def _pin_after_commit(session: Session) -> None:
+    # get_session stores the request; only primary sessions opened for a request carry one.
+    request = session.info.get("request")
+    if request is None or not replica_router.enabled:
+        return
+    key = _pin_key(request)
+    if key:
+        replica_router.pin(key)
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Like :func:`~backend.database.get_session`, but served by the replica when it is safe to."""
+    factory = await replica_router.factory_for(request)
+    async with factory() as session:
+        yield session
+
+
+@contextlib.asynccontextmanager
+async def read_session() -> AsyncGenerator[AsyncSession, None]:
+    """A read session outside a request (no read-your-writes pinning)."""
+    factory = await replica_router.factory_for()
+    async with factory() as session:
+        yield session
@@ -192,11 +192,27 @@ class PaginationMeta(BaseModel):
     limit: int
     total: int
     total_pages: int
+    total_exact: bool = True
+    next_cursor: Optional[str] = None
 
     @classmethod
-    def create(cls, page: int, limit: int, total: int) -> PaginationMeta:
+    def create(
+        cls,
+        page: int,
+        limit: int,
+        total: int,
+        next_cursor: Optional[str] = None,
+        total_exact: bool = True,
+    ) -> PaginationMeta:
         total_pages = (total + limit - 1) // limit if limit > 0 else 0
-        return cls(page=page, limit=limit, total=total, total_pages=total_pages)
+        return cls(
+            page=page,
+            limit=limit,
+            total=total,
+            total_pages=total_pages,
+            total_exact=total_exact,
+            next_cursor=next_cursor,
+        )
 
 
 class AdminLogResponse(BaseModel):
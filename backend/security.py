@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import hashlib
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
@@ -10,14 +13,26 @@ from passlib.context import CryptContext
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from .cache import TTLCache
+from . import database
 from .database import get_session
 from .models import AuditLog, User, UserRole
+from .services.audit_writer import audit_writer
+from .services.token_versions import token_versions
+from .services.user_cache import user_cache
 from .settings import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.api_prefix}/auth/login")
 
+# Verified access-token claims keyed by a digest of the raw token, each kept until the
+# token's ``exp``. Revocation is unaffected: callers still compare ``token_version`` with
+# the user. Refresh and reset tokens are rare and always verified in full.
+token_cache: TTLCache[bytes, dict[str, Any]] = TTLCache(maxsize=settings.token_cache_max_size, ttl=0)
+# Signing key and algorithm the cached claims were verified with; rotating either drops them.
+_token_cache_signer: tuple[str, str] | None = None
+
 
 def normalize_email(email: str) -> str:
     return email.strip().lower()
@@ -65,14 +80,26 @@ def create_password_reset_token(user: User) -> str:
 
 
 def decode_token(token: str) -> dict[str, Any]:
+    global _token_cache_signer
+    signer = (settings.jwt_secret_key, settings.jwt_algorithm)
+    if signer != _token_cache_signer:
+        token_cache.clear()
+        _token_cache_signer = signer
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    cached = token_cache.get(key)
+    if cached is not None:
+        return dict(cached)
     try:
         payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        return payload
     except JWTError as exc:  # pragma: no cover
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         ) from exc
+    expires_at = payload.get("exp")
+    if payload.get("type") == "access" and isinstance(expires_at, (int, float)):
+        token_cache.set(key, dict(payload), ttl=expires_at - time.time())
+    return payload
 
 
 async def get_current_user(
@@ -86,15 +113,23 @@ async def get_current_user(
     if not email:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
 
+    token_version = payload.get("token_version")
+    if token_version is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
+
+    cached = user_cache.get(session, email, token_version)
+    if cached is not None:
+        return cached
+
     result = await session.execute(select(User).where(User.email == email))
     user: Optional[User] = result.scalars().first()
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
-    token_version = payload.get("token_version")
-    if token_version is None or token_version != user.token_version:
+    if token_version != user.token_version:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
 
+    user_cache.put(email, user)
     return user
 
 
@@ -107,6 +142,60 @@ def require_role(*roles: UserRole):
     return _role_checker
 
 
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """The caller as described by a verified access token."""
+
+    subject: str
+    role: UserRole
+    token_version: int
+
+
+async def _load_token_version(email: str) -> Optional[int]:
+    async with database.async_session_factory() as session:
+        result = await session.execute(select(User.token_version).where(User.email == email))
+        return result.scalar_one_or_none()
+
+
+async def get_principal(token: str = Depends(oauth2_scheme)) -> Principal:
+    """
+    Like :func:`get_current_user`, but trusts the signed ``role`` claim instead of loading
+    the user. The token is still rejected once its ``token_version`` is superseded;
+    :func:`~backend.crud.users.update_role` bumps the version, so a stale role cannot outlive it.
+    """
+    payload = decode_token(token)
+    if payload.get("type") != "access":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type")
+    email = payload.get("sub")
+    if not email:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
+    token_version = payload.get("token_version")
+    if token_version is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
+    try:
+        role = UserRole(payload.get("role"))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload") from None
+
+    current = await token_versions.current(email, lambda: _load_token_version(email))
+    if current is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    if token_version != current:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
+    return Principal(subject=email, role=role, token_version=token_version)
+
+
+def require_principal(*roles: UserRole):
+    """:func:`require_role` for endpoints that never need the ``User`` row."""
+
+    async def _role_checker(principal: Principal = Depends(get_principal)) -> Principal:
+        if principal.role not in roles:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
+        return principal
+
+    return _role_checker
+
+
 async def record_audit_log(
     session: AsyncSession,
     *,
@@ -114,14 +203,27 @@ async def record_audit_log(
     action: str,
     request: Optional[Request] = None,
     metadata: Optional[str] = None,
+    required: bool = False,
 ) -> None:
-    log = AuditLog(
-        actor_id=actor.id if actor else None,
-        actor_role=actor.role if actor else None,
-        action=action,
-        path=request.url.path if request else None,
-        ip=request.client.host if request and request.client else None,
-        metadata=metadata,
-    )
-    session.add(log)
+    """
+    Record an audit entry for ``action``.
+
+    When the buffered writer is enabled the row is inserted in a background batch after
+    ``session`` commits. ``required`` actions, or any call made while the buffer is full,
+    are written inside the caller's transaction instead.
+    """
+    values: dict[str, Any] = {
+        "actor_id": actor.id if actor else None,
+        "actor_role": actor.role if actor else None,
+        "action": action,
+        "path": request.url.path if request else None,
+        "ip": request.client.host if request and request.client else None,
+        "metadata_json": metadata,
+    }
+    if audit_writer.enabled and not required and audit_writer.has_capacity():
+        values["created_at"] = datetime.now(timezone.utc)
+        audit_writer.defer(session, values)
+        return
+
+    session.add(AuditLog(**values))
     await session.flush()
@@ -0,0 +1,174 @@
+"""Buffered audit-log pipeline that bulk-inserts rows off the request path."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from typing import Any, Optional
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .. import database
+from ..models import AuditLog
+from ..settings import settings
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "audit_writer_pending"
+
+
+class AuditLogWriter:
+    """
+    Collect audit rows in an asyncio queue and insert them in batches.
+
+    Rows are deferred on the caller's session and only enqueued once that session
+    commits, so rolled-back requests never produce audit entries. A background task
+    drains the queue whenever ``max_batch`` rows are waiting or ``flush_interval``
+    seconds have passed. When the queue is full, :meth:`has_capacity` turns false and
+    callers write synchronously instead, which pushes the cost back onto the request.
+    """
+
+    def __init__(
+        self, *, enabled: bool, max_batch: int, flush_interval: float, max_queue: int
+    ) -> None:
+        self.enabled = enabled
+        self.max_batch = max(1, max_batch)
+        self.flush_interval = flush_interval
+        self.max_queue = max(1, max_queue)
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(
+            maxsize=self.max_queue
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker: Optional[asyncio.Task[None]] = None
+        self._batch: list[dict[str, Any]] = []
+        self._writes: set[asyncio.Task[None]] = set()
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+
+    def has_capacity(self) -> bool:
+        return not self._queue.full()
+
+    def defer(self, session: AsyncSession, values: dict[str, Any]) -> None:
+        session.info.setdefault(_PENDING_KEY, []).append(values)
+
+    def submit(self, rows: list[dict[str, Any]]) -> None:
+        self._bind_loop()
+        overflow: list[dict[str, Any]] = []
+        for row in rows:
+            try:
+                self._queue.put_nowait(row)
+                self.enqueued += 1
+            except asyncio.QueueFull:
+                overflow.append(row)
+        self._ensure_worker()
+        if overflow:
+            # Already committed elsewhere; write the spill-over directly rather than drop it.
+            self._spawn_write(overflow)
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # A new event loop (e.g. a fresh test loop): move queued rows to a queue bound to it.
+        carried: list[dict[str, Any]] = []
+        while not self._queue.empty():
+            carried.append(self._queue.get_nowait())
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        for row in carried:
+            self._queue.put_nowait(row)
+        self._loop = loop
+        self._worker = None
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    def _spawn_write(self, rows: list[dict[str, Any]]) -> asyncio.Task[None]:
+        task = asyncio.get_running_loop().create_task(self._write(rows))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+        return task
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # Rows collected so far live on self._batch so stop() can still flush them.
+            self._batch.append(await self._queue.get())
+            deadline = loop.time() + self.flush_interval
+            while len(self._batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    self._batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                    )
+                except asyncio.TimeoutError:
+                    break
+            batch, self._batch = self._batch, []
+            await asyncio.shield(self._spawn_write(batch))
+
+    async def _write(self, rows: list[dict[str, Any]]) -> None:
+        try:
+            async with database.async_session_factory() as session:
+                await session.execute(insert(AuditLog), rows)
+                await session.commit()
+            self.written += len(rows)
+            self.batches += 1
+        except Exception:
+            self.failed += len(rows)
+            logger.exception("Failed to write %d buffered audit log rows", len(rows))
+
+    async def drain(self) -> None:
+        """Write everything still buffered and wait for in-flight batches."""
+        rows, self._batch = self._batch, []
+        while not self._queue.empty():
+            rows.append(self._queue.get_nowait())
+            if len(rows) >= self.max_batch:
+                await self._write(rows)
+                rows = []
+        if rows:
+            await self._write(rows)
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._worker
+            self._worker = None
+        await self.drain()
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "queued": self._queue.qsize(),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "batches": self.batches,
+            "failed": self.failed,
+        }
+
+
+audit_writer = AuditLogWriter(
+    enabled=settings.audit_buffer_enabled,
+    max_batch=settings.audit_buffer_max_batch,
+    flush_interval=settings.audit_buffer_flush_interval_seconds,
+    max_queue=settings.audit_buffer_max_queue,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_after_commit(session: Session) -> None:
+    rows: Optional[list[dict[str, Any]]] = session.info.pop(_PENDING_KEY, None)
+    if rows:
+        audit_writer.submit(rows)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
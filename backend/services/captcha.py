@@ -1,17 +1,103 @@
 from __future__ import annotations
 
+import hashlib
 import logging
-from typing import Any
+import time
+from typing import Any, Optional
 
 import httpx
 from fastapi import HTTPException, Request, status
 
+from ..cache import TTLCache
+from ..metrics import CAPTCHA_VERIFY_DURATION
+from ..middleware.redis_pool import redis_manager
 from ..settings import settings
+from .http_clients import http_clients
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_VERIFY_URL = "https://hcaptcha.com/siteverify"
 
+VERDICT_PENDING = "pending"
+VERDICT_ACCEPTED = "accepted"
+VERDICT_REJECTED = "rejected"
+
+
+class CaptchaVerdictCache:
+    """
+    Remember every captcha token seen recently, keyed by its SHA-256.
+
+    Captcha tokens are single-use, so any token already in the cache is refused without
+    asking the provider: a previously accepted token is a replay and a rejected one will
+    not start passing. A token is claimed atomically (``SET NX`` in Redis, shared by all
+    workers) before verification, which also stops two concurrent submissions of the
+    same token from both reaching the provider. Without Redis the claim is per-process.
+    """
+
+    def __init__(self, *, ttl: float, maxsize: int, prefix: str = "captcha:verdict:") -> None:
+        self.ttl = ttl
+        # Milliseconds, so a sub-second TTL does not round down to "no expiry".
+        self._ttl_ms = max(1, int(ttl * 1000))
+        self.prefix = prefix
+        self._local: TTLCache[str, str] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.replays = 0
+
+    @staticmethod
+    def token_key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def _redis(self) -> Any:
+        if not settings.redis_url:
+            return None
+        return redis_manager.get_client()
+
+    async def claim(self, key: str) -> Optional[str]:
+        """Claim ``key`` for verification; return the earlier verdict if it was already seen."""
+        client = self._redis()
+        if client is not None:
+            try:
+                if await client.set(self.prefix + key, VERDICT_PENDING, nx=True, px=self._ttl_ms):
+                    return None
+                return await client.get(self.prefix + key) or VERDICT_PENDING
+            except Exception as exc:
+                redis_manager.record_failure(exc)
+                logger.warning("Captcha verdict cache unavailable, using local cache: %s", exc)
+        seen = self._local.get(key)
+        if seen is None:
+            self._local.set(key, VERDICT_PENDING)
+        return seen
+
+    async def record(self, key: str, verdict: str) -> None:
+        self._local.set(key, verdict)
+        client = self._redis()
+        if client is not None:
+            try:
+                await client.set(self.prefix + key, verdict, px=self._ttl_ms)
+            except Exception as exc:  # pragma: no cover - local copy still guards this worker
+                redis_manager.record_failure(exc)
+                logger.warning("Unable to store captcha verdict in Redis: %s", exc)
+
+    async def release(self, key: str) -> None:
+        """Forget a claim whose verification never completed so the user can retry."""
+        self._local.pop(key)
+        client = self._redis()
+        if client is not None:
+            try:
+                await client.delete(self.prefix + key)
+            except Exception as exc:  # pragma: no cover - the claim simply expires
+                redis_manager.record_failure(exc)
+                logger.warning("Unable to release captcha claim in Redis: %s", exc)
+
+    def clear(self) -> None:
+        self._local.clear()
+        self.replays = 0
+
+
+verdict_cache = CaptchaVerdictCache(
+    ttl=settings.captcha_verdict_ttl_seconds,
+    maxsize=settings.captcha_verdict_cache_size,
+)
+
 
 async def verify_captcha_token(
     token: str | None,
@@ -43,30 +129,62 @@ async def verify_captcha_token(
             )
         return
 
-    payload: dict[str, Any] = {
-        "secret": settings.captcha_secret_key,
-        "response": token,
-    }
+    token_key = verdict_cache.token_key(token)
+    previous = await verdict_cache.claim(token_key)
+    if previous is not None:
+        verdict_cache.replays += 1
+        logger.info(
+            "Captcha token reused",
+            extra={
+                "host": request.client.host if request.client else None,
+                "previous_verdict": previous,
+            },
+        )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Captcha verification failed. Please refresh and try again.",
+        )
+
+    try:
+        payload: dict[str, Any] = {
+            "secret": settings.captcha_secret_key,
+            "response": token,
+        }
 
-    # Provide remote IP when available to improve challenge scoring.
-    if request.client and request.client.host:
-        payload["remoteip"] = request.client.host
+        # Provide remote IP when available to improve challenge scoring.
+        if request.client and request.client.host:
+            payload["remoteip"] = request.client.host
 
-    verify_url = settings.captcha_verify_url or DEFAULT_VERIFY_URL
+        verify_url = settings.captcha_verify_url or DEFAULT_VERIFY_URL
 
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.post(verify_url, data=payload)
+        started = time.perf_counter()
+        try:
+            response = await http_clients.get("captcha").post(verify_url, data=payload)
             response.raise_for_status()
             result = response.json()
-    except httpx.HTTPError as exc:
-        logger.warning("Captcha verification request failed: %s", exc)
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Captcha verification failed. Please try again later.",
-        ) from exc
+            if not isinstance(result, dict):
+                raise ValueError(f"unexpected siteverify response: {type(result).__name__}")
+        except (httpx.HTTPError, ValueError) as exc:
+            # ValueError covers a non-JSON body (e.g. a proxy error page) served with a 200.
+            CAPTCHA_VERIFY_DURATION.labels(outcome="error").observe(time.perf_counter() - started)
+            logger.warning("Captcha verification request failed: %s", exc)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Captcha verification failed. Please try again later.",
+            ) from exc
+
+        accepted = bool(result.get("success"))
+        CAPTCHA_VERIFY_DURATION.labels(outcome="accepted" if accepted else "rejected").observe(
+            time.perf_counter() - started
+        )
+        await verdict_cache.record(token_key, VERDICT_ACCEPTED if accepted else VERDICT_REJECTED)
+    except BaseException:
+        # No verdict was recorded (upstream failure, cancelled request, ...): free the
+        # token so the user's retry is verified rather than refused as a replay.
+        await verdict_cache.release(token_key)
+        raise
 
-    if not bool(result.get("success")):
+    if not accepted:
         logger.info(
             "Captcha verification denied",
             extra={
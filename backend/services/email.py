@@ -3,17 +3,16 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-import smtplib
-import ssl
 from dataclasses import dataclass
 from email.message import EmailMessage as SMTPMessage
 from pathlib import Path
 from typing import Any, Mapping, MutableMapping, Optional
 
-import httpx
 from jinja2 import Environment, FileSystemLoader, TemplateNotFound, select_autoescape
 
 from ..settings import settings
+from .http_clients import http_clients
+from .smtp_pool import get_smtp_pool
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +25,10 @@ _template_env = Environment(
 )
 
 RETRY_DELAYS = (0, 2, 5)
-SMTP_TIMEOUT_SECONDS = 15
+
+
+class EmailRenderError(RuntimeError):
+    """Raised when a templated email cannot be rendered; retrying will not help."""
 
 
 @dataclass(slots=True)
@@ -100,35 +102,6 @@ def _build_smtp_message(compiled: CompiledEmail) -> SMTPMessage:
     return message
 
 
-def _send_via_smtp(compiled: CompiledEmail) -> None:
-    if not settings.email_host:
-        raise RuntimeError("EMAIL_HOST is not configured")
-
-    port = settings.email_port or 587
-    username = settings.email_username
-    password = settings.email_password
-    use_ssl = port == 465
-    context = ssl.create_default_context()
-
-    if use_ssl:
-        with smtplib.SMTP_SSL(settings.email_host, port, timeout=SMTP_TIMEOUT_SECONDS, context=context) as client:
-            if username and password:
-                client.login(username, password)
-            client.send_message(_build_smtp_message(compiled))
-            return
-
-    with smtplib.SMTP(settings.email_host, port, timeout=SMTP_TIMEOUT_SECONDS) as client:
-        client.ehlo()
-        try:
-            client.starttls(context=context)
-            client.ehlo()
-        except smtplib.SMTPException:
-            logger.debug("SMTP server did not accept STARTTLS; continuing without TLS")
-        if username and password:
-            client.login(username, password)
-        client.send_message(_build_smtp_message(compiled))
-
-
 def _is_sendgrid() -> bool:
     provider = (settings.email_provider or "").strip().lower()
     return provider == "sendgrid" and bool(settings.email_api_key)
@@ -152,14 +125,22 @@ async def _send_via_sendgrid(compiled: CompiledEmail) -> None:
         "Authorization": f"Bearer {settings.email_api_key}",
         "Content-Type": "application/json",
     }
-    async with httpx.AsyncClient(timeout=SMTP_TIMEOUT_SECONDS) as client:
-        response = await client.post("https://api.sendgrid.com/v3/mail/send", headers=headers, content=json.dumps(payload))
-        response.raise_for_status()
+    response = await http_clients.get("sendgrid").post("/v3/mail/send", headers=headers, content=json.dumps(payload))
+    response.raise_for_status()
+
+
+def transport_endpoint() -> Optional[tuple[str, str, int]]:
+    """``(transport, host, port)`` that deliveries will connect to, or ``None`` if none is configured."""
+    if _smtp_configured():
+        return "smtp", settings.email_host, settings.email_port or 587
+    if _is_sendgrid():
+        return "sendgrid", "api.sendgrid.com", 443
+    return None
 
 
 async def _deliver(compiled: CompiledEmail) -> None:
     if _smtp_configured():
-        await asyncio.to_thread(_send_via_smtp, compiled)
+        await get_smtp_pool().send(_build_smtp_message(compiled))
         return
     if _is_sendgrid():
         await _send_via_sendgrid(compiled)
@@ -167,6 +148,24 @@ async def _deliver(compiled: CompiledEmail) -> None:
     raise RuntimeError("No email transport configured")
 
 
+async def deliver_templated_email(
+    template: str,
+    *,
+    to: str,
+    subject: str,
+    context: Mapping[str, Any] | None = None,
+) -> None:
+    """
+    Render and send a templated email once, raising on any failure.
+
+    Used by the outbox worker, which owns retries and dead-lettering.
+    """
+    compiled = _compile_email(template, to=to, subject=subject, context=context)
+    if not compiled:
+        raise EmailRenderError(f"Unable to compile email template={template} to={to}")
+    await _deliver(compiled)
+
+
 async def send_templated_email(
     template: str,
     *,
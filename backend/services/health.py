@@ -0,0 +1,223 @@
+"""Background dependency probes behind the health and readiness endpoints."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import text
+
+from .. import database
+from ..middleware.redis_pool import redis_manager
+from ..replica import replica_router
+from ..settings import settings
+from .email import transport_endpoint
+
+logger = logging.getLogger(__name__)
+
+STATUS_OK = "ok"
+STATUS_DOWN = "down"
+STATUS_DISABLED = "disabled"
+
+# Dependencies the API cannot serve requests without; the others have fallbacks
+# (in-process rate limiting, the outbox retries email, reads fall back to the primary).
+REQUIRED = frozenset({"database"})
+
+
+@dataclass(slots=True)
+class ProbeResult:
+    status: str
+    latency_ms: float = 0.0
+    error: Optional[str] = None
+    checked_at: float = 0.0
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        result: dict[str, Any] = {
+            "status": self.status,
+            "latency_ms": self.latency_ms,
+            "age_seconds": round(now - self.checked_at, 3),
+        }
+        if self.error:
+            result["error"] = self.error
+        return result
+
+
+async def _check_database() -> str:
+    async with database.async_session_factory() as session:
+        await session.execute(text("SELECT 1"))
+    return STATUS_OK
+
+
+async def _check_redis() -> str:
+    if not redis_manager.url:
+        return STATUS_DISABLED
+    client = redis_manager.get_client()
+    if client is None:
+        # Circuit open: the breaker's own probe is already watching for recovery.
+        raise ConnectionError(f"circuit {redis_manager.breaker.state}")
+    await client.ping()
+    return STATUS_OK
+
+
+async def _check_replica() -> str:
+    if not replica_router.enabled:
+        return STATUS_DISABLED
+    lag = await replica_router.measure_lag()
+    if lag is None:
+        raise ConnectionError("replica unreachable")
+    if lag > replica_router.max_lag:
+        raise RuntimeError(f"replica {lag:.1f}s behind")
+    return STATUS_OK
+
+
+async def _check_email() -> str:
+    endpoint = transport_endpoint()
+    if endpoint is None:
+        return STATUS_DISABLED
+    _, host, port = endpoint
+    _, writer = await asyncio.open_connection(host, port)
+    writer.close()
+    with contextlib.suppress(Exception):
+        await writer.wait_closed()
+    return STATUS_OK
+
+
+class HealthProber:
+    """
+    Probe each dependency every ``interval`` seconds and keep the latest results.
+
+    The endpoints only read these results, so a flood of health checks costs no
+    database connections and still answers while the pool is exhausted. Each probe is
+    bounded by ``timeout``; a probe that raises or times out reports the dependency down.
+    """
+
+    def __init__(
+        self,
+        checks: dict[str, Callable[[], Awaitable[str]]],
+        *,
+        interval: float,
+        timeout: float,
+    ) -> None:
+        self.checks = checks
+        self.interval = interval
+        self.timeout = timeout
+        self.results: dict[str, ProbeResult] = {}
+        self.last_round: Optional[float] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._first_round: Optional[asyncio.Task[None]] = None
+
+    async def _probe(self, name: str, check: Callable[[], Awaitable[str]]) -> None:
+        started = time.monotonic()
+        try:
+            status, error = await asyncio.wait_for(check(), self.timeout), None
+        except asyncio.TimeoutError:
+            status, error = STATUS_DOWN, f"timed out after {self.timeout}s"
+        except Exception as exc:
+            status, error = STATUS_DOWN, f"{type(exc).__name__}: {exc}"
+        finished = time.monotonic()
+        previous = self.results.get(name)
+        if status == STATUS_DOWN and (
+            previous is None or previous.status != STATUS_DOWN
+        ):
+            logger.warning(
+                "health.dependency_down", extra={"dependency": name, "error": error}
+            )
+        elif (
+            previous is not None
+            and previous.status == STATUS_DOWN
+            and status != STATUS_DOWN
+        ):
+            logger.info("health.dependency_recovered", extra={"dependency": name})
+        self.results[name] = ProbeResult(
+            status, round((finished - started) * 1000, 2), error, finished
+        )
+
+    async def refresh(self) -> None:
+        """Run every check once, concurrently."""
+        await asyncio.gather(
+            *(self._probe(name, check) for name, check in self.checks.items())
+        )
+        self.last_round = time.monotonic()
+
+    async def first_round(self) -> None:
+        """Wait until a probe round has finished; concurrent callers share one round."""
+        if self.last_round is not None:
+            return
+        loop = asyncio.get_running_loop()
+        if (
+            self._first_round is None
+            or self._first_round.done()
+            or self._first_round.get_loop() is not loop
+        ):
+            self._first_round = loop.create_task(self.refresh())
+        # Shielded: one caller giving up must not cancel the round the others await.
+        await asyncio.shield(self._first_round)
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                if self.last_round is None:
+                    await self.first_round()
+                else:
+                    await self.refresh()
+            except Exception:  # pragma: no cover - keep probing
+                logger.exception("Health probe round failed")
+            await asyncio.sleep(self.interval)
+
+    def ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, RuntimeError):
+                await self._task
+            self._task = None
+
+    def is_stale(self, now: float) -> bool:
+        """True when no probe round has finished recently, e.g. because the event loop is stuck."""
+        return (
+            self.last_round is not None
+            and now - self.last_round > 3 * self.interval + self.timeout
+        )
+
+    def snapshot(self, now: float) -> dict[str, dict[str, Any]]:
+        return {
+            name: result.as_dict(now) for name, result in sorted(self.results.items())
+        }
+
+    def ready(self) -> bool:
+        return all(
+            name in self.results and self.results[name].status != STATUS_DOWN
+            for name in REQUIRED & self.checks.keys()
+        )
+
+    def degraded(self) -> bool:
+        return any(result.status == STATUS_DOWN for result in self.results.values())
+
+    def clear(self) -> None:
+        self.results.clear()
+        self.last_round = None
+        self._first_round = None
+
+
+_CHECKS: dict[str, Callable[[], Awaitable[str]]] = {
+    "database": _check_database,
+    "redis": _check_redis,
+    "replica": _check_replica,
+}
+if settings.health_probe_email:
+    # Off by default: every API worker would open an SMTP connection each round, and
+    # the outbox worker, not the API, is what delivers email.
+    _CHECKS["email"] = _check_email
+
+health_prober = HealthProber(
+    _CHECKS,
+    interval=settings.health_probe_interval_seconds,
+    timeout=settings.health_probe_timeout_seconds,
+)
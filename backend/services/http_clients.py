@@ -0,0 +1,109 @@
+"""Shared, long-lived outbound HTTP clients keyed by upstream."""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+from ..settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class Upstream:
+    timeout: float
+    base_url: str = ""
+
+
+# Every outbound dependency gets its own client, so connection limits apply per host.
+UPSTREAMS: dict[str, Upstream] = {
+    "captcha": Upstream(timeout=5.0),
+    "sendgrid": Upstream(timeout=15.0, base_url="https://api.sendgrid.com"),
+}
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class HTTPClientRegistry:
+    """
+    Hand out one pooled ``httpx.AsyncClient`` per named upstream.
+
+    Clients keep connections alive between requests so repeated calls skip DNS, TCP and
+    TLS setup, and negotiate HTTP/2 when ``HTTP_CLIENT_HTTP2`` is on and ``h2`` is
+    installed. Clients are bound to the event loop that created them and are rebuilt
+    if a different loop asks for one.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int,
+        max_keepalive: int,
+        keepalive_expiry: float,
+        http2: bool,
+    ) -> None:
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2 and http2_available()
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Connections from another loop cannot be reused; drop them without awaiting.
+            self._clients.clear()
+            self._loop = loop
+
+    def _build(self, name: str) -> httpx.AsyncClient:
+        upstream = UPSTREAMS.get(name)
+        if upstream is None:
+            raise KeyError(f"Unknown HTTP upstream: {name}")
+        return httpx.AsyncClient(
+            base_url=upstream.base_url,
+            timeout=upstream.timeout,
+            limits=self.limits,
+            http2=self.http2,
+        )
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        self._bind_loop()
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._clients[name] = self._build(name)
+        return client
+
+    def register(self, name: str, client: httpx.AsyncClient) -> None:
+        """Use ``client`` for ``name`` on the current loop (e.g. a stub transport in tests)."""
+        self._bind_loop()
+        self._clients[name] = client
+
+    def open(self) -> None:
+        for name in UPSTREAMS:
+            self.get(name)
+
+    async def aclose(self) -> None:
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception:  # pragma: no cover - best effort on shutdown
+                logger.warning("Failed to close HTTP client", exc_info=True)
+
+
+http_clients = HTTPClientRegistry(
+    max_connections=settings.http_client_max_connections,
+    max_keepalive=settings.http_client_max_keepalive,
+    keepalive_expiry=settings.http_client_keepalive_expiry_seconds,
+    http2=settings.http_client_http2,
+)
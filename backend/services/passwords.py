@@ -0,0 +1,133 @@
+"""Async password hashing backed by a bounded worker pool."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from fastapi import HTTPException, status
+
+from ..security import hash_password, verify_password
+from ..settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+LATENCY_SAMPLE_SIZE = 1024
+
+
+class LatencyTracker:
+    """Rolling window of call durations used to report percentiles."""
+
+    def __init__(self, size: int = LATENCY_SAMPLE_SIZE) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, quantile: float) -> float:
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(quantile * (len(ordered) - 1))))
+        return ordered[index]
+
+    def clear(self) -> None:
+        self._samples.clear()
+
+
+class PasswordHasher:
+    """
+    Run bcrypt hashing and verification off the event loop.
+
+    Work is submitted to a thread or process pool. At most ``max_workers + max_queue``
+    operations may be pending at once; anything beyond that is rejected immediately with
+    a 503 so a login burst cannot build an unbounded backlog.
+    """
+
+    def __init__(
+        self, *, executor: str = "thread", max_workers: int = 4, max_queue: int = 64
+    ) -> None:
+        if executor not in {"thread", "process"}:
+            raise ValueError(f"Unsupported password hash executor: {executor}")
+        self.executor_kind = executor
+        self.max_workers = max(1, max_workers)
+        self.max_pending = self.max_workers + max(0, max_queue)
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latency = LatencyTracker()
+
+    @classmethod
+    def from_settings(cls) -> PasswordHasher:
+        return cls(
+            executor=settings.password_hash_executor,
+            max_workers=settings.password_hash_workers,
+            max_queue=settings.password_hash_max_queue,
+        )
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password-hash",
+                )
+        return self._executor
+
+    async def _submit(self, func: Callable[..., T], *args: Any) -> T:
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            logger.warning(
+                "Password hasher saturated; rejecting request (pending=%d)",
+                self._pending,
+            )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service is busy. Please retry shortly.",
+                headers={"Retry-After": "1"},
+            )
+
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+            self._completed += 1
+            self._latency.observe(time.perf_counter() - started)
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    def metrics(self) -> dict[str, Any]:
+        """Return a snapshot of queue depth and latency percentiles (milliseconds)."""
+        return {
+            "executor": self.executor_kind,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "p50_ms": round(self._latency.percentile(0.50) * 1000, 3),
+            "p99_ms": round(self._latency.percentile(0.99) * 1000, 3),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher.from_settings()
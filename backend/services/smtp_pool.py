@@ -0,0 +1,237 @@
+"""Pool of authenticated SMTP sessions reused across messages."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import smtplib
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from typing import Optional
+
+from ..settings import settings
+
+logger = logging.getLogger(__name__)
+
+SMTP_TIMEOUT_SECONDS = 15
+
+# The server answered and refused the message; the session itself is fine. These are
+# matched first because smtplib's exceptions subclass OSError.
+_REJECTIONS = (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)
+# Errors that mean the session is unusable; the message is retried once on a fresh one.
+_CONNECTION_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    smtplib.SMTPConnectError,
+    ConnectionError,
+    OSError,
+)
+
+
+@dataclass(slots=True)
+class _PooledConnection:
+    client: smtplib.SMTP
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class SMTPConnectionPool:
+    """
+    Keep up to ``size`` logged-in SMTP sessions open between sends.
+
+    Sends run on a dedicated thread pool of the same size, so at most ``size`` sessions
+    are ever in use. An idle session is closed once it has been unused for
+    ``idle_timeout`` seconds, and is probed with ``NOOP`` before reuse when it has been
+    idle for longer than ``health_check_after``. A send that fails because the server
+    dropped the session is retried once on a new connection.
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        size: int = 4,
+        idle_timeout: float = 60.0,
+        health_check_after: float = 10.0,
+        timeout: float = SMTP_TIMEOUT_SECONDS,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = max(1, size)
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self.timeout = timeout
+        self._idle: queue.LifoQueue[_PooledConnection] = queue.LifoQueue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.size, thread_name_prefix="smtp"
+        )
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def _connect(self) -> _PooledConnection:
+        context = ssl.create_default_context()
+        client: smtplib.SMTP
+        if self.port == 465:
+            client = smtplib.SMTP_SSL(
+                self.host, self.port, timeout=self.timeout, context=context
+            )
+        else:
+            client = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            client.ehlo()
+            try:
+                client.starttls(context=context)
+                client.ehlo()
+            except smtplib.SMTPException:
+                logger.debug(
+                    "SMTP server did not accept STARTTLS; continuing without TLS"
+                )
+        if self.username and self.password:
+            client.login(self.username, self.password)
+        with self._lock:
+            self.opened += 1
+        return _PooledConnection(client=client)
+
+    def _discard(self, connection: _PooledConnection) -> None:
+        with self._lock:
+            self.discarded += 1
+        try:
+            connection.client.quit()
+        except Exception:
+            try:
+                connection.client.close()
+            except Exception:  # pragma: no cover - already broken
+                pass
+
+    def _is_healthy(self, connection: _PooledConnection) -> bool:
+        try:
+            code, _ = connection.client.noop()
+        except Exception:
+            return False
+        return code == 250
+
+    def _acquire(self) -> _PooledConnection:
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            idle_for = time.monotonic() - connection.last_used
+            if idle_for > self.idle_timeout:
+                self._discard(connection)
+                continue
+            if idle_for > self.health_check_after and not self._is_healthy(connection):
+                self._discard(connection)
+                continue
+            with self._lock:
+                self.reused += 1
+            return connection
+
+    def _release(self, connection: _PooledConnection) -> None:
+        connection.last_used = time.monotonic()
+        self._idle.put(connection)
+
+    def send_sync(self, message: EmailMessage) -> None:
+        connection = self._acquire()
+        try:
+            connection.client.send_message(message)
+        except _REJECTIONS:
+            self._release(connection)
+            raise
+        except _CONNECTION_ERRORS:
+            self._discard(connection)
+            connection = self._connect()
+            try:
+                connection.client.send_message(message)
+            except _REJECTIONS:
+                self._release(connection)
+                raise
+            except Exception:
+                self._discard(connection)
+                raise
+        except Exception:
+            # Raised before anything reached the server (e.g. an unencodable message).
+            self._release(connection)
+            raise
+        self._release(connection)
+
+    async def send(self, message: EmailMessage) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self.send_sync, message)
+
+    def prune(self) -> None:
+        """Close idle sessions that have exceeded ``idle_timeout``."""
+        keep: list[_PooledConnection] = []
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if time.monotonic() - connection.last_used > self.idle_timeout:
+                self._discard(connection)
+            else:
+                keep.append(connection)
+        for connection in reversed(keep):
+            self._idle.put(connection)
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "idle": self._idle.qsize(),
+            "opened": self.opened,
+            "reused": self.reused,
+            "discarded": self.discarded,
+        }
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        self._executor.shutdown(wait=False)
+
+
+_pool: Optional[SMTPConnectionPool] = None
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    """Return the process-wide pool for the configured SMTP server."""
+    global _pool
+    if not settings.email_host:
+        raise RuntimeError("EMAIL_HOST is not configured")
+    port = settings.email_port or 587
+    if _pool is None or (_pool.host, _pool.port) != (settings.email_host, port):
+        if _pool is not None:
+            _pool.close()
+        _pool = SMTPConnectionPool(
+            host=settings.email_host,
+            port=port,
+            username=settings.email_username,
+            password=settings.email_password,
+            size=settings.email_smtp_pool_size,
+            idle_timeout=settings.email_smtp_idle_timeout_seconds,
+            health_check_after=settings.email_smtp_health_check_seconds,
+            timeout=SMTP_TIMEOUT_SECONDS,
+        )
+    return _pool
+
+
+def prune_smtp_pool() -> None:
+    if _pool is not None:
+        _pool.prune()
+
+
+def close_smtp_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
@@ -0,0 +1,91 @@
+"""Current ``token_version`` per user, so signed claims can be trusted without loading the user."""
+from __future__ import annotations
+
+from typing import Awaitable, Callable, Optional
+
+from fastapi import HTTPException, status
+
+from ..middleware.redis_pool import redis_manager
+from ..settings import settings
+
+# Stored in place of a version while a change is being committed: "ask the database".
+PENDING = "pending"
+
+
+class TokenVersionStore:
+    """
+    Map of token subject to the user's current ``token_version``, shared through Redis.
+
+    Entries expire after ``ttl`` seconds. Without a reachable Redis nothing is cached and
+    every lookup goes to ``loader``, which reads the primary: a per-process copy could
+    not be invalidated by a revocation made in another worker.
+
+    Writers call :meth:`invalidate` *before* committing a new version. It replaces the
+    entry with a ``PENDING`` marker that outlasts the transaction, so no worker can keep
+    (or re-cache) the old version once the change commits. If the marker cannot be
+    written the change is refused rather than left to be honoured stale.
+    """
+
+    def __init__(self, *, ttl: float, prefix: str = "token_version:") -> None:
+        self.ttl = ttl
+        self.prefix = prefix
+        self._ttl_ms = int(ttl * 1000)
+        # Long enough for the caller's transaction to commit after invalidate() returns.
+        self._pending_ms = max(self._ttl_ms, 10_000)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(redis_manager.url) and self._ttl_ms > 0
+
+    async def current(
+        self, subject: str, loader: Callable[[], Awaitable[Optional[int]]]
+    ) -> Optional[int]:
+        """The subject's current version, or ``None`` if the user no longer exists."""
+        client = redis_manager.get_client() if self.enabled else None
+        if client is None:
+            return await loader()
+        key = self.prefix + subject
+        try:
+            stored = await client.get(key)
+        except Exception as exc:
+            redis_manager.record_failure(exc)
+            return await loader()
+        if stored == PENDING:
+            return await loader()
+        if stored is not None:
+            return int(stored)
+        version = await loader()
+        if version is not None:
+            try:
+                # NX: never overwrite a PENDING marker written while this read was loading.
+                await client.set(key, version, px=self._ttl_ms, nx=True)
+            except Exception as exc:
+                redis_manager.record_failure(exc)
+        return version
+
+    async def invalidate(self, *subjects: str) -> None:
+        """
+        Stop every worker trusting the cached version of ``subjects``.
+
+        Call before the transaction that changes their ``token_version`` commits.
+        Raises a 503 if Redis cannot be updated, which aborts the change.
+        """
+        if not self.enabled:
+            return
+        client = redis_manager.get_client()
+        try:
+            if client is None:
+                raise ConnectionError(f"circuit {redis_manager.breaker.state}")
+            async with client.pipeline(transaction=False) as pipe:
+                for subject in subjects:
+                    pipe.set(self.prefix + subject, PENDING, px=self._pending_ms)
+                await pipe.execute()
+        except Exception as exc:
+            redis_manager.record_failure(exc)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Unable to revoke existing sessions right now. Please try again.",
+            ) from exc
+
+
+token_versions = TokenVersionStore(ttl=settings.user_cache_ttl_seconds)
@@ -0,0 +1,177 @@
+"""Per-process cache of authenticated users with cross-worker invalidation."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import copy
+import logging
+from typing import Any, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from ..cache import TTLCache
+from ..middleware.redis_pool import redis_manager
+from ..models import User
+from ..settings import settings
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "user_cache_evict"
+
+
+class UserCache:
+    """
+    TTL + LRU cache of ``User`` column snapshots keyed by token subject.
+
+    Each entry remembers the ``token_version`` it was loaded with, so a lookup only hits
+    when the token presents that same version. Hits are re-attached to the caller's
+    session without a SELECT, so handlers can keep mutating and flushing the user as
+    before. Writers evict entries through :meth:`invalidate_on_commit`; evictions are
+    also broadcast on a Redis channel (when configured) so every worker drops its copy.
+    A listener that loses its subscription clears the cache and resubscribes with
+    exponential backoff between ``retry_initial`` and ``retry_max`` seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int,
+        ttl: float,
+        channel: str,
+        retry_initial: float = 0.5,
+        retry_max: float = 30.0,
+    ) -> None:
+        self._entries: TTLCache[str, tuple[int, dict[str, Any]]] = TTLCache(
+            maxsize=maxsize, ttl=ttl
+        )
+        self.channel = channel
+        self.retry_initial = retry_initial
+        self.retry_max = retry_max
+        self._listener: Optional[asyncio.Task[None]] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._entries.maxsize > 0 and self._entries.ttl > 0
+
+    def get(
+        self, session: AsyncSession, subject: str, token_version: Any
+    ) -> Optional[User]:
+        entry = self._entries.get(subject)
+        if entry is None:
+            return None
+        cached_version, values = entry
+        if cached_version != token_version:
+            return None
+        user = User(**copy.deepcopy(values))
+        make_transient_to_detached(user)
+        session.add(user)
+        return user
+
+    def put(self, subject: str, user: User) -> None:
+        if not self.enabled:
+            return
+        values = {
+            attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs
+        }
+        self._entries.set(subject, (user.token_version, copy.deepcopy(values)))
+
+    def evict(self, *subjects: str) -> None:
+        for subject in subjects:
+            if subject:
+                self._entries.pop(subject)
+
+    def invalidate_on_commit(self, session: AsyncSession, *subjects: str) -> None:
+        """Evict now and again once ``session`` commits, broadcasting to other workers."""
+        self.evict(*subjects)
+        session.info.setdefault(_PENDING_KEY, set()).update(s for s in subjects if s)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def publish(self, subjects: set[str]) -> None:
+        if not settings.redis_url:
+            return
+        client = redis_manager.get_client()
+        if client is None:
+            return
+        try:
+            for subject in subjects:
+                await client.publish(self.channel, subject)
+        except Exception as exc:  # pragma: no cover - best effort broadcast
+            redis_manager.record_failure(exc)
+            logger.warning("Unable to publish user cache invalidation: %s", exc)
+
+    async def _listen(self) -> None:
+        delay = self.retry_initial
+        while True:
+            # Not the pooled client: its socket timeout would end the subscription after
+            # the first quiet spell.
+            client = redis_manager.subscriber_client()
+            if client is None:
+                return
+            pubsub = client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                delay = self.retry_initial
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.evict(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(
+                    "User cache invalidation listener lost its subscription, retrying in %.1fs: %s",
+                    delay,
+                    exc,
+                )
+            finally:
+                # Closing the connection ends the subscription; UNSUBSCRIBE on a broken
+                # connection would only make redis-py reconnect and subscribe again first.
+                with contextlib.suppress(Exception):
+                    await pubsub.aclose()
+            # Evictions published while unsubscribed are lost, so nothing cached before is trusted.
+            self.clear()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.retry_max)
+
+    def start_listener(self) -> None:
+        if (
+            self.enabled
+            and settings.redis_url
+            and (self._listener is None or self._listener.done())
+        ):
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop_listener(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+
+
+user_cache = UserCache(
+    maxsize=settings.user_cache_max_size,
+    ttl=settings.user_cache_ttl_seconds,
+    channel=settings.user_cache_channel,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_after_commit(session: Session) -> None:
+    subjects: Optional[set[str]] = session.info.pop(_PENDING_KEY, None)
+    if not subjects:
+        return
+    user_cache.evict(*subjects)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    loop.create_task(user_cache.publish(subjects))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
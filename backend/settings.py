@@ -15,6 +15,31 @@ class Settings(BaseSettings):
     api_prefix: str = "/api/v1"
 
     database_url: Annotated[str, Field(validation_alias="DATABASE_URL")]
+    db_slow_query_ms: Annotated[float, Field(validation_alias="DB_SLOW_QUERY_MS", ge=0)] = 200.0
+    # Connections the whole deployment may hold; each of the WEB_CONCURRENCY workers gets an equal share
+    # unless DB_POOL_SIZE / DB_MAX_OVERFLOW are set explicitly.
+    web_concurrency: Annotated[int, Field(validation_alias="WEB_CONCURRENCY", ge=1)] = 4
+    db_max_connections: Annotated[int, Field(validation_alias="DB_MAX_CONNECTIONS", ge=1)] = 80
+    db_pool_size: Annotated[int | None, Field(validation_alias="DB_POOL_SIZE", ge=1)] = None
+    db_max_overflow: Annotated[int | None, Field(validation_alias="DB_MAX_OVERFLOW", ge=0)] = None
+    db_pool_timeout_seconds: Annotated[float, Field(validation_alias="DB_POOL_TIMEOUT_SECONDS", gt=0)] = 10.0
+    db_pool_recycle_seconds: Annotated[int, Field(validation_alias="DB_POOL_RECYCLE_SECONDS", ge=-1)] = 1800
+    db_ping_idle_seconds: Annotated[float, Field(validation_alias="DB_PING_IDLE_SECONDS", ge=0)] = 30.0
+    db_statement_cache_size: Annotated[int, Field(validation_alias="DB_STATEMENT_CACHE_SIZE", ge=0)] = 100
+    db_pgbouncer: Annotated[bool, Field(validation_alias="DB_PGBOUNCER")] = False
+    database_replica_url: Annotated[str | None, Field(validation_alias="DATABASE_REPLICA_URL")] = None
+    db_replica_max_lag_seconds: Annotated[
+        float, Field(validation_alias="DB_REPLICA_MAX_LAG_SECONDS", ge=0)
+    ] = 5.0
+    db_replica_lag_check_seconds: Annotated[
+        float, Field(validation_alias="DB_REPLICA_LAG_CHECK_SECONDS", gt=0)
+    ] = 2.0
+    db_replica_lag_timeout_seconds: Annotated[
+        float, Field(validation_alias="DB_REPLICA_LAG_TIMEOUT_SECONDS", gt=0)
+    ] = 0.5
+    db_read_your_writes_seconds: Annotated[
+        float, Field(validation_alias="DB_READ_YOUR_WRITES_SECONDS", ge=0)
+    ] = 10.0
 
     jwt_secret_key: Annotated[str, Field(validation_alias="JWT_SECRET_KEY")]
     jwt_algorithm: str = "HS256"
@@ -26,8 +51,36 @@ class Settings(BaseSettings):
 
     env: Annotated[str, Field(validation_alias="ENV")] = "development"
     log_level: Annotated[str, Field(validation_alias="LOG_LEVEL")] = "INFO"
+    log_json: Annotated[bool, Field(validation_alias="LOG_JSON")] = True
+    log_request_sample_rate: Annotated[
+        float, Field(validation_alias="LOG_REQUEST_SAMPLE_RATE", ge=0.0, le=1.0)
+    ] = 1.0
+    log_request_sample_rates: Annotated[
+        dict[str, Annotated[float, Field(ge=0.0, le=1.0)]], Field(validation_alias="LOG_REQUEST_SAMPLE_RATES")
+    ] = {}
+
+    health_probe_interval_seconds: Annotated[
+        float, Field(validation_alias="HEALTH_PROBE_INTERVAL_SECONDS", gt=0)
+    ] = 10.0
+    health_probe_timeout_seconds: Annotated[
+        float, Field(validation_alias="HEALTH_PROBE_TIMEOUT_SECONDS", gt=0)
+    ] = 2.0
+    health_probe_email: Annotated[bool, Field(validation_alias="HEALTH_PROBE_EMAIL")] = False
 
     redis_url: Annotated[str | None, Field(validation_alias="REDIS_URL")] = None
+    redis_max_connections: Annotated[int, Field(validation_alias="REDIS_MAX_CONNECTIONS", ge=1)] = 50
+    redis_socket_timeout_seconds: Annotated[
+        float, Field(validation_alias="REDIS_SOCKET_TIMEOUT_SECONDS", gt=0)
+    ] = 0.5
+    redis_connect_timeout_seconds: Annotated[
+        float, Field(validation_alias="REDIS_CONNECT_TIMEOUT_SECONDS", gt=0)
+    ] = 0.5
+    redis_breaker_failure_threshold: Annotated[
+        int, Field(validation_alias="REDIS_BREAKER_FAILURE_THRESHOLD", ge=1)
+    ] = 3
+    redis_breaker_probe_interval_seconds: Annotated[
+        float, Field(validation_alias="REDIS_BREAKER_PROBE_INTERVAL_SECONDS", gt=0)
+    ] = 5.0
     dev_master_otp: Annotated[str | None, Field(validation_alias="DEV_MASTER_OTP")] = "000000"
     email_provider: Annotated[str | None, Field(validation_alias="EMAIL_PROVIDER")] = None
     email_api_key: Annotated[str | None, Field(validation_alias="EMAIL_API_KEY")] = None
@@ -46,6 +99,23 @@ class Settings(BaseSettings):
     client_error_rate_window_seconds: Annotated[
         int, Field(validation_alias="CLIENT_ERROR_RATE_WINDOW_SECONDS")
     ] = 60
+    rate_limit_algorithm: Annotated[
+        str,
+        Field(validation_alias="RATE_LIMIT_ALGORITHM", pattern="^(fixed_window|sliding_window|token_bucket|gcra)$"),
+    ] = "sliding_window"
+    rate_limit_memory_shards: Annotated[int, Field(validation_alias="RATE_LIMIT_MEMORY_SHARDS", ge=1)] = 16
+    rate_limit_memory_max_keys: Annotated[int, Field(validation_alias="RATE_LIMIT_MEMORY_MAX_KEYS", ge=1)] = 100_000
+    rate_limit_memory_sweep_seconds: Annotated[
+        float, Field(validation_alias="RATE_LIMIT_MEMORY_SWEEP_SECONDS", ge=0)
+    ] = 30.0
+    rate_limit_deny_cache_size: Annotated[int, Field(validation_alias="RATE_LIMIT_DENY_CACHE_SIZE", ge=0)] = 10_000
+    rate_limit_local_precount: Annotated[bool, Field(validation_alias="RATE_LIMIT_LOCAL_PRECOUNT")] = False
+    rate_limit_sync_interval_seconds: Annotated[
+        float, Field(validation_alias="RATE_LIMIT_SYNC_INTERVAL_SECONDS", gt=0)
+    ] = 0.25
+    rate_limit_precount_max_keys: Annotated[
+        int, Field(validation_alias="RATE_LIMIT_PRECOUNT_MAX_KEYS", ge=1)
+    ] = 10_000
 
     captcha_provider: Annotated[str | None, Field(validation_alias="CAPTCHA_PROVIDER")] = "hcaptcha"
     captcha_secret_key: Annotated[str | None, Field(validation_alias="CAPTCHA_SECRET_KEY")] = None
@@ -55,6 +125,66 @@ class Settings(BaseSettings):
     captcha_required_for_public_forms: Annotated[
         bool, Field(validation_alias="CAPTCHA_REQUIRED_FOR_PUBLIC_FORMS")
     ] = False
+    captcha_verdict_ttl_seconds: Annotated[
+        int, Field(validation_alias="CAPTCHA_VERDICT_TTL_SECONDS", ge=1)
+    ] = 300
+    captcha_verdict_cache_size: Annotated[int, Field(validation_alias="CAPTCHA_VERDICT_CACHE_SIZE", ge=0)] = 10_000
+
+    password_hash_executor: Annotated[str, Field(validation_alias="PASSWORD_HASH_EXECUTOR")] = "thread"
+    password_hash_workers: Annotated[int, Field(validation_alias="PASSWORD_HASH_WORKERS", ge=1)] = 4
+    password_hash_max_queue: Annotated[int, Field(validation_alias="PASSWORD_HASH_MAX_QUEUE", ge=0)] = 64
+
+    token_cache_max_size: Annotated[int, Field(validation_alias="TOKEN_CACHE_MAX_SIZE", ge=0)] = 4096
+    user_cache_max_size: Annotated[int, Field(validation_alias="USER_CACHE_MAX_SIZE", ge=0)] = 1024
+    user_cache_ttl_seconds: Annotated[float, Field(validation_alias="USER_CACHE_TTL_SECONDS", ge=0)] = 30.0
+    user_cache_channel: Annotated[str, Field(validation_alias="USER_CACHE_CHANNEL")] = "orbsurv:user-cache:evict"
+
+    admin_summary_ttl_seconds: Annotated[float, Field(validation_alias="ADMIN_SUMMARY_TTL_SECONDS", ge=0)] = 15.0
+    metrics_bearer_token: Annotated[str | None, Field(validation_alias="METRICS_BEARER_TOKEN")] = None
+    metrics_snapshot_ttl_seconds: Annotated[
+        float, Field(validation_alias="METRICS_SNAPSHOT_TTL_SECONDS", ge=0)
+    ] = 15.0
+
+    admin_count_cache_ttl_seconds: Annotated[
+        float, Field(validation_alias="ADMIN_COUNT_CACHE_TTL_SECONDS", ge=0)
+    ] = 30.0
+
+    audit_buffer_enabled: Annotated[bool, Field(validation_alias="AUDIT_BUFFER_ENABLED")] = False
+    audit_buffer_max_batch: Annotated[int, Field(validation_alias="AUDIT_BUFFER_MAX_BATCH", ge=1)] = 200
+    audit_buffer_flush_interval_seconds: Annotated[
+        float, Field(validation_alias="AUDIT_BUFFER_FLUSH_INTERVAL_SECONDS", gt=0)
+    ] = 1.0
+    audit_buffer_max_queue: Annotated[int, Field(validation_alias="AUDIT_BUFFER_MAX_QUEUE", ge=1)] = 10_000
+
+    email_outbox_max_attempts: Annotated[int, Field(validation_alias="EMAIL_OUTBOX_MAX_ATTEMPTS", ge=1)] = 8
+    email_outbox_backoff_base_seconds: Annotated[
+        float, Field(validation_alias="EMAIL_OUTBOX_BACKOFF_BASE_SECONDS", ge=0)
+    ] = 30.0
+    email_outbox_backoff_max_seconds: Annotated[
+        float, Field(validation_alias="EMAIL_OUTBOX_BACKOFF_MAX_SECONDS", ge=0)
+    ] = 3600.0
+    email_outbox_poll_interval_seconds: Annotated[
+        float, Field(validation_alias="EMAIL_OUTBOX_POLL_INTERVAL_SECONDS", gt=0)
+    ] = 2.0
+    email_outbox_batch_size: Annotated[int, Field(validation_alias="EMAIL_OUTBOX_BATCH_SIZE", ge=1)] = 20
+    email_outbox_lease_seconds: Annotated[
+        float, Field(validation_alias="EMAIL_OUTBOX_LEASE_SECONDS", gt=0)
+    ] = 300.0
+
+    email_smtp_pool_size: Annotated[int, Field(validation_alias="EMAIL_SMTP_POOL_SIZE", ge=1)] = 4
+    email_smtp_idle_timeout_seconds: Annotated[
+        float, Field(validation_alias="EMAIL_SMTP_IDLE_TIMEOUT_SECONDS", gt=0)
+    ] = 60.0
+    email_smtp_health_check_seconds: Annotated[
+        float, Field(validation_alias="EMAIL_SMTP_HEALTH_CHECK_SECONDS", ge=0)
+    ] = 10.0
+
+    http_client_max_connections: Annotated[int, Field(validation_alias="HTTP_CLIENT_MAX_CONNECTIONS", ge=1)] = 20
+    http_client_max_keepalive: Annotated[int, Field(validation_alias="HTTP_CLIENT_MAX_KEEPALIVE", ge=0)] = 10
+    http_client_keepalive_expiry_seconds: Annotated[
+        float, Field(validation_alias="HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS", gt=0)
+    ] = 30.0
+    http_client_http2: Annotated[bool, Field(validation_alias="HTTP_CLIENT_HTTP2")] = True
 
     sentry_dsn: Annotated[str | None, Field(validation_alias="SENTRY_DSN")] = None
     sentry_traces_sample_rate: Annotated[
@@ -74,6 +204,10 @@ class Settings(BaseSettings):
             object.__setattr__(self, "cors_allow_origins", origins)
         test_context = bool(os.environ.get("PYTEST_CURRENT_TEST"))
         allow_insecure = os.environ.get("ORBSURV_ALLOW_INSECURE_SETTINGS") == "1"
+        if self.rate_limit_local_precount and self.rate_limit_algorithm != "fixed_window":
+            raise ValueError(
+                "RATE_LIMIT_LOCAL_PRECOUNT counts in fixed windows; set RATE_LIMIT_ALGORITHM=fixed_window to use it."
+            )
         if self.captcha_required_for_public_forms and not self.captcha_secret_key and not allow_insecure:
             raise ValueError("CAPTCHA_SECRET_KEY must be configured when captcha enforcement is enabled.")
         if self.env.lower() == "production" and not (test_context or allow_insecure):
@@ -6,6 +6,7 @@ from typing import AsyncGenerator, Awaitable, Callable, Generator
 
 import pytest
 import pytest_asyncio
+import httpx
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
@@ -15,9 +16,17 @@ from backend import database
 from backend.app import app
 from backend.database import Base, async_session_factory
 from backend.models import User, UserRole
-from backend.security import hash_password
+from backend.security import hash_password, token_cache
 from backend.settings import settings
 from backend.middleware import reset_in_memory_counters
+from backend.middleware.rate_limit import in_memory_store  # noqa: E402
+from backend.api.admin import summary_snapshot  # noqa: E402
+from backend.api.metrics import outbox_pending_snapshot  # noqa: E402
+from backend.crud.counting import count_cache  # noqa: E402
+from backend.services.captcha import verdict_cache  # noqa: E402
+from backend.services.health import health_prober  # noqa: E402
+from backend.services.http_clients import http_clients  # noqa: E402
+from backend.services.user_cache import user_cache  # noqa: E402
 
 TEST_DB_PATH = Path("test_orbsurv.db")
 TEST_DATABASE_URL = f"sqlite+aiosqlite:///{TEST_DB_PATH}"
@@ -77,6 +86,49 @@ def _reset_rate_limits() -> Generator[None, None, None]:
     reset_in_memory_counters()
 
 
+@pytest_asyncio.fixture(autouse=True)
+async def _stop_background_tasks() -> AsyncGenerator[None, None]:
+    yield
+    await health_prober.stop()
+    await in_memory_store.stop_sweeper()
+
+
+@pytest.fixture(autouse=True)
+def _reset_caches() -> Generator[None, None, None]:
+    user_cache.clear()
+    summary_snapshot.clear()
+    outbox_pending_snapshot.clear()
+    count_cache.clear()
+    verdict_cache.clear()
+    health_prober.clear()
+    token_cache.clear()
+    yield
+    user_cache.clear()
+    summary_snapshot.clear()
+    outbox_pending_snapshot.clear()
+    count_cache.clear()
+    verdict_cache.clear()
+    health_prober.clear()
+    token_cache.clear()
+
+
+@pytest_asyncio.fixture()
+async def captcha_verifier(monkeypatch) -> AsyncGenerator[list[dict[str, str]], None]:
+    """Enforce captcha on public forms against a stub siteverify that accepts ``good-*`` tokens."""
+    calls: list[dict[str, str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        form = dict(httpx.QueryParams(request.content.decode()))
+        calls.append(form)
+        return httpx.Response(200, json={"success": form.get("response", "").startswith("good-")})
+
+    monkeypatch.setattr(settings, "captcha_secret_key", "stub-secret")
+    monkeypatch.setattr(settings, "captcha_required_for_public_forms", True)
+    http_clients.register("captcha", httpx.AsyncClient(transport=httpx.MockTransport(handler), timeout=5.0))
+    yield calls
+    http_clients._clients.pop("captcha", None)
+
+
 @pytest_asyncio.fixture()
 async def user_factory(db_session) -> Callable[[str, str, UserRole], Awaitable[User]]:
     async def _create_user(email: str, password: str, role: UserRole = UserRole.USER) -> User:
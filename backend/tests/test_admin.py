@@ -1,6 +1,8 @@
 """Tests for admin endpoints."""
+from datetime import datetime, timedelta, timezone
+
 import pytest
-from backend.models import UserRole
+from backend.models import UserRole, Waitlist
 
 
 @pytest.mark.asyncio
@@ -174,3 +176,93 @@ async def test_admin_pagination_edge_cases(client, user_factory):
     )
     assert response.status_code == 200
 
+
+
+@pytest.mark.asyncio
+async def test_admin_summary_counts_and_snapshot(client, user_factory):
+    """Summary totals come from one aggregated query and are served from a snapshot."""
+    await user_factory("dev@example.com", "DevPass!1", role=UserRole.DEV)
+    await user_factory("user@example.com", "UserPass!1", role=UserRole.USER)
+    await client.post("/api/v1/waitlist", json={"email": "first@example.com"})
+    login = await client.post(
+        "/api/v1/auth/login",
+        json={"email": "dev@example.com", "password": "DevPass!1", "scope": "dev", "otp": "000000"},
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    response = await client.get("/api/v1/admin/summary", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {
+        "total_users": 2,
+        "total_contacts": 0,
+        "total_waitlist": 1,
+        "total_pilot_requests": 0,
+        "total_investor_interest": 0,
+    }
+
+    await client.post("/api/v1/waitlist", json={"email": "second@example.com"})
+    cached = await client.get("/api/v1/admin/summary", headers=headers)
+    assert cached.json()["total_waitlist"] == 1
+
+
+@pytest.mark.asyncio
+async def test_admin_keyset_pagination(client, db_session, user_factory):
+    """next_cursor walks the list without overlap and bad cursors are rejected."""
+    await user_factory("dev@example.com", "DevPass!1", role=UserRole.DEV)
+    joined_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    async with db_session() as session:
+        session.add_all(
+            Waitlist(email=f"entry{index}@example.com", created_at=joined_at + timedelta(minutes=index % 2))
+            for index in range(3)
+        )
+        await session.commit()
+    login = await client.post(
+        "/api/v1/auth/login",
+        json={"email": "dev@example.com", "password": "DevPass!1", "scope": "dev", "otp": "000000"},
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    first = await client.get("/api/v1/admin/waitlist", headers=headers, params={"limit": 2})
+    assert first.status_code == 200
+    first_page = first.json()
+    cursor = first_page["pagination"]["next_cursor"]
+    assert cursor
+
+    second = await client.get("/api/v1/admin/waitlist", headers=headers, params={"limit": 2, "cursor": cursor})
+    assert second.status_code == 200
+    second_page = second.json()
+    assert second_page["pagination"]["next_cursor"] is None
+
+    emails = [item["email"] for item in first_page["items"] + second_page["items"]]
+    assert sorted(emails) == [f"entry{index}@example.com" for index in range(3)]
+
+    invalid = await client.get("/api/v1/admin/waitlist", headers=headers, params={"cursor": "not-a-cursor"})
+    assert invalid.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_admin_pagination_total_strategies(client, user_factory):
+    """Cached totals are flagged as inexact; exact and estimated fall back to COUNT(*)."""
+    await user_factory("dev@example.com", "DevPass!1", role=UserRole.DEV)
+    await client.post("/api/v1/waitlist", json={"email": "count@example.com"})
+    login = await client.post(
+        "/api/v1/auth/login",
+        json={"email": "dev@example.com", "password": "DevPass!1", "scope": "dev", "otp": "000000"},
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    first = await client.get("/api/v1/admin/waitlist", headers=headers, params={"count": "cached"})
+    assert first.json()["pagination"]["total"] == 1
+    assert first.json()["pagination"]["total_exact"] is True
+
+    await client.post("/api/v1/waitlist", json={"email": "later@example.com"})
+    cached = await client.get("/api/v1/admin/waitlist", headers=headers, params={"count": "cached"})
+    assert cached.json()["pagination"] == {**cached.json()["pagination"], "total": 1, "total_exact": False}
+
+    exact = await client.get("/api/v1/admin/waitlist", headers=headers, params={"count": "exact"})
+    assert exact.json()["pagination"]["total"] == 2
+    assert exact.json()["pagination"]["total_exact"] is True
+
+    # SQLite has no planner statistics, so estimates degrade to an exact count.
+    estimated = await client.get("/api/v1/admin/contacts", headers=headers, params={"count": "estimated"})
+    assert estimated.json()["pagination"]["total_exact"] is True
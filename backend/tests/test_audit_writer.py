@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy import select
+
+from backend.models import AuditLog
+from backend.services.audit_writer import audit_writer
+
+
+async def _actions(db_session) -> list[str]:
+    async with db_session() as session:
+        result = await session.execute(select(AuditLog.action).order_by(AuditLog.id))
+        return list(result.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_buffered_audit_rows_are_written_after_commit(
+    client, db_session, monkeypatch
+):
+    monkeypatch.setattr(audit_writer, "enabled", True)
+    try:
+        response = await client.post(
+            "/api/v1/waitlist", json={"email": "buffered@example.com"}
+        )
+        assert response.status_code == 201
+    finally:
+        await audit_writer.stop()
+
+    assert await _actions(db_session) == ["waitlist.join"]
+    assert audit_writer.metrics()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_required_audit_rows_bypass_the_buffer(client, db_session, monkeypatch):
+    monkeypatch.setattr(audit_writer, "enabled", True)
+    try:
+        response = await client.post(
+            "/api/v1/auth/register",
+            json={"email": "required@example.com", "password": "Required!1"},
+        )
+        assert response.status_code == 201
+        # Written inside the request transaction, before any drain.
+        assert await _actions(db_session) == ["auth.register"]
+    finally:
+        await audit_writer.stop()
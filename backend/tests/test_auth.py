@@ -1,6 +1,11 @@
+from datetime import timedelta
+
 import pytest
+from fastapi import HTTPException
 
 from backend.models import UserRole
+from backend.security import create_token, decode_token, token_cache
+from backend.settings import settings
 
 
 @pytest.mark.asyncio
@@ -91,3 +96,66 @@ async def test_password_reset_confirm(client, user_factory):
     )
     assert response.status_code == 200
     assert "password updated" in response.json()["message"].lower()
+
+
+@pytest.mark.asyncio
+async def test_login_rate_limit_is_keyed_by_email_before_validation(client):
+    for expected_remaining in range(4, -1, -1):
+        response = await client.post("/api/v1/auth/login", json={"email": "target@example.com", "password": "wrong-pass"})
+        assert response.status_code == 400
+        assert response.headers["X-RateLimit-Limit"] == "5"
+        assert response.headers["X-RateLimit-Remaining"] == str(expected_remaining)
+
+    # Case variations and malformed bodies for the same address are rejected before the handler runs.
+    blocked = await client.post("/api/v1/auth/login", json={"email": " Target@Example.com", "password": "x"})
+    assert blocked.status_code == 429
+    assert int(blocked.headers["Retry-After"]) > 0
+    assert blocked.headers["X-RateLimit-Remaining"] == "0"
+
+    other = await client.post("/api/v1/auth/login", json={"email": "other@example.com", "password": "wrong-pass"})
+    assert other.status_code == 400
+    assert other.headers["X-RateLimit-Remaining"] == "4"
+
+
+def test_decoded_tokens_are_cached_until_expiry():
+    token = create_token("cache@example.com", UserRole.USER, 3, timedelta(minutes=5), "access")
+
+    first = decode_token(token)
+    first["role"] = "dev"
+    second = decode_token(token)
+
+    assert second["sub"] == "cache@example.com"
+    assert second["role"] == "user"
+    assert (token_cache.hits, token_cache.misses) == (1, 1)
+
+
+def test_expired_and_tampered_tokens_are_never_cached():
+    expired = create_token("old@example.com", UserRole.USER, 0, timedelta(seconds=-1), "access")
+    valid = create_token("new@example.com", UserRole.USER, 0, timedelta(minutes=5), "access")
+    decode_token(valid)
+    tampered = valid[:-2] + ("AA" if not valid.endswith("AA") else "BB")
+
+    for token in (expired, tampered):
+        with pytest.raises(HTTPException) as exc_info:
+            decode_token(token)
+        assert exc_info.value.status_code == 401
+    assert len(token_cache) == 1
+
+
+def test_only_access_tokens_are_cached():
+    for token_type in ("refresh", "reset"):
+        token = create_token("other@example.com", UserRole.USER, 0, timedelta(minutes=5), token_type)
+        assert decode_token(token)["type"] == token_type
+    assert len(token_cache) == 0
+
+
+def test_rotating_the_signing_key_drops_cached_tokens(monkeypatch):
+    token = create_token("rotate@example.com", UserRole.USER, 0, timedelta(minutes=5), "access")
+    decode_token(token)
+    assert len(token_cache) == 1
+
+    monkeypatch.setattr(settings, "jwt_secret_key", "rotated-secret-key-with-at-least-32-characters")
+    with pytest.raises(HTTPException) as exc_info:
+        decode_token(token)
+    assert exc_info.value.status_code == 401
+    assert len(token_cache) == 0
@@ -0,0 +1,120 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from backend.services.captcha import (
+    VERDICT_ACCEPTED,
+    VERDICT_REJECTED,
+    CaptchaVerdictCache,
+    verdict_cache,
+    verify_captcha_token,
+)
+from backend.services.http_clients import http_clients
+
+
+async def _submit(client, email: str, token: str):
+    return await client.post(
+        "/api/v1/waitlist", json={"email": email, "captchaToken": token}
+    )
+
+
+@pytest.mark.asyncio
+async def test_replayed_captcha_token_is_rejected_without_provider_call(
+    client, captcha_verifier
+):
+    first = await _submit(client, "first@example.com", "good-replayed-token")
+    assert first.status_code == 201
+
+    replay = await _submit(client, "second@example.com", "good-replayed-token")
+    assert replay.status_code == 400
+    assert len(captcha_verifier) == 1
+    assert verdict_cache.replays == 1
+
+
+@pytest.mark.asyncio
+async def test_rejected_captcha_token_is_cached(client, captcha_verifier):
+    for index in range(3):
+        response = await _submit(
+            client, f"spam{index}@example.com", "bad-spam-wave-token"
+        )
+        assert response.status_code == 400
+    assert len(captcha_verifier) == 1
+
+
+@pytest.mark.asyncio
+async def test_verdicts_are_keyed_by_token_hash(client, captcha_verifier):
+    await _submit(client, "ok@example.com", "good-hashed-token")
+    await _submit(client, "bad@example.com", "bad-hashed-token")
+
+    key = verdict_cache.token_key("good-hashed-token")
+    assert "good-hashed-token" not in key
+    assert verdict_cache._local.get(key) == VERDICT_ACCEPTED
+    assert (
+        verdict_cache._local.get(verdict_cache.token_key("bad-hashed-token"))
+        == VERDICT_REJECTED
+    )
+
+
+@pytest.mark.asyncio
+async def test_malformed_provider_response_releases_the_token(client, captcha_verifier):
+    bodies = [b"<html>502 Bad Gateway</html>", b'{"success": true}']
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, content=bodies.pop(0), headers={"content-type": "application/json"}
+        )
+
+    http_clients.register(
+        "captcha", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+
+    failed = await _submit(client, "retry@example.com", "good-retried-token")
+    assert failed.status_code == 503
+
+    # The claim was released, so the retry is verified rather than treated as a replay.
+    retried = await _submit(client, "retry@example.com", "good-retried-token")
+    assert retried.status_code == 201
+    assert verdict_cache.replays == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_verification_releases_the_token(captcha_verifier):
+    started = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        started.set()
+        await asyncio.sleep(10)
+        return httpx.Response(200, json={"success": True})
+
+    http_clients.register(
+        "captcha", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    verification = asyncio.create_task(
+        verify_captcha_token(
+            "good-cancelled-token", SimpleNamespace(client=None), require=True
+        )
+    )
+    await asyncio.wait_for(started.wait(), 2)
+    verification.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await verification
+
+    key = verdict_cache.token_key("good-cancelled-token")
+    assert verdict_cache._local.get(key) is None
+
+
+@pytest.mark.asyncio
+async def test_sub_second_ttl_still_expires_in_redis(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    from backend.services import captcha
+
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    monkeypatch.setattr(captcha.settings, "redis_url", "redis://stub")
+    monkeypatch.setattr(captcha.redis_manager, "url", "redis://stub")
+    monkeypatch.setattr(captcha.redis_manager, "_client", redis)
+    cache = CaptchaVerdictCache(ttl=0.5, maxsize=16)
+
+    assert await cache.claim("short") is None
+    assert 0 < await redis.pttl(cache.prefix + "short") <= 500
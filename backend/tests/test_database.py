@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from backend import database
+from backend.settings import settings
+
+
+def test_pool_budget_splits_connections_across_workers(monkeypatch):
+    monkeypatch.setattr(settings, "db_max_connections", 80)
+    monkeypatch.setattr(settings, "web_concurrency", 4)
+    monkeypatch.setattr(settings, "db_pool_size", None)
+    monkeypatch.setattr(settings, "db_max_overflow", None)
+    pool_size, max_overflow = database.pool_budget()
+    assert (pool_size, max_overflow) == (15, 5)
+    assert (
+        pool_size + max_overflow
+    ) * settings.web_concurrency <= settings.db_max_connections
+
+    monkeypatch.setattr(settings, "web_concurrency", 200)
+    assert database.pool_budget() == (1, 0)
+
+    monkeypatch.setattr(settings, "db_pool_size", 7)
+    monkeypatch.setattr(settings, "db_max_overflow", 2)
+    assert database.pool_budget() == (7, 2)
+
+
+def test_engine_options_for_asyncpg_and_pgbouncer(monkeypatch):
+    url = "postgresql+asyncpg://user:pass@db/orbsurv"
+    monkeypatch.setattr(settings, "db_statement_cache_size", 250)
+    options = database.engine_options(url)
+    assert options["connect_args"] == {"prepared_statement_cache_size": 250}
+    assert options["pool_timeout"] == settings.db_pool_timeout_seconds
+    assert "pool_pre_ping" not in options
+
+    monkeypatch.setattr(settings, "db_pgbouncer", True)
+    options = database.engine_options(url)
+    assert options["poolclass"] is NullPool
+    assert options["connect_args"]["statement_cache_size"] == 0
+    assert options["connect_args"]["prepared_statement_cache_size"] == 0
+    name_func = options["connect_args"]["prepared_statement_name_func"]
+    assert name_func() != name_func()
+    assert "pool_size" not in options
+
+
+@pytest.mark.asyncio
+async def test_idle_connections_are_pinged_and_replaced_when_dead(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'ping.db'}",
+        poolclass=AsyncAdaptedQueuePool,
+        pool_reset_on_return=None,
+    )
+    database.ping_after_idle(engine, 0)
+    try:
+        async with engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            stale = raw.driver_connection
+            await stale.close()
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("SELECT 1"))).scalar() == 1
+            assert (await conn.get_raw_connection()).driver_connection is not stale
+    finally:
+        await engine.dispose()
@@ -0,0 +1,140 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+from backend.models import EmailOutbox, EmailStatus
+from backend.services import email as email_service
+from backend.settings import settings
+from backend.workers import email_outbox
+
+
+async def _outbox(db_session) -> list[EmailOutbox]:
+    async with db_session() as session:
+        result = await session.execute(select(EmailOutbox).order_by(EmailOutbox.id))
+        return list(result.scalars().all())
+
+
+async def _make_due(db_session) -> None:
+    async with db_session() as session:
+        for entry in (await session.execute(select(EmailOutbox))).scalars():
+            entry.next_attempt_at = datetime.now(timezone.utc)
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_contact_form_queues_email_without_sending(
+    client, db_session, monkeypatch
+):
+    async def _fail(*args, **kwargs):
+        raise AssertionError("request path must not deliver email")
+
+    monkeypatch.setattr(email_service, "_deliver", _fail)
+    response = await client.post(
+        "/api/v1/contact",
+        json={
+            "name": "Ada",
+            "email": "ada@example.com",
+            "message": "Hello from the outbox",
+        },
+    )
+    assert response.status_code == 201
+
+    [entry] = await _outbox(db_session)
+    assert entry.template == "contact_ack"
+    assert entry.to == "ada@example.com"
+    assert entry.status == EmailStatus.PENDING
+    assert entry.context["name"] == "Ada"
+
+
+@pytest.mark.asyncio
+async def test_worker_delivers_retries_and_dead_letters(
+    client, db_session, monkeypatch
+):
+    monkeypatch.setattr(settings, "email_from", "noreply@example.com")
+    monkeypatch.setattr(settings, "email_outbox_max_attempts", 2)
+    delivered: list[str] = []
+    failures = {"remaining": 0}
+
+    async def _deliver(compiled):
+        if failures["remaining"]:
+            failures["remaining"] -= 1
+            raise RuntimeError("smtp down")
+        delivered.append(compiled.to)
+
+    monkeypatch.setattr(email_service, "_deliver", _deliver)
+    await client.post(
+        "/api/v1/pilot_request",
+        json={
+            "name": "Grace",
+            "org": "Navy",
+            "email": "grace@example.com",
+            "use_case": "Perimeter",
+        },
+    )
+
+    failures["remaining"] = 1
+    assert await email_outbox.process_batch() == 1
+    [entry] = await _outbox(db_session)
+    assert entry.status == EmailStatus.PENDING
+    assert entry.attempts == 1
+    assert "smtp down" in entry.last_error
+    # Backed off into the future, so nothing is due yet.
+    assert await email_outbox.process_batch() == 0
+
+    await _make_due(db_session)
+    assert await email_outbox.process_batch() == 1
+    [entry] = await _outbox(db_session)
+    assert entry.status == EmailStatus.SENT
+    assert delivered == ["grace@example.com"]
+
+    await client.post(
+        "/api/v1/pilot_request",
+        json={
+            "name": "Alan",
+            "org": "Bletchley",
+            "email": "alan@example.com",
+            "use_case": "Perimeter",
+        },
+    )
+    failures["remaining"] = 2
+    await email_outbox.process_batch()
+    await _make_due(db_session)
+    await email_outbox.process_batch()
+    dead = (await _outbox(db_session))[-1]
+    assert dead.status == EmailStatus.DEAD
+    assert dead.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_worker_sends_outside_the_claim_transaction(
+    client, db_session, monkeypatch
+):
+    monkeypatch.setattr(settings, "email_from", "noreply@example.com")
+    during_send: list[int] = []
+
+    async def _deliver(compiled):
+        # The batch is leased and committed: no one else sees it as due, and the
+        # table is free for other writers while the message is in flight.
+        during_send.append(await email_outbox.process_batch())
+        async with db_session() as session:
+            for entry in (await session.execute(select(EmailOutbox))).scalars():
+                entry.last_error = "touched while sending"
+            await session.commit()
+
+    monkeypatch.setattr(email_service, "_deliver", _deliver)
+    await client.post(
+        "/api/v1/pilot_request",
+        json={
+            "name": "Edsger",
+            "org": "Eindhoven",
+            "email": "edsger@example.com",
+            "use_case": "Perimeter",
+        },
+    )
+
+    assert await email_outbox.process_batch() == 1
+    assert during_send == [0]
+    [entry] = await _outbox(db_session)
+    assert entry.status == EmailStatus.SENT
+    assert entry.attempts == 1
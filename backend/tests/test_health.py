@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import event
+
+from backend.services.health import STATUS_DISABLED, STATUS_OK, health_prober
+
+
+@pytest.mark.asyncio
+async def test_healthz_does_not_touch_the_database(client, db_session, monkeypatch):
+    monkeypatch.setattr(health_prober, "ensure_started", lambda: None)
+    checkouts = []
+    pool = db_session.kw["bind"].sync_engine.pool
+
+    def _record(*_):
+        checkouts.append(1)
+
+    event.listen(pool, "checkout", _record)
+    try:
+        for _ in range(5):
+            response = await client.get("/api/v1/healthz")
+            assert response.status_code == 200
+            assert response.json()["status"] == "ok"
+    finally:
+        event.remove(pool, "checkout", _record)
+    assert checkouts == []
+
+
+@pytest.mark.asyncio
+async def test_healthz_reports_a_stalled_prober(client, monkeypatch):
+    monkeypatch.setattr(health_prober, "ensure_started", lambda: None)
+    health_prober.last_round = (
+        time.monotonic() - 10 * health_prober.interval - health_prober.timeout
+    )
+
+    response = await client.get("/api/v1/healthz")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "stale"
+
+
+@pytest.mark.asyncio
+async def test_readyz_reports_each_dependency(client):
+    response = await client.get("/api/v1/readyz")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ready"
+    assert body["probe_age_seconds"] >= 0
+    dependencies = body["dependencies"]
+    assert dependencies["database"]["status"] == STATUS_OK
+    assert dependencies["database"]["latency_ms"] >= 0
+    assert dependencies["redis"]["status"] == STATUS_DISABLED
+    assert dependencies["replica"]["status"] == STATUS_DISABLED
+    # The API does not deliver email, so it does not probe the transport by default.
+    assert "email" not in dependencies
+
+
+@pytest.mark.asyncio
+async def test_readyz_fails_while_the_database_is_down(client, monkeypatch):
+    async def broken() -> str:
+        raise ConnectionError("connection refused")
+
+    async def fine() -> str:
+        return STATUS_OK
+
+    monkeypatch.setattr(health_prober, "checks", {"database": broken, "email": fine})
+
+    response = await client.get("/api/v1/readyz")
+
+    assert response.status_code == 503
+    body = response.json()
+    assert body["status"] == "not_ready"
+    assert body["dependencies"]["database"]["status"] == "down"
+    assert "connection refused" in body["dependencies"]["database"]["error"]
+
+
+@pytest.mark.asyncio
+async def test_readyz_is_degraded_when_an_optional_dependency_is_down(
+    client, monkeypatch
+):
+    async def broken() -> str:
+        raise ConnectionError("no route to host")
+
+    async def fine() -> str:
+        return STATUS_OK
+
+    monkeypatch.setattr(health_prober, "checks", {"database": fine, "email": broken})
+
+    response = await client.get("/api/v1/readyz")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "degraded"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_cold_readyz_calls_share_one_probe_round(client, monkeypatch):
+    calls = []
+
+    async def slow() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return STATUS_OK
+
+    monkeypatch.setattr(health_prober, "checks", {"database": slow})
+
+    responses = await asyncio.gather(*(client.get("/api/v1/readyz") for _ in range(10)))
+
+    assert all(response.status_code == 200 for response in responses)
+    assert len(calls) == 1
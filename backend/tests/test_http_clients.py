@@ -0,0 +1,42 @@
+import pytest
+
+from backend.services.http_clients import http_clients
+
+
+@pytest.mark.asyncio
+async def test_shared_client_is_reused_per_upstream():
+    try:
+        first = http_clients.get("captcha")
+        assert http_clients.get("captcha") is first
+        assert http_clients.get("sendgrid") is not first
+        assert str(http_clients.get("sendgrid").base_url) == "https://api.sendgrid.com"
+    finally:
+        await http_clients.aclose()
+    assert first.is_closed
+    assert http_clients.get("captcha") is not first
+    await http_clients.aclose()
+
+
+@pytest.mark.asyncio
+async def test_public_form_captcha_uses_shared_client(client, captcha_verifier):
+    stub = http_clients.get("captcha")
+
+    for index in range(3):
+        response = await client.post(
+            "/api/v1/waitlist",
+            json={
+                "email": f"captcha{index}@example.com",
+                "captchaToken": f"good-captcha-token-{index}",
+            },
+        )
+        assert response.status_code == 201
+    rejected = await client.post(
+        "/api/v1/waitlist",
+        json={"email": "bot@example.com", "captchaToken": "bad-captcha-token"},
+    )
+    assert rejected.status_code == 400
+
+    assert len(captcha_verifier) == 4
+    assert all(call["secret"] == "stub-secret" for call in captcha_verifier)
+    assert http_clients.get("captcha") is stub
+    assert not stub.is_closed
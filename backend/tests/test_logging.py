@@ -0,0 +1,90 @@
+import json
+import logging
+
+from backend import logging_config
+from backend.logging_config import JSONFormatter, RequestSampler
+
+
+def _record(msg: str, level: int = logging.INFO, **extra) -> logging.LogRecord:
+    record = logging.LogRecord("orbsurv.api", level, __file__, 1, msg, None, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extra_fields_and_traceback():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        import sys
+
+        record = logging.LogRecord(
+            "orbsurv.api",
+            logging.ERROR,
+            __file__,
+            1,
+            "failed %s",
+            ("x",),
+            sys.exc_info(),
+        )
+    record.request_id = "abc"
+    entry = json.loads(JSONFormatter().format(record))
+    assert entry["message"] == "failed x"
+    assert entry["level"] == "ERROR"
+    assert entry["request_id"] == "abc"
+    assert "ValueError: boom" in entry["exc_info"]
+
+
+def test_request_sampler_is_per_route_and_keeps_errors():
+    sampler = RequestSampler(
+        default_rate=1.0, rates={"/api/v1/healthz": 0.0, "/api/v1/health": 1.0}
+    )
+    assert not sampler.filter(
+        _record("request.start", path="/api/v1/healthz", request_id="1")
+    )
+    assert sampler.filter(
+        _record("request.start", path="/api/v1/waitlist", request_id="1")
+    )
+    # 5xx request ends, warnings and unrelated records always pass.
+    assert sampler.filter(
+        _record("request.end", path="/api/v1/healthz", request_id="1", status_code=503)
+    )
+    assert sampler.filter(
+        _record("request.end", logging.WARNING, path="/api/v1/healthz", request_id="1")
+    )
+    assert sampler.filter(_record("validation.error", path="/api/v1/healthz"))
+    assert sampler.dropped == 1
+
+
+def test_request_sampler_keeps_start_and_end_together():
+    sampler = RequestSampler(default_rate=0.3)
+    kept = 0
+    for index in range(1_000):
+        start = sampler.filter(
+            _record("request.start", path="/x", request_id=f"req-{index}")
+        )
+        end = sampler.filter(
+            _record(
+                "request.end", path="/x", request_id=f"req-{index}", status_code=200
+            )
+        )
+        assert start == end
+        kept += start
+    assert 200 < kept < 400
+
+
+def test_configure_logging_writes_json_through_listener(capsys):
+    root = logging.getLogger()
+    level = root.level
+    logging_config.configure_logging()
+    try:
+        logging.getLogger("orbsurv.test").warning("queued %d", 1, extra={"path": "/q"})
+    finally:
+        logging_config.stop_logging()
+        root.setLevel(level)
+    lines = [
+        json.loads(line)
+        for line in capsys.readouterr().err.splitlines()
+        if line.startswith("{")
+    ]
+    assert {"message": "queued 1", "path": "/q"}.items() <= lines[-1].items()
+    assert logging_config._queue_handler is None
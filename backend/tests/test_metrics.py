@@ -0,0 +1,121 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from backend.api import metrics as metrics_api
+from backend.app import app
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_requests_rate_limits_and_queue(client):
+    await client.get("/api/v1/healthz")
+    await client.post(
+        "/api/v1/waitlist",
+        json={"email": "metrics@example.com", "name": "M", "source": "web"},
+    )
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/api/v1/healthz",status="200"}'
+        in body
+    )
+    assert 'rate_limit_decisions_total{decision="allow",scope="public_form"}' in body
+    assert "http_requests_in_flight" in body
+    assert "email_outbox_pending 0.0" in body
+    assert "rate_limit_store_keys " in body
+    assert "rate_limit_store_capacity " in body
+    assert "rate_limit_store_evictions_total " in body
+
+
+def test_metrics_aggregate_across_processes(tmp_path):
+    script = textwrap.dedent(
+        """
+        import sys
+        from backend.metrics import RATE_LIMIT_DECISIONS, render
+        if sys.argv[1] == "record":
+            RATE_LIMIT_DECISIONS.labels(scope="login", decision="deny").inc()
+        else:
+            sys.stdout.write(render().decode())
+        """
+    )
+    env = {
+        **os.environ,
+        "PROMETHEUS_MULTIPROC_DIR": str(tmp_path),
+        "DATABASE_URL": "sqlite+aiosqlite:///metrics.db",
+        "JWT_SECRET_KEY": "metrics-test-secret-key-with-at-least-32-chars",
+        "ORBSURV_ALLOW_INSECURE_SETTINGS": "1",
+    }
+    for _ in range(3):
+        subprocess.run([sys.executable, "-c", script, "record"], env=env, check=True)
+    output = subprocess.run(
+        [sys.executable, "-c", script, "render"],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    assert (
+        'rate_limit_decisions_total{decision="deny",scope="login"} 3.0' in output.stdout
+    )
+
+
+def test_memory_store_publishes_evictions_and_sweeps():
+    from backend.metrics import (
+        RATE_LIMIT_STORE_EVICTIONS,
+        RATE_LIMIT_STORE_KEYS,
+        RATE_LIMIT_STORE_SWEEPS,
+    )
+    from backend.middleware.algorithms import get_algorithm
+    from backend.middleware.memory_store import ShardedRateLimitStore
+
+    evictions, sweeps = (
+        RATE_LIMIT_STORE_EVICTIONS._value.get(),
+        RATE_LIMIT_STORE_SWEEPS._value.get(),
+    )
+    store = ShardedRateLimitStore(shards=1, max_keys=5, sweep_interval=0)
+    for index in range(8):
+        store.apply(f"rate_limit:ip:{index}", get_algorithm("fixed_window"), 5, 60)
+    store.sweep()
+    store.report_size()
+
+    assert RATE_LIMIT_STORE_EVICTIONS._value.get() == evictions + 3
+    assert RATE_LIMIT_STORE_SWEEPS._value.get() == sweeps + 1
+    assert RATE_LIMIT_STORE_KEYS._value.get() == 5
+
+
+@pytest.mark.asyncio
+async def test_metrics_are_refused_to_remote_callers_without_a_token(
+    db_session, monkeypatch
+):
+    transport = ASGITransport(app=app, client=("203.0.113.7", 40000))
+    async with AsyncClient(transport=transport, base_url="http://testserver") as remote:
+        assert (await remote.get("/metrics")).status_code == 403
+
+        monkeypatch.setattr(metrics_api.settings, "metrics_bearer_token", "scrape-me")
+        assert (await remote.get("/metrics")).status_code == 401
+        wrong = {"Authorization": "Bearer nope"}
+        assert (await remote.get("/metrics", headers=wrong)).status_code == 401
+        right = {"Authorization": "Bearer scrape-me"}
+        assert (await remote.get("/metrics", headers=right)).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_scrapes_reuse_the_cached_outbox_count(client, monkeypatch):
+    loads: list[int] = []
+    original = metrics_api.crud.outbox.count_pending
+
+    async def _count(session):
+        loads.append(1)
+        return await original(session)
+
+    monkeypatch.setattr(metrics_api.crud.outbox, "count_pending", _count)
+    for _ in range(3):
+        assert (await client.get("/metrics")).status_code == 200
+    assert len(loads) == 1
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from backend.security import hash_password
+from backend.services.passwords import PasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_round_trip():
+    hasher = PasswordHasher(max_workers=2, max_queue=2)
+    try:
+        hashed = await hasher.hash("RoundTrip!1")
+        assert await hasher.verify("RoundTrip!1", hashed)
+        assert not await hasher.verify("WrongPass!1", hashed)
+        metrics = hasher.metrics()
+        assert metrics["completed"] == 3
+        assert metrics["pending"] == 0
+        assert metrics["p99_ms"] >= metrics["p50_ms"] > 0
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_rejects_when_saturated():
+    hasher = PasswordHasher(max_workers=1, max_queue=0)
+    hashed = hash_password("Saturate!1")
+    try:
+        results = await asyncio.gather(
+            hasher.verify("Saturate!1", hashed),
+            hasher.verify("Saturate!1", hashed),
+            return_exceptions=True,
+        )
+        assert results[0] is True
+        assert isinstance(results[1], HTTPException)
+        assert results[1].status_code == 503
+        assert hasher.metrics()["rejected"] == 1
+    finally:
+        hasher.shutdown()
@@ -77,3 +77,26 @@ async def test_waitlist_rate_limit_enforced(client):
         assert response.status_code == 201
     response = await client.post("/api/v1/waitlist", json=payload)
     assert response.status_code == 429
+
+
+@pytest.mark.asyncio
+async def test_public_forms_share_limit_enforced_before_body_parsing(client):
+    limit = settings.public_form_rate_limit
+    for index in range(limit):
+        response = await client.post(
+            "/api/v1/waitlist", json={"email": f"shared{index}@example.com", "name": "Shared", "source": "web"}
+        )
+        assert response.status_code == 201
+        assert response.headers["X-RateLimit-Remaining"] == str(limit - index - 1)
+
+    response = await client.post("/api/v1/contact", content=b"not json", headers={"content-type": "application/json"})
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
+
+
+@pytest.mark.asyncio
+async def test_request_id_header_matches_error_body(client):
+    response = await client.post("/api/v1/contact", json={"email": "not-an-email"})
+    assert response.status_code == 422
+    request_id = response.headers["X-Request-ID"]
+    assert response.json()["error"]["request_id"] == request_id
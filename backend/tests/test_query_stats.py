@@ -0,0 +1,49 @@
+import logging
+import re
+
+import pytest
+
+from backend.query_stats import instrument_queries
+from backend.settings import settings
+
+
+@pytest.mark.asyncio
+async def test_server_timing_counts_request_queries(client, db_session):
+    instrument_queries(db_session.kw["bind"])
+
+    response = await client.post(
+        "/api/v1/waitlist",
+        json={"email": "timing@example.com", "name": "Timing", "source": "web"},
+    )
+    assert response.status_code == 201
+    timing = response.headers["Server-Timing"]
+    match = re.fullmatch(
+        r'db;dur=([\d.]+);desc="(\d+) queries", app;dur=([\d.]+)', timing
+    )
+    assert match, timing
+    assert int(match.group(2)) >= 1
+    assert float(match.group(1)) <= float(match.group(3))
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_logged_with_shape_not_values(
+    client, db_session, monkeypatch, caplog
+):
+    instrument_queries(db_session.kw["bind"])
+    monkeypatch.setattr(settings, "db_slow_query_ms", 0.000001)
+
+    with caplog.at_level(logging.WARNING, logger="orbsurv.db"):
+        response = await client.post(
+            "/api/v1/waitlist",
+            json={"email": "slow@example.com", "name": "Slow", "source": "web"},
+        )
+    assert response.status_code == 201
+    slow = [record for record in caplog.records if record.msg == "db.slow_query"]
+    assert slow
+    request_id = response.headers["X-Request-ID"]
+    assert all(record.request_id == request_id for record in slow)
+    insert = next(
+        record for record in slow if record.statement.startswith("INSERT INTO waitlist")
+    )
+    assert insert.param_count > 0
+    assert "slow@example.com" not in insert.statement
@@ -0,0 +1,353 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import pytest_asyncio
+from prometheus_client import REGISTRY
+
+from backend.middleware import rate_limit
+from backend.middleware.algorithms import ALGORITHMS, get_algorithm
+from backend.middleware.memory_store import ShardedRateLimitStore
+from backend.middleware.near_cache import LocalPreCounter
+from backend.middleware.redis_pool import RedisManager
+from backend.settings import Settings
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest_asyncio.fixture()
+async def redis_stub(monkeypatch):
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    monkeypatch.setattr(rate_limit.redis_manager, "_client", client)
+    monkeypatch.setattr(rate_limit, "_scripts", {})
+    yield client
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("algorithm", sorted(ALGORITHMS))
+async def test_redis_rate_limit_never_over_admits_under_concurrency(
+    redis_stub, algorithm
+):
+    results = await asyncio.gather(
+        *(
+            rate_limit.check_rate_limit(
+                "rate_limit:ip:203.0.113.9", 50, 3600, algorithm
+            )
+            for _ in range(500)
+        )
+    )
+
+    allowed = [result for result in results if result[0]]
+    assert len(allowed) == 50
+    assert all(reset_after <= 3600 for _, _, reset_after in results)
+    assert min(remaining for _, remaining, _ in allowed) == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_fixed_window_counts_in_one_key(redis_stub):
+    await asyncio.gather(
+        *(
+            rate_limit.check_rate_limit(
+                "rate_limit:ip:203.0.113.9", 5, 60, "fixed_window"
+            )
+            for _ in range(20)
+        )
+    )
+    assert await redis_stub.get("rate_limit:ip:203.0.113.9:fixed_window") == "5"
+
+
+@pytest.mark.asyncio
+async def test_redis_rate_limit_is_one_round_trip(redis_stub, monkeypatch):
+    commands: list[str] = []
+    original = redis_stub.execute_command
+
+    async def _record(*args, **kwargs):
+        commands.append(args[0])
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(redis_stub, "execute_command", _record)
+    allowed, remaining, reset_after = await rate_limit.check_rate_limit(
+        "rate_limit:ip:198.51.100.1", 3, 30
+    )
+
+    assert (allowed, remaining) == (True, 2)
+    assert 0 < reset_after <= 30
+    # EVALSHA, plus a one-off SCRIPT LOAD/EVAL fallback the first time the script is seen.
+    await rate_limit.check_rate_limit("rate_limit:ip:198.51.100.1", 3, 30)
+    assert commands[-1] == "EVALSHA"
+    assert commands.count("GET") == commands.count("INCR") == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_rate_limit_window_expires(redis_stub):
+    key = "rate_limit:email:user@example.com"
+    for _ in range(2):
+        assert (await rate_limit.check_rate_limit(key, 2, 1, "fixed_window"))[0]
+    allowed, remaining, reset_after = await rate_limit.check_rate_limit(
+        key, 2, 1, "fixed_window"
+    )
+    assert (allowed, remaining, reset_after) == (False, 0, 1)
+
+    await redis_stub.pexpire(f"{key}:fixed_window", 1)
+    await asyncio.sleep(0.01)
+    # The local deny cache would otherwise keep honouring the original reset time.
+    rate_limit.deny_cache.clear()
+    assert (await rate_limit.check_rate_limit(key, 2, 1, "fixed_window"))[0]
+
+
+@pytest.mark.parametrize("algorithm", sorted(ALGORITHMS))
+def test_algorithms_admit_limit_then_deny(algorithm):
+    policy = get_algorithm(algorithm)
+    state, now = None, 1_000.0
+    decisions = []
+    for _ in range(6):
+        decision, state, ttl = policy.evaluate(state, now, 5, 60)
+        decisions.append(decision)
+        assert ttl > 0
+    assert [d.allowed for d in decisions] == [True] * 5 + [False]
+    assert [d.remaining for d in decisions[:5]] == [4, 3, 2, 1, 0]
+    assert 0 < decisions[-1].reset_after <= 60
+
+
+def test_sliding_window_and_gcra_prevent_edge_bursts():
+    # A full window of traffic just before a boundary must not buy a second full
+    # window just after it, which is what fixed windows allow.
+    for name, expected in (("fixed_window", 5), ("sliding_window", 0), ("gcra", 0)):
+        policy = get_algorithm(name)
+        state = None
+        for _ in range(5):
+            _, state, _ = policy.evaluate(
+                state, 59.9 if name != "fixed_window" else 0.0, 5, 60
+            )
+        admitted = 0
+        for _ in range(5):
+            decision, state, _ = policy.evaluate(state, 60.1, 5, 60)
+            admitted += decision.allowed
+        assert admitted == expected, name
+
+
+def test_gcra_and_token_bucket_refill_gradually():
+    for name in ("gcra", "token_bucket"):
+        policy = get_algorithm(name)
+        state = None
+        for _ in range(5):
+            _, state, _ = policy.evaluate(state, 0.0, 5, 60)
+        decision, state, _ = policy.evaluate(state, 11.0, 5, 60)
+        assert not decision.allowed, name
+        decision, state, _ = policy.evaluate(state, 12.5, 5, 60)
+        assert decision.allowed, name
+
+
+@pytest.mark.asyncio
+async def test_in_memory_rate_limit_uses_configured_algorithm(monkeypatch):
+    monkeypatch.setattr(rate_limit.redis_manager, "_client", None)
+    monkeypatch.setattr(rate_limit.redis_manager, "url", None)
+    monkeypatch.setattr(rate_limit.settings, "rate_limit_algorithm", "gcra")
+    results = [
+        await rate_limit.check_rate_limit("rate_limit:ip:192.0.2.1", 3, 60)
+        for _ in range(4)
+    ]
+    assert [allowed for allowed, _, _ in results] == [True, True, True, False]
+    assert rate_limit.in_memory_store.get("rate_limit:ip:192.0.2.1") > 0
+
+
+def test_memory_store_caps_keys_with_lru_eviction():
+    store = ShardedRateLimitStore(shards=4, max_keys=40, sweep_interval=0)
+    policy = get_algorithm("fixed_window")
+    store.apply("rate_limit:ip:keep", policy, 5, 60)
+    for index in range(1_000):
+        store.apply(f"rate_limit:ip:scan-{index}", policy, 5, 60)
+        store.apply("rate_limit:ip:keep", policy, 1_000, 60)
+
+    assert len(store) <= 40
+    assert store.metrics()["evicted"] >= 960
+    assert store.get("rate_limit:ip:keep") is not None
+    assert store.get("rate_limit:ip:scan-0") is None
+
+
+def test_memory_store_sweeps_expired_keys():
+    store = ShardedRateLimitStore(shards=2, max_keys=100, sweep_interval=0)
+    policy = get_algorithm("fixed_window")
+    for index in range(10):
+        store.apply(f"rate_limit:ip:short-{index}", policy, 5, 0.001)
+    store.apply("rate_limit:ip:long", policy, 5, 60)
+    time.sleep(0.01)
+
+    assert store.sweep() == 10
+    assert len(store) == 1
+    metrics = store.metrics()
+    assert metrics["expired"] == 10
+    assert metrics["approx_bytes"] > 0
+    assert metrics["checks"] == 11
+
+
+def test_memory_store_shards_are_thread_safe():
+    store = ShardedRateLimitStore(shards=4, max_keys=1_000, sweep_interval=0)
+    policy = get_algorithm("fixed_window")
+
+    def _hammer() -> int:
+        return sum(
+            store.apply("rate_limit:ip:shared", policy, 500, 60).allowed
+            for _ in range(200)
+        )
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        admitted = sum(pool.map(lambda _: _hammer(), range(8)))
+    assert admitted == 500
+    assert store.metrics()["checks"] == 1_600
+
+
+@pytest.mark.asyncio
+async def test_blocked_keys_are_denied_without_redis(redis_stub, monkeypatch):
+    key = "rate_limit:ip:203.0.113.50"
+    for _ in range(3):
+        await rate_limit.check_rate_limit(key, 2, 60, "fixed_window")
+
+    commands: list[str] = []
+    original = redis_stub.execute_command
+
+    async def _record(*args, **kwargs):
+        commands.append(args[0])
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(redis_stub, "execute_command", _record)
+    for _ in range(50):
+        allowed, remaining, reset_after = await rate_limit.check_rate_limit(
+            key, 2, 60, "fixed_window"
+        )
+        assert (allowed, remaining) == (False, 0)
+        assert 0 < reset_after <= 60
+    assert commands == []
+    assert rate_limit.deny_cache.hits == 50
+
+    # A route with a higher limit on the same client key still asks Redis.
+    assert (await rate_limit.check_rate_limit(key, 10, 60, "fixed_window"))[0]
+    assert commands
+
+
+@pytest.mark.asyncio
+async def test_local_precount_syncs_deltas_in_batches(redis_stub, monkeypatch):
+    monkeypatch.setattr(rate_limit.settings, "rate_limit_local_precount", True)
+    monkeypatch.setattr(rate_limit.settings, "rate_limit_algorithm", "fixed_window")
+    counter = rate_limit.pre_counter
+    commands: list[str] = []
+    original = redis_stub.execute_command
+
+    async def _record(*args, **kwargs):
+        commands.append(args[0])
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(redis_stub, "execute_command", _record)
+    try:
+        results = [
+            await rate_limit.check_rate_limit(f"rate_limit:ip:10.0.0.{i % 3}", 10, 60)
+            for i in range(60)
+        ]
+        assert sum(allowed for allowed, _, _ in results) == 30
+        # One synchronous round trip per new key; everything else was decided locally.
+        assert len(commands) <= 6
+
+        assert await counter.flush() == 27
+        for index in range(3):
+            assert (
+                await redis_stub.get(f"rate_limit:ip:10.0.0.{index}:60:precount")
+                == "10"
+            )
+        assert counter.metrics()["pending"] == 0
+    finally:
+        await counter.stop()
+
+
+@pytest.mark.asyncio
+async def test_local_precount_evicts_lru_keys_and_still_syncs_them(redis_stub):
+    counter = LocalPreCounter(sync_interval=60, max_keys=2)
+    try:
+        for key in ("a", "a", "b", "b", "a", "c"):  # a is used after b, so b is LRU
+            await counter.check(redis_stub, f"rate_limit:ip:{key}", 10, 60)
+
+        assert counter.metrics()["keys"] == 2
+        assert counter.evicted == 1
+        assert "rate_limit:ip:b:60" not in counter._counters
+        # b's unsynced hit is not lost with its counter.
+        assert await counter.flush() == 3
+        assert await redis_stub.get("rate_limit:ip:a:60:precount") == "3"
+        assert await redis_stub.get("rate_limit:ip:b:60:precount") == "2"
+    finally:
+        await counter.stop()
+
+
+def test_local_precount_requires_fixed_window_algorithm(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_LOCAL_PRECOUNT", "true")
+    monkeypatch.setenv("RATE_LIMIT_ALGORITHM", "sliding_window")
+    with pytest.raises(ValueError, match="RATE_LIMIT_LOCAL_PRECOUNT"):
+        Settings()
+
+    monkeypatch.setenv("RATE_LIMIT_ALGORITHM", "fixed_window")
+    assert Settings().rate_limit_local_precount
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_when_redis_dies_and_closes_on_recovery(monkeypatch):
+    server = fakeredis.FakeServer()
+    manager = RedisManager(
+        url="redis://stand-in", failure_threshold=2, probe_interval=0.05
+    )
+    monkeypatch.setattr(
+        manager,
+        "_build",
+        lambda: fakeredis.FakeAsyncRedis(server=server, decode_responses=True),
+    )
+    monkeypatch.setattr(rate_limit, "redis_manager", manager)
+    monkeypatch.setattr(rate_limit, "_scripts", {})
+    key = "rate_limit:ip:198.51.100.77"
+
+    def _opened() -> float:
+        return (
+            REGISTRY.get_sample_value(
+                "redis_circuit_transitions_total", {"from": "closed", "to": "open"}
+            )
+            or 0.0
+        )
+
+    opened_before = _opened()
+    try:
+        assert (await rate_limit.check_rate_limit(key, 100, 60, "fixed_window"))[0]
+        assert manager.metrics()["state"] == "closed"
+
+        server.connected = False
+        for _ in range(2):
+            # Failures fall back to the in-process store instead of erroring.
+            assert (await rate_limit.check_rate_limit(key, 100, 60, "fixed_window"))[0]
+        assert manager.metrics()["state"] == "open"
+        assert REGISTRY.get_sample_value("redis_circuit_state") == 2
+        assert _opened() == opened_before + 1
+        assert await rate_limit.get_redis_client() is None
+
+        original = manager._client.execute_command
+        calls: list[str] = []
+
+        async def _record(*args, **kwargs):
+            calls.append(args[0])
+            return await original(*args, **kwargs)
+
+        monkeypatch.setattr(manager._client, "execute_command", _record)
+        for _ in range(20):
+            await rate_limit.check_rate_limit(key, 100, 60, "fixed_window")
+        assert [call for call in calls if call != "PING"] == []
+        assert rate_limit.in_memory_store.get(key) is not None
+
+        server.connected = True
+        for _ in range(40):
+            if manager.breaker.state == "closed":
+                break
+            await asyncio.sleep(0.05)
+        assert manager.metrics()["state"] == "closed"
+        assert await rate_limit.get_redis_client() is manager._client
+        transitions = manager.metrics()["transitions"]
+        assert transitions["closed->open"] == 1
+        assert transitions["half_open->closed"] == 1
+        assert REGISTRY.get_sample_value("redis_circuit_state") == 0
+    finally:
+        await manager.close()
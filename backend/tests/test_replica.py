@@ -0,0 +1,108 @@
+import asyncio
+import contextlib
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from backend import database, replica
+from backend.models import UserRole
+from backend.replica import ReplicaRouter
+
+
+@pytest.fixture()
+def replica_router(monkeypatch, db_session):
+    # The "replica" is the test database itself, so routed queries succeed either way.
+    router = ReplicaRouter(
+        url=str(db_session.kw["bind"].url),
+        max_lag=1.0,
+        lag_check_interval=0,
+        pin_seconds=30,
+    )
+    monkeypatch.setattr(replica, "replica_router", router)
+    return router
+
+
+async def _token(client, user_factory) -> str:
+    await user_factory("reader@example.com", "ReadPass!1", role=UserRole.DEV)
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={"email": "reader@example.com", "password": "ReadPass!1"},
+    )
+    return response.json()["access_token"]
+
+
+@pytest.mark.asyncio
+async def test_reads_use_primary_without_replica():
+    router = ReplicaRouter(url=None)
+    assert await router.factory_for() is database.async_session_factory
+
+
+@pytest.mark.asyncio
+async def test_lagging_or_unreachable_replica_falls_back_to_primary(
+    replica_router, monkeypatch
+):
+    # SQLite has no replication functions, so the real lag query fails.
+    assert await replica_router.factory_for() is database.async_session_factory
+
+    lag = 0.2
+
+    async def _measure():
+        return lag
+
+    monkeypatch.setattr(replica_router, "measure_lag", _measure)
+    assert await replica_router.factory_for() is replica_router.session_factory
+    lag = 30.0
+    assert await replica_router.factory_for() is database.async_session_factory
+    assert replica_router.routed == {"primary_lagging": 2, "replica": 1}
+    await replica_router.close()
+
+
+@pytest.mark.asyncio
+async def test_reads_are_pinned_to_primary_after_own_write(
+    client, user_factory, replica_router, monkeypatch
+):
+    async def _measure():
+        return 0.0
+
+    monkeypatch.setattr(replica_router, "measure_lag", _measure)
+    headers = {"Authorization": f"Bearer {await _token(client, user_factory)}"}
+
+    response = await client.get("/api/v1/admin/waitlist", headers=headers)
+    assert response.status_code == 200
+    assert replica_router.routed["replica"] == 1
+
+    response = await client.patch(
+        "/api/v1/settings/notifications", json={"weekly_summary": True}, headers=headers
+    )
+    assert response.status_code == 200
+    response = await client.get("/api/v1/admin/waitlist", headers=headers)
+    assert response.status_code == 200
+    assert replica_router.routed["primary_pinned"] == 1
+    await replica_router.close()
+
+
+@pytest.mark.asyncio
+async def test_unresponsive_replica_does_not_stall_reads(replica_router, monkeypatch):
+    @contextlib.asynccontextmanager
+    async def _blackholed():
+        await asyncio.sleep(60)
+        yield
+
+    engine = replica_router.engine
+    monkeypatch.setattr(replica_router, "lag_timeout", 0.05)
+    replica_router.engine = SimpleNamespace(connect=_blackholed)
+
+    started = time.monotonic()
+    assert await replica_router.measure_lag() is None
+    assert time.monotonic() - started < 1
+
+    # While one request runs the due check, the others go straight to the primary.
+    checking = asyncio.create_task(replica_router.factory_for())
+    await asyncio.sleep(0)
+    assert replica_router._lag_lock.locked()
+    assert await replica_router.factory_for() is database.async_session_factory
+    assert await checking is database.async_session_factory
+    assert replica_router.routed["primary_lagging"] == 2
+    replica_router.engine = engine
+    await replica_router.close()
@@ -0,0 +1,147 @@
+import smtplib
+from email.message import EmailMessage
+
+import pytest
+
+from backend.services import smtp_pool
+from backend.services.smtp_pool import SMTPConnectionPool
+
+
+class FakeSMTP:
+    instances: list["FakeSMTP"] = []
+
+    def __init__(self, host, port, timeout=None):
+        self.sent: list[str] = []
+        self.healthy = True
+        self.drop_next_send = False
+        self.reject_next_send: Exception | None = None
+        self.attempts = 0
+        self.closed = False
+        FakeSMTP.instances.append(self)
+
+    def ehlo(self):
+        return 250, b"ok"
+
+    def starttls(self, context=None):
+        raise smtplib.SMTPNotSupportedError("no tls")
+
+    def login(self, username, password):
+        return 235, b"ok"
+
+    def noop(self):
+        if not self.healthy:
+            raise smtplib.SMTPServerDisconnected("gone")
+        return 250, b"ok"
+
+    def send_message(self, message):
+        self.attempts += 1
+        if self.reject_next_send is not None:
+            error, self.reject_next_send = self.reject_next_send, None
+            raise error
+        if self.drop_next_send:
+            self.drop_next_send = False
+            raise smtplib.SMTPServerDisconnected("connection dropped")
+        self.sent.append(message["To"])
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    FakeSMTP.instances = []
+    monkeypatch.setattr(smtp_pool.smtplib, "SMTP", FakeSMTP)
+    return FakeSMTP
+
+
+def _message(to: str) -> EmailMessage:
+    message = EmailMessage()
+    message["To"] = to
+    message["From"] = "noreply@example.com"
+    message["Subject"] = "Hello"
+    message.set_content("Body")
+    return message
+
+
+@pytest.mark.asyncio
+async def test_smtp_pool_reuses_sessions(fake_smtp):
+    pool = SMTPConnectionPool(
+        host="smtp.test", port=587, username="u", password="p", size=2
+    )
+    try:
+        for index in range(5):
+            await pool.send(_message(f"user{index}@example.com"))
+        assert len(fake_smtp.instances) == 1
+        assert fake_smtp.instances[0].sent == [
+            f"user{index}@example.com" for index in range(5)
+        ]
+        assert pool.metrics()["reused"] == 4
+    finally:
+        pool.close()
+    assert fake_smtp.instances[0].closed
+
+
+@pytest.mark.asyncio
+async def test_smtp_pool_replaces_unhealthy_and_expired_sessions(
+    fake_smtp, monkeypatch
+):
+    pool = SMTPConnectionPool(
+        host="smtp.test", port=587, size=1, idle_timeout=60, health_check_after=0
+    )
+    try:
+        await pool.send(_message("first@example.com"))
+        fake_smtp.instances[0].healthy = False
+        await pool.send(_message("second@example.com"))
+        assert len(fake_smtp.instances) == 2
+        assert fake_smtp.instances[0].closed
+
+        pool.idle_timeout = 0
+        pool.prune()
+        assert fake_smtp.instances[1].closed
+        assert pool.metrics()["idle"] == 0
+    finally:
+        pool.close()
+
+
+@pytest.mark.asyncio
+async def test_smtp_pool_reconnects_when_server_drops_session(fake_smtp):
+    pool = SMTPConnectionPool(host="smtp.test", port=587, size=1)
+    try:
+        await pool.send(_message("first@example.com"))
+        fake_smtp.instances[0].drop_next_send = True
+        await pool.send(_message("second@example.com"))
+        assert len(fake_smtp.instances) == 2
+        assert fake_smtp.instances[1].sent == ["second@example.com"]
+        assert pool.metrics()["discarded"] == 1
+    finally:
+        pool.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error",
+    [
+        smtplib.SMTPRecipientsRefused({"nobody@example.com": (550, b"no such user")}),
+        smtplib.SMTPDataError(554, b"rejected"),
+    ],
+)
+async def test_smtp_pool_does_not_resend_rejected_messages(fake_smtp, error):
+    pool = SMTPConnectionPool(host="smtp.test", port=587, size=1)
+    try:
+        await pool.send(_message("first@example.com"))
+        session = fake_smtp.instances[0]
+        session.reject_next_send = error
+        with pytest.raises(type(error)):
+            await pool.send(_message("nobody@example.com"))
+        assert session.attempts == 2
+
+        await pool.send(_message("third@example.com"))
+        assert len(fake_smtp.instances) == 1
+        assert session.sent == ["first@example.com", "third@example.com"]
+        assert pool.metrics()["discarded"] == 0
+        assert pool.metrics()["reused"] == 2
+    finally:
+        pool.close()
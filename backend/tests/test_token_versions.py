@@ -0,0 +1,168 @@
+import pytest
+from sqlalchemy import event
+
+from backend import crud, schemas
+from backend.middleware import rate_limit
+from backend.models import User, UserRole
+from backend.services.token_versions import PENDING
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+async def _login(client, user_factory, email: str, role: UserRole = UserRole.DEV):
+    user = await user_factory(email, "AdminPass!1", role=role)
+    response = await client.post(
+        "/api/v1/auth/login", json={"email": email, "password": "AdminPass!1"}
+    )
+    assert response.status_code == 200
+    return user, {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture()
+def user_queries(db_session):
+    statements: list[str] = []
+    engine = db_session.kw["bind"].sync_engine
+
+    def _record(conn, cursor, statement, *args):
+        if statement.lstrip().startswith("SELECT") and "token_version" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _record)
+
+
+@pytest.fixture()
+def shared_redis(monkeypatch):
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    monkeypatch.setattr(rate_limit.redis_manager, "url", "redis://stub")
+    monkeypatch.setattr(rate_limit.redis_manager, "_client", redis)
+    return redis
+
+
+@pytest.mark.asyncio
+async def test_admin_lists_skip_the_user_lookup(client, user_factory, user_queries):
+    _, headers = await _login(client, user_factory, "lists@example.com")
+    user_queries.clear()
+
+    assert (
+        await client.get("/api/v1/admin/waitlist", headers=headers)
+    ).status_code == 200
+    # Only the narrow version lookup, never the full row.
+    assert len(user_queries) == 1
+    assert "password_hash" not in user_queries[0]
+
+
+@pytest.mark.asyncio
+async def test_versions_are_not_cached_without_a_shared_store(
+    client, user_factory, user_queries
+):
+    _, headers = await _login(client, user_factory, "local@example.com")
+    user_queries.clear()
+
+    for _ in range(3):
+        assert (
+            await client.get("/api/v1/admin/waitlist", headers=headers)
+        ).status_code == 200
+    # Another worker's revocation could not reach a per-process copy.
+    assert len(user_queries) == 3
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_token_on_claim_checked_routes(client, user_factory):
+    _, headers = await _login(client, user_factory, "logout@example.com")
+    assert (
+        await client.get("/api/v1/admin/waitlist", headers=headers)
+    ).status_code == 200
+
+    assert (
+        await client.post("/api/v1/auth/logout", headers=headers)
+    ).status_code == 200
+
+    response = await client.get("/api/v1/admin/waitlist", headers=headers)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_role_change_invalidates_dev_token(client, db_session, user_factory):
+    user, headers = await _login(client, user_factory, "demoted@example.com")
+    assert (
+        await client.get("/api/v1/admin/waitlist", headers=headers)
+    ).status_code == 200
+
+    async with db_session() as session:
+        await crud.users.update_role(session, user_id=user.id, role=UserRole.USER)
+        await session.commit()
+
+    response = await client.get("/api/v1/admin/waitlist", headers=headers)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_email_change_invalidates_tokens_for_old_address(
+    client, db_session, user_factory
+):
+    user, headers = await _login(client, user_factory, "before@example.com")
+    assert (
+        await client.get("/api/v1/admin/waitlist", headers=headers)
+    ).status_code == 200
+
+    async with db_session() as session:
+        loaded = await session.get(User, user.id)
+        payload = schemas.AccountProfileUpdate(email="after@example.com")
+        await crud.users.update_profile(session, user=loaded, data=payload)
+        await session.commit()
+
+    response = await client.get("/api/v1/admin/waitlist", headers=headers)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_versions_are_shared_through_redis(
+    client, user_factory, user_queries, shared_redis
+):
+    _, headers = await _login(client, user_factory, "shared@example.com")
+
+    assert (
+        await client.get("/api/v1/admin/waitlist", headers=headers)
+    ).status_code == 200
+    assert await shared_redis.get("token_version:shared@example.com") == "0"
+
+    user_queries.clear()
+    for _ in range(3):
+        assert (
+            await client.get("/api/v1/admin/waitlist", headers=headers)
+        ).status_code == 200
+    assert user_queries == []
+
+    assert (
+        await client.post("/api/v1/auth/logout", headers=headers)
+    ).status_code == 200
+    # Marked before the logout committed, so no worker trusts the cached version.
+    assert await shared_redis.get("token_version:shared@example.com") == PENDING
+    assert (
+        await client.get("/api/v1/admin/waitlist", headers=headers)
+    ).status_code == 401
+    await shared_redis.aclose()
+
+
+@pytest.mark.asyncio
+async def test_revocation_fails_closed_when_redis_is_unreachable(
+    client, db_session, user_factory, shared_redis, monkeypatch
+):
+    user, headers = await _login(client, user_factory, "closed@example.com")
+    assert (
+        await client.get("/api/v1/admin/waitlist", headers=headers)
+    ).status_code == 200
+
+    def _down(*args, **kwargs):
+        raise ConnectionError("redis unreachable")
+
+    monkeypatch.setattr(shared_redis, "pipeline", _down)
+    response = await client.post("/api/v1/auth/logout", headers=headers)
+    assert response.status_code == 503
+
+    # Nothing was committed, so the stored version still matches the token.
+    async with db_session() as session:
+        assert (await session.get(User, user.id)).token_version == 0
+    await shared_redis.aclose()
@@ -0,0 +1,202 @@
+import asyncio
+import contextlib
+
+import pytest
+
+from backend.crud.users import update_profile
+from backend.middleware.redis_pool import RedisManager
+from backend.models import User
+from backend.schemas import AccountProfileUpdate
+from backend.services import user_cache as user_cache_module
+from backend.services.user_cache import user_cache
+
+
+async def _login(client, email: str, password: str) -> str:
+    response = await client.post(
+        "/api/v1/auth/login", json={"email": email, "password": password}
+    )
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+@pytest.mark.asyncio
+async def test_current_user_is_served_from_cache(client, user_factory):
+    await user_factory("cached@example.com", "CachedPass!1")
+    token = await _login(client, "cached@example.com", "CachedPass!1")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = await client.get("/api/v1/auth/me", headers=headers)
+    assert first.status_code == 200
+    hits_before = user_cache._entries.hits
+
+    second = await client.get("/api/v1/auth/me", headers=headers)
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert user_cache._entries.hits == hits_before + 1
+
+
+@pytest.mark.asyncio
+async def test_logout_evicts_cached_user(client, user_factory):
+    await user_factory("evict@example.com", "EvictPass!1")
+    token = await _login(client, "evict@example.com", "EvictPass!1")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+    assert (
+        await client.post("/api/v1/auth/logout", headers=headers)
+    ).status_code == 200
+    assert "evict@example.com" not in user_cache._entries
+
+    response = await client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_settings_update_is_visible_through_cache(client, user_factory):
+    await user_factory("prefs@example.com", "PrefsPass!1")
+    token = await _login(client, "prefs@example.com", "PrefsPass!1")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert (await client.get("/api/v1/settings", headers=headers)).status_code == 200
+    update = await client.patch(
+        "/api/v1/settings/notifications",
+        headers=headers,
+        json={
+            "alert_email": "ops@example.com",
+            "sms_stage": True,
+            "weekly_summary": False,
+        },
+    )
+    assert update.status_code == 200
+
+    response = await client.get("/api/v1/settings", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["notifications"]["alert_email"] == "ops@example.com"
+
+
+@pytest.mark.asyncio
+async def test_email_change_evicts_old_and_new_address(db_session, user_factory):
+    user = await user_factory("before@example.com", "BeforePass!1")
+    user_cache.put("before@example.com", user)
+    user_cache.put("after@example.com", user)
+
+    async with db_session() as session:
+        user = await session.get(User, user.id)
+        await update_profile(
+            session, user=user, data=AccountProfileUpdate(email="after@example.com")
+        )
+        await session.commit()
+
+    assert "before@example.com" not in user_cache._entries
+    assert "after@example.com" not in user_cache._entries
+
+
+def _bulk(value: bytes) -> bytes:
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+class QuietPubSubServer:
+    """Just enough RESP for SUBSCRIBE; publishes only when told to."""
+
+    def __init__(self) -> None:
+        self.subscribers: list[asyncio.StreamWriter] = []
+        self.subscribed = asyncio.Event()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        while True:
+            header = await reader.readline()
+            if not header:
+                return
+            args = []
+            for _ in range(int(header[1:])):
+                length = int((await reader.readline())[1:])
+                args.append((await reader.readexactly(length + 2))[:-2])
+            if args[0].upper() == b"SUBSCRIBE":
+                writer.write(
+                    b"*3\r\n" + _bulk(b"subscribe") + _bulk(args[1]) + b":1\r\n"
+                )
+                self.subscribers.append(writer)
+                self.subscribed.set()
+            else:
+                writer.write(b"+OK\r\n")
+            await writer.drain()
+
+    async def publish(self, channel: bytes, data: bytes) -> None:
+        for writer in self.subscribers:
+            if writer.is_closing():
+                continue  # a subscription the client has since abandoned
+            writer.write(b"*3\r\n" + _bulk(b"message") + _bulk(channel) + _bulk(data))
+            with contextlib.suppress(ConnectionError):
+                await writer.drain()
+
+    async def drop_subscribers(self) -> None:
+        self.subscribed.clear()
+        for writer in self.subscribers:
+            writer.close()
+        self.subscribers.clear()
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+
+@pytest.mark.asyncio
+async def test_invalidation_listener_survives_idle_periods(monkeypatch):
+    server = QuietPubSubServer()
+    port = await server.start()
+    manager = RedisManager(url=f"redis://127.0.0.1:{port}/0", socket_timeout=0.1)
+    monkeypatch.setattr("backend.services.user_cache.redis_manager", manager)
+    monkeypatch.setattr(user_cache_module.settings, "redis_url", manager.url)
+    user_cache._entries.set("idle@example.com", (0, {}))
+
+    user_cache.start_listener()
+    try:
+        await asyncio.wait_for(server.subscribed.wait(), 2)
+        await asyncio.sleep(0.5)  # several socket timeouts with no traffic
+        assert not user_cache._listener.done()
+
+        await server.publish(user_cache.channel.encode(), b"idle@example.com")
+        for _ in range(50):
+            if "idle@example.com" not in user_cache._entries:
+                break
+            await asyncio.sleep(0.01)
+        assert "idle@example.com" not in user_cache._entries
+    finally:
+        await user_cache.stop_listener()
+        await manager.close()
+        server.server.close()
+
+
+@pytest.mark.asyncio
+async def test_invalidation_listener_resubscribes_after_disconnect(monkeypatch):
+    server = QuietPubSubServer()
+    port = await server.start()
+    manager = RedisManager(url=f"redis://127.0.0.1:{port}/0")
+    monkeypatch.setattr("backend.services.user_cache.redis_manager", manager)
+    monkeypatch.setattr(user_cache_module.settings, "redis_url", manager.url)
+    monkeypatch.setattr(user_cache, "retry_initial", 0.01)
+
+    user_cache.start_listener()
+    try:
+        await asyncio.wait_for(server.subscribed.wait(), 2)
+        user_cache._entries.set("stale@example.com", (0, {}))
+        await server.drop_subscribers()
+
+        await asyncio.wait_for(server.subscribed.wait(), 2)
+        assert not user_cache._listener.done()
+        # Evictions may have been missed while disconnected.
+        assert "stale@example.com" not in user_cache._entries
+
+        user_cache._entries.set("later@example.com", (0, {}))
+        await server.publish(user_cache.channel.encode(), b"later@example.com")
+        for _ in range(50):
+            if "later@example.com" not in user_cache._entries:
+                break
+            await asyncio.sleep(0.01)
+        assert "later@example.com" not in user_cache._entries
+    finally:
+        await user_cache.stop_listener()
+        await manager.close()
+        server.server.close()
@@ -0,0 +1 @@
+"""Background worker processes that run alongside the API."""
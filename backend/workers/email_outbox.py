@@ -0,0 +1,151 @@
+"""
+Deliver queued emails from the outbox table.
+
+Run one or more copies next to the API:
+
+    python -m backend.workers.email_outbox [--once] [--metrics-port 9101]
+
+Each poll leases a batch of due messages with ``FOR UPDATE SKIP LOCKED`` in a short
+transaction so several workers can share the queue, sends them outside any
+transaction, and records each outcome in its own. Failures are retried with exponential
+backoff; messages that cannot be rendered, or that exhaust
+``EMAIL_OUTBOX_MAX_ATTEMPTS``, are marked dead; messages whose worker died are retried
+once ``EMAIL_OUTBOX_LEASE_SECONDS`` pass.
+With ``--metrics-port``, delivery latency is served in Prometheus format on that port.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import signal
+import time
+
+from prometheus_client import start_http_server
+
+from .. import crud, database, models
+from ..metrics import EMAIL_DELIVERY_DURATION
+from ..services.email import EmailRenderError, deliver_templated_email
+from ..services.http_clients import http_clients
+from ..services.smtp_pool import close_smtp_pool, prune_smtp_pool
+from ..settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def _deliver(entry: models.EmailOutbox) -> None:
+    started = time.perf_counter()
+    failure: Exception | None = None
+    try:
+        await deliver_templated_email(
+            entry.template, to=entry.to, subject=entry.subject, context=entry.context
+        )
+    except Exception as exc:
+        failure = exc
+    elapsed = time.perf_counter() - started
+
+    # Each outcome gets its own short transaction, so no connection or row lock is held
+    # while the rest of the batch is being sent.
+    async with database.async_session_factory() as session:
+        row = await session.get(models.EmailOutbox, entry.id)
+        if row is None:
+            return
+        if failure is None:
+            outcome = "sent"
+            crud.outbox.mark_sent(row)
+            logger.info(
+                "Outbox email %d delivered template=%s to=%s",
+                row.id,
+                row.template,
+                row.to,
+            )
+        elif isinstance(failure, EmailRenderError):
+            outcome = "dead"
+            crud.outbox.mark_failed(row, str(failure), permanent=True)
+            logger.error("Outbox email %d dead-lettered: %s", row.id, failure)
+        else:
+            crud.outbox.mark_failed(row, f"{type(failure).__name__}: {failure}")
+            if row.status == models.EmailStatus.DEAD:
+                outcome = "dead"
+                logger.error(
+                    "Outbox email %d dead-lettered after %d attempts",
+                    row.id,
+                    row.attempts,
+                )
+            else:
+                outcome = "retry"
+                logger.warning(
+                    "Outbox email %d failed (attempt %d): %s",
+                    row.id,
+                    row.attempts,
+                    failure,
+                )
+        await session.commit()
+    EMAIL_DELIVERY_DURATION.labels(outcome=outcome).observe(elapsed)
+
+
+async def process_batch(limit: int | None = None) -> int:
+    """Deliver one batch of due messages and return how many were attempted."""
+    async with database.async_session_factory() as session:
+        entries = await crud.outbox.claim_due(
+            session,
+            limit=limit or settings.email_outbox_batch_size,
+            lease=settings.email_outbox_lease_seconds,
+        )
+        await session.commit()
+    for entry in entries:
+        await _deliver(entry)
+    return len(entries)
+
+
+async def run(*, once: bool = False) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # pragma: no cover - Windows
+            pass
+
+    logger.info("Email outbox worker started")
+    while not stop.is_set():
+        try:
+            processed = await process_batch()
+        except Exception:
+            logger.exception("Email outbox poll failed")
+            processed = 0
+        if once and processed == 0:
+            break
+        if processed == 0:
+            prune_smtp_pool()
+            try:
+                await asyncio.wait_for(
+                    stop.wait(), timeout=settings.email_outbox_poll_interval_seconds
+                )
+            except asyncio.TimeoutError:
+                pass
+    close_smtp_pool()
+    await http_clients.aclose()
+    logger.info("Email outbox worker stopped")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Deliver queued Orbsurv emails.")
+    parser.add_argument(
+        "--once", action="store_true", help="Exit once no due messages remain"
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics on this port",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=settings.log_level)
+    if args.metrics_port:
+        start_http_server(args.metrics_port)
+    asyncio.run(run(once=args.once))
+
+
+if __name__ == "__main__":
+    main()